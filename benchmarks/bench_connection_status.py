@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Connection Status Query Benchmark
+
+Compares the single terse `nmcli device show` query used by
+WiFiManager.get_connection_status() with the previous three-call path
+(`connection show --active`, `dev wifi`, `dev show`).
+
+Usage:
+    python3 benchmarks/bench_connection_status.py --iterations 20
+
+Without NetworkManager on the host only the parser microbenchmark runs.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.nmcli import (  # noqa: E402
+    active_wifi_from_devices,
+    parse_device_show,
+    query_active_wifi,
+    run_nmcli,
+    split_terse,
+)
+
+SAMPLE_DEVICE_SHOW = "\n".join(
+    [
+        "GENERAL.DEVICE:wlan0",
+        "GENERAL.TYPE:wifi",
+        "GENERAL.STATE:100 (connected)",
+        "GENERAL.CONNECTION:Cafe\\:Guest",
+        "IP4.ADDRESS[1]:192.168.1.23/24",
+        "AP[1].IN-USE:",
+        "AP[1].SSID:Neighbour",
+        "AP[2].IN-USE:*",
+        "AP[2].SSID:Cafe\\:Guest",
+        "AP[3].IN-USE:",
+        "AP[3].SSID:Back\\\\slash",
+        "GENERAL.DEVICE:eth0",
+        "GENERAL.TYPE:ethernet",
+        "GENERAL.STATE:20 (unavailable)",
+        "GENERAL.CONNECTION:",
+        "GENERAL.DEVICE:lo",
+        "GENERAL.TYPE:loopback",
+        "GENERAL.STATE:10 (unmanaged)",
+        "GENERAL.CONNECTION:",
+    ]
+)
+
+
+async def legacy_three_call_status():
+    """The original get_connection_status() query sequence"""
+    _, stdout, _ = await run_nmcli(
+        "-t", "-f", "TYPE,DEVICE,STATE,NAME", "connection", "show", "--active"
+    )
+    for line in stdout.strip().split("\n"):
+        parts = line.split(":")
+        if len(parts) >= 4 and parts[0] == "802-11-wireless" and parts[2] == "activated":
+            device = parts[1]
+            _, wifi_out, _ = await run_nmcli("-t", "-f", "IN-USE,SSID", "dev", "wifi")
+            _, ip_out, _ = await run_nmcli(
+                "-t", "-f", "IP4.ADDRESS", "dev", "show", device
+            )
+            return device, wifi_out, ip_out
+    return None
+
+
+async def time_async(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def time_sync(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(
+        f"{name:<34} median {statistics.median(samples):8.3f} ms   "
+        f"min {min(samples):8.3f} ms   max {max(samples):8.3f} ms   n={len(samples)}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Connection status query benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="Runs per variant")
+    args = parser.parse_args()
+
+    print("Parser (synthetic output, SSIDs with escaped colons):")
+    result = active_wifi_from_devices(parse_device_show(SAMPLE_DEVICE_SHOW))
+    assert result["ssid"] == "Cafe:Guest", result
+    assert split_terse("AP[3].SSID:Back\\\\slash", 1)[1] == "Back\\slash"
+    report(
+        "parse_device_show",
+        time_sync(
+            lambda: active_wifi_from_devices(parse_device_show(SAMPLE_DEVICE_SHOW)),
+            args.iterations * 100,
+        ),
+    )
+
+    if not shutil.which("nmcli"):
+        print("\nnmcli not found - skipping live NetworkManager comparison")
+        return
+
+    print("\nLive NetworkManager:")
+    report("legacy three-call path", await time_async(legacy_three_call_status, args.iterations))
+    report("single device show query", await time_async(query_active_wifi, args.iterations))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+NetworkUtils Backend Benchmark
+
+Times capturing a fresh NetworkUtils.snapshot() - everything the e-ink
+info screen shows (SSID, IP, MAC, signal, interface list) - with the native
+sysfs/procfs/netlink backend and with the command-line tool parsers it
+falls back to, and building the interface list alone from an rtnetlink
+dump versus parsing `ip addr show`.
+
+Usage:
+    python3 benchmarks/bench_network_utils.py --iterations 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.interface_table import InterfaceTable  # noqa: E402
+from network.network_utils import NetworkUtils  # noqa: E402
+
+
+def info_screen(utils: NetworkUtils):
+    snapshot = utils.snapshot()
+    return (
+        snapshot.ssid,
+        snapshot.ip_address,
+        snapshot.mac_address,
+        snapshot.signal_strength,
+        snapshot.details(),
+    )
+
+
+def time_sync(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(
+        f"{name:<22} median {statistics.median(samples):9.3f} ms   "
+        f"min {min(samples):9.3f} ms   max {max(samples):9.3f} ms   n={len(samples)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetworkUtils backend benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="Runs per backend")
+    args = parser.parse_args()
+
+    native = NetworkUtils()
+    tools = NetworkUtils(native=False)
+
+    native_result = info_screen(native)
+    tools_result = info_screen(tools)
+    for label, a, b in zip(("ssid", "ip", "mac", "signal"), native_result, tools_result):
+        marker = "" if a == b else "   (differs)"
+        print(f"{label:<8} native={a!r} tools={b!r}{marker}")
+    print()
+
+    report("native backend", time_sync(lambda: info_screen(native), args.iterations * 10))
+    report("command-line tools", time_sync(lambda: info_screen(tools), args.iterations))
+    report("interface table dump", time_sync(lambda: InterfaceTable().refresh(), args.iterations * 10))
+    report("ip addr show parse", time_sync(tools._get_network_interfaces, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+End-to-End Provisioning Benchmark
+
+Drives WiFiSetupService.run() and the WiFiServer HTTP API against the
+NetworkManager simulator (benchmarks/nm_simulator.py): boot, hotspot up,
+POST /api/connect, and connection success or failure. Reports per scenario:
+
+    time-to-hotspot   service start until the setup hotspot is active
+    connect response  latency of POST /api/connect
+    time-to-connect   POST /api/connect until the service saw the connection
+                      (or until the attempt ended, for failure scenarios)
+    subprocesses      nmcli/ip processes spawned during boot and connect
+
+Usage:
+    python3 benchmarks/bench_provisioning.py
+    python3 benchmarks/bench_provisioning.py --scenario wrong-password --dhcp 3
+    python3 benchmarks/bench_provisioning.py --backend dbus
+
+Requires the service dependencies (fastapi, uvicorn). The setup server
+listens on port 8080, which must be free. With the default nmcli backend
+D-Bus is bypassed (WIFI_NM_BACKEND=nmcli) so every NetworkManager call goes
+to the fake nmcli; --backend dbus serves the same simulator over a private
+bus instead (benchmarks/nm_dbus_mock.py, needs dbus-daemon).
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from nm_simulator import NMSimulator  # noqa: E402
+
+SERVER_URL = "http://127.0.0.1:8080"
+
+
+@dataclass
+class Scenario:
+    name: str
+    ssid: str
+    password: str
+    expect_connected: bool
+    startup_check: bool = False
+    sim: Dict = field(default_factory=dict)
+
+
+SCENARIOS = [
+    Scenario("cold-boot", "HomeNet", "correct horse", True, startup_check=True),
+    Scenario("first-setup", "HomeNet", "correct horse", True),
+    Scenario(
+        "known-network",
+        "HomeNet",
+        "",
+        True,
+        sim={"profiles": [{"ssid": "HomeNet", "psk": "correct horse", "timestamp": 1}]},
+    ),
+    Scenario("open-network", "Cafe Guest", "", True),
+    Scenario("wrong-password", "HomeNet", "wrong password", False),
+    Scenario("typo-ssid", "HomeNte", "correct horse", False),
+    Scenario("dhcp-timeout", "HomeNet", "correct horse", False, sim={"failures": {"dhcp": ["HomeNet"]}}),
+]
+
+
+def post_json(url: str, payload: dict, timeout: float = 30.0):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+async def wait_for(predicate, timeout: float, interval: float = 0.02) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(interval)
+    return False
+
+
+def make_service(marks: Dict[str, float]):
+    from wifi_setup_service import WiFiSetupService
+
+    class BenchService(WiFiSetupService):
+        """WiFiSetupService with timing marks; success skips mDNS and the grace period"""
+
+        async def start_hotspot(self) -> bool:
+            started = await super().start_hotspot()
+            marks["hotspot_up"] = time.monotonic()
+            return started
+
+        async def _handle_connection_success(self, status):
+            marks["connected"] = time.monotonic()
+
+    return BenchService(check_button=False, enable_eink=False, mdns_hostname="bench")
+
+
+async def run_scenario(
+    scenario: Scenario, latencies: Dict[str, float], backend: str, verbose: bool
+) -> Dict:
+    sim = NMSimulator(latencies=latencies, **scenario.sim)
+    sim.activate()
+    os.environ["WIFI_NM_BACKEND"] = backend
+    os.environ["WIFI_SETUP_STATE_DIR"] = os.path.join(sim.workdir, "state")
+
+    mock = None
+    marks: Dict[str, float] = {}
+    result: Dict = {"scenario": scenario.name}
+    run_task = None
+    try:
+        if backend == "dbus":
+            from nm_dbus_mock import NMDBusMock
+
+            mock = NMDBusMock(sim)
+            mock.start()
+            mock.activate()
+
+        service = make_service(marks)
+        logging.getLogger().setLevel(logging.INFO if verbose else logging.WARNING)
+
+        marks["start"] = time.monotonic()
+        run_task = asyncio.create_task(service.run(check_startup=scenario.startup_check))
+
+        if not await wait_for(lambda: "hotspot_up" in marks or run_task.done(), 120):
+            raise RuntimeError("hotspot did not come up")
+        if run_task.done():
+            raise RuntimeError(f"service exited early: {run_task.result()}")
+        boot_invocations = len(sim.invocations())
+        result["time_to_hotspot"] = marks["hotspot_up"] - marks["start"]
+
+        if not await wait_for(lambda: service.server is not None and service.server.started, 30):
+            raise RuntimeError("web server did not start")
+
+        manager = service.wifi_manager
+        marks["connect_request"] = time.monotonic()
+        status, body = await asyncio.to_thread(
+            post_json,
+            f"{SERVER_URL}/api/connect",
+            {"ssid": scenario.ssid, "password": scenario.password},
+        )
+        marks["connect_response"] = time.monotonic()
+        result["http_status"] = status
+        result["connect_response"] = marks["connect_response"] - marks["connect_request"]
+
+        if status == 200:
+            await wait_for(lambda: manager.last_connect_timings is not None, 180)
+            if scenario.expect_connected:
+                await wait_for(lambda: "connected" in marks, 30)
+        end = marks.get("connected", time.monotonic())
+        result["time_to_connect"] = end - marks["connect_request"]
+        result["connected"] = "connected" in marks
+        result["timings"] = manager.last_connect_timings
+
+        invocations = sim.invocations()
+        result["subprocesses_boot"] = boot_invocations
+        result["subprocesses_connect"] = len(invocations) - boot_invocations
+        result["commands"] = collections.Counter(
+            " ".join(line.split()[:4]) for line in invocations[boot_invocations:]
+        )
+        result["ok"] = result["connected"] == scenario.expect_connected
+        return result
+    finally:
+        if run_task is not None and not run_task.done():
+            run_task.cancel()
+            try:
+                await run_task
+            except asyncio.CancelledError:
+                pass
+        if mock is not None:
+            mock.stop()
+        sim.close()
+
+
+def report(results: List[Dict]):
+    print()
+    print(
+        f"{'scenario':<16}{'ok':>4}{'hotspot s':>11}{'POST ms':>10}"
+        f"{'connect s':>11}{'procs boot':>12}{'procs conn':>12}"
+    )
+    for result in results:
+        if "error" in result:
+            print(f"{result['scenario']:<16} ERR {result['error']}")
+            continue
+        print(
+            f"{result['scenario']:<16}{'yes' if result['ok'] else 'NO':>4}"
+            f"{result['time_to_hotspot']:>11.2f}{result['connect_response'] * 1000:>10.1f}"
+            f"{result['time_to_connect']:>11.2f}{result['subprocesses_boot']:>12}"
+            f"{result['subprocesses_connect']:>12}"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="End-to-end provisioning benchmark")
+    parser.add_argument("--scenario", action="append", help="Run only these scenarios")
+    parser.add_argument(
+        "--backend",
+        choices=["nmcli", "dbus"],
+        default="nmcli",
+        help="NetworkManager backend under test (default: nmcli)",
+    )
+    parser.add_argument("--scan", type=float, default=1.5, help="Simulated rescan latency (s)")
+    parser.add_argument("--associate", type=float, default=1.0, help="Simulated association latency (s)")
+    parser.add_argument("--dhcp", type=float, default=0.8, help="Simulated DHCP latency (s)")
+    parser.add_argument("--hotspot", type=float, default=0.6, help="Simulated AP bring-up latency (s)")
+    parser.add_argument("--json", action="store_true", help="Print full results as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show service logs")
+    args = parser.parse_args()
+
+    latencies = {
+        "scan": args.scan,
+        "associate": args.associate,
+        "dhcp": args.dhcp,
+        "hotspot": args.hotspot,
+    }
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+
+    results = []
+    for scenario in scenarios:
+        print(f"Running {scenario.name}...", flush=True)
+        try:
+            results.append(await run_scenario(scenario, latencies, args.backend, args.verbose))
+        except Exception as e:
+            results.append({"scenario": scenario.name, "error": str(e)})
+
+    report(results)
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
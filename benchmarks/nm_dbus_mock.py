@@ -0,0 +1,731 @@
+#!/usr/bin/env python3
+"""
+NetworkManager D-Bus Mock
+
+Serves the NetworkManager simulator (benchmarks/nm_simulator.py) as
+org.freedesktop.NetworkManager on a private dbus-daemon, so the D-Bus
+backend (NMDBusClient and the D-Bus event source) runs end to end the way
+the fake nmcli exercises the nmcli backend. Both share one state file: a
+connection made over D-Bus shows up in the fake nmcli and the other way
+round, and the simulator's latencies and injected failures apply to both.
+
+Objects:
+    /org/freedesktop/NetworkManager                  Manager
+    /org/freedesktop/NetworkManager/Devices/1        wlan0 (Device, Device.Wireless)
+    /org/freedesktop/NetworkManager/AccessPoint/N    scan results (0 is the hotspot)
+    /org/freedesktop/NetworkManager/Settings[/N]     saved profiles
+    /org/freedesktop/NetworkManager/ActiveConnection/N
+    /org/freedesktop/NetworkManager/IP4Config/1
+
+Every device state change the simulator records, whoever made it, is
+re-published as Device, Connection.Active and Manager StateChanged signals
+plus PropertiesChanged, within POLL_INTERVAL. Only the methods, properties
+and signals NMDBusClient and NMEventMonitor use are implemented.
+
+Usage:
+    python3 benchmarks/nm_dbus_mock.py
+    # prints WIFI_NM_DBUS_ADDRESS, NMSIM_STATE and PATH for a fresh simulator
+
+    with NMSimulator() as sim, NMDBusMock(sim):
+        ...  # WIFI_NM_DBUS_ADDRESS now points at the mock
+
+Requires dbus-next and the dbus-daemon binary.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dbus_next import Message, MessageType, Variant  # noqa: E402
+from dbus_next.aio import MessageBus  # noqa: E402
+from dbus_next.errors import DBusError  # noqa: E402
+
+from network.nm_dbus import (  # noqa: E402
+    NM_802_11_MODE_AP,
+    NM_ACTIVE_CONNECTION_STATE_ACTIVATED,
+    NM_ACTIVE_CONNECTION_STATE_ACTIVATING,
+    NM_ACTIVE_CONNECTION_STATE_DEACTIVATED,
+    NM_ACTIVE_IFACE,
+    NM_AP_IFACE,
+    NM_BUS_NAME,
+    NM_CONNECTION_IFACE,
+    NM_DEVICE_IFACE,
+    NM_DEVICE_STATE_ACTIVATED,
+    NM_DEVICE_STATE_DEACTIVATING,
+    NM_DEVICE_STATE_DISCONNECTED,
+    NM_DEVICE_STATE_FAILED,
+    NM_DEVICE_STATE_PREPARE,
+    NM_DEVICE_STATE_REASON_SSID_NOT_FOUND,
+    NM_DEVICE_TYPE_WIFI,
+    NM_IFACE,
+    NM_IP4_IFACE,
+    NM_PATH,
+    NM_SETTINGS_IFACE,
+    NM_SETTINGS_PATH,
+    NM_WIRELESS_IFACE,
+    PROPERTIES_IFACE,
+)
+from network.scan_index import AP_FLAGS_PRIVACY, AP_SEC_KEY_MGMT_PSK  # noqa: E402
+from nm_simulator import (  # noqa: E402
+    DEVICE_STATE_TEXT,
+    SIM_BIN,
+    NMSimulator,
+    _activate,
+    _active_profile,
+    _deactivate,
+    _new_profile,
+    _Sim,
+    _visible,
+)
+
+DEVICE_PATH = f"{NM_PATH}/Devices/1"
+IP4_CONFIG_PATH = f"{NM_PATH}/IP4Config/1"
+AP_PATH = f"{NM_PATH}/AccessPoint"
+HOTSPOT_AP_PATH = f"{AP_PATH}/0"
+ACTIVE_PATH = f"{NM_PATH}/ActiveConnection"
+
+NM_802_11_MODE_INFRA = 2
+NM_ACTIVE_CONNECTION_STATE_DEACTIVATING = 3
+
+# NMState
+NM_STATE_DISCONNECTED = 20
+NM_STATE_DISCONNECTING = 30
+NM_STATE_CONNECTING = 40
+NM_STATE_CONNECTED_GLOBAL = 70
+
+DEVICE_STATES = {text: code for code, text in DEVICE_STATE_TEXT.items()}
+
+# Seconds between checks of the simulator's event log
+POLL_INTERVAL = 0.02
+
+
+def _plain(value):
+    """Strip Variants from a method argument"""
+    if isinstance(value, Variant):
+        return _plain(value.value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _activate_profile(sim: _Sim, profile: dict) -> int:
+    """`nmcli connection up` for one profile, failing with a reason when out of range"""
+    if sim.state["device"]["active"]:
+        _deactivate(sim)
+        sim.read()
+    if profile["mode"] != "ap" and not any(
+        ap["ssid"] == profile["ssid"] for ap in _visible(sim.state)
+    ):
+        sim.set_device_state(NM_DEVICE_STATE_PREPARE, active=profile["uuid"], ip=None, reason=0)
+        sim.set_device_state(
+            NM_DEVICE_STATE_FAILED, active=None, reason=NM_DEVICE_STATE_REASON_SSID_NOT_FOUND
+        )
+        sim.set_device_state(NM_DEVICE_STATE_DISCONNECTED)
+        return 4
+    return _activate(sim, profile)
+
+
+def _add_profile(sim: _Sim, profile: dict):
+    with sim.locked() as state:
+        state["profiles"].append(profile)
+    sim.emit(f"{profile['name']}: connection profile created")
+
+
+def _delete_profile(sim: _Sim, uuid: str):
+    with sim.locked() as state:
+        removed = [p for p in state["profiles"] if p["uuid"] == uuid]
+        state["profiles"] = [p for p in state["profiles"] if p["uuid"] != uuid]
+        was_active = state["device"]["active"] == uuid
+    for profile in removed:
+        sim.emit(f"{profile['name']}: connection profile removed")
+    if was_active:
+        sim.set_device_state(NM_DEVICE_STATE_DISCONNECTED, active=None, ip=None)
+
+
+class MockNetworkManager:
+    """org.freedesktop.NetworkManager backed by a simulator state file"""
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self._sim = _Sim(state_path)
+        self._bus = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Stable object numbers
+        self._ap_ids: Dict[str, int] = {}  # bssid
+        self._profile_ids: Dict[str, int] = {}  # uuid
+        self._active_uuids: Dict[str, str] = {}  # active connection path -> uuid
+        self._latest_active: Dict[str, str] = {}  # uuid -> newest active path
+
+        # Last published values, for StateChanged signals
+        self._device_state = NM_DEVICE_STATE_DISCONNECTED
+        self._nm_state = NM_STATE_DISCONNECTED
+        self._active_states: Dict[str, int] = {}
+        self._profiles: Set[str] = set()
+
+        self._activating: Set[str] = set()  # active paths with a job in flight
+        self._job_lock: Optional[asyncio.Lock] = None
+        self._last_scan = self._now_ms()
+
+        self._methods: Dict[tuple, Callable] = {
+            (PROPERTIES_IFACE, "Get"): self._get,
+            (PROPERTIES_IFACE, "GetAll"): self._get_all,
+            (NM_IFACE, "GetDevices"): self._get_devices,
+            (NM_IFACE, "ActivateConnection"): self._activate_connection,
+            (NM_IFACE, "AddAndActivateConnection"): self._add_and_activate,
+            (NM_IFACE, "DeactivateConnection"): self._deactivate_connection,
+            (NM_WIRELESS_IFACE, "GetAllAccessPoints"): self._get_access_points,
+            (NM_WIRELESS_IFACE, "GetAccessPoints"): self._get_access_points,
+            (NM_WIRELESS_IFACE, "RequestScan"): self._request_scan,
+            (NM_SETTINGS_IFACE, "ListConnections"): self._list_connections,
+            (NM_SETTINGS_IFACE, "GetConnectionByUuid"): self._get_connection_by_uuid,
+            (NM_SETTINGS_IFACE, "AddConnection"): self._add_connection,
+            (NM_CONNECTION_IFACE, "GetSettings"): self._get_settings,
+            (NM_CONNECTION_IFACE, "Delete"): self._delete,
+        }
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.monotonic() * 1000)
+
+    async def serve(self, bus_address: str):
+        """Take the NetworkManager name on bus_address and answer until cancelled"""
+        state = self._sim.read()
+        self._device_state = state["device"]["state"]
+        self._nm_state = self._global_state(self._device_state)
+        self._profiles = {p["uuid"] for p in state["profiles"]}
+
+        self._bus = await MessageBus(bus_address=bus_address).connect()
+        self._bus.add_message_handler(self._on_message)
+        await self._bus.request_name(NM_BUS_NAME)
+        print(bus_address, flush=True)
+        await self._follow_events()
+
+    # ------------------------------------------------------------------
+    # Object model
+    # ------------------------------------------------------------------
+
+    def _ap_path(self, ap: dict) -> str:
+        number = self._ap_ids.setdefault(ap["bssid"], len(self._ap_ids) + 1)
+        return f"{AP_PATH}/{number}"
+
+    def _profile_path(self, uuid: str) -> str:
+        number = self._profile_ids.setdefault(uuid, len(self._profile_ids) + 1)
+        return f"{NM_SETTINGS_PATH}/{number}"
+
+    def _new_active_path(self, uuid: str) -> str:
+        path = f"{ACTIVE_PATH}/{len(self._active_uuids) + 1}"
+        self._active_uuids[path] = uuid
+        self._latest_active[uuid] = path
+        return path
+
+    def _find_profile(self, state: dict, path: str) -> Optional[dict]:
+        for profile in state["profiles"]:
+            if self._profile_path(profile["uuid"]) == path:
+                return profile
+        return None
+
+    def _hotspot_ap(self, state: dict) -> Optional[dict]:
+        profile = _active_profile(state)
+        if profile is None or profile["mode"] != "ap":
+            return None
+        return {
+            "ssid": profile["ssid"],
+            "bssid": "02:00:00:00:00:01",
+            "freq": 2437,
+            "signal": 100,
+            "security": "WPA2" if profile.get("psk") else "",
+            "mode": NM_802_11_MODE_AP,
+        }
+
+    def _find_ap(self, state: dict, path: str) -> Optional[dict]:
+        if path == HOTSPOT_AP_PATH:
+            return self._hotspot_ap(state)
+        for ap in _visible(state):
+            if self._ap_path(ap) == path:
+                return ap
+        return None
+
+    def _active_ap_path(self, state: dict) -> str:
+        profile = _active_profile(state)
+        if profile is None or state["device"]["state"] != NM_DEVICE_STATE_ACTIVATED:
+            return "/"
+        if profile["mode"] == "ap":
+            return HOTSPOT_AP_PATH
+        matching = [ap for ap in _visible(state) if ap["ssid"] == profile["ssid"]]
+        if not matching:
+            return "/"
+        return self._ap_path(max(matching, key=lambda ap: ap["signal"]))
+
+    def _device_active_path(self, state: dict) -> str:
+        uuid = state["device"]["active"]
+        if not uuid:
+            return "/"
+        # Activated outside D-Bus (fake nmcli, or connected_to at start)
+        return self._latest_active.get(uuid) or self._new_active_path(uuid)
+
+    def _active_state(self, path: str, device_state: int, active_uuid: Optional[str]) -> int:
+        uuid = self._active_uuids[path]
+        if path in self._activating:
+            if active_uuid != uuid or device_state < NM_DEVICE_STATE_PREPARE:
+                return NM_ACTIVE_CONNECTION_STATE_ACTIVATING
+            self._activating.discard(path)  # the simulator has taken it from here
+        if active_uuid != uuid or self._latest_active.get(uuid) != path:
+            return NM_ACTIVE_CONNECTION_STATE_DEACTIVATED
+        if device_state == NM_DEVICE_STATE_ACTIVATED:
+            return NM_ACTIVE_CONNECTION_STATE_ACTIVATED
+        if device_state == NM_DEVICE_STATE_DEACTIVATING:
+            return NM_ACTIVE_CONNECTION_STATE_DEACTIVATING
+        if device_state >= NM_DEVICE_STATE_PREPARE:
+            return NM_ACTIVE_CONNECTION_STATE_ACTIVATING
+        return NM_ACTIVE_CONNECTION_STATE_DEACTIVATED
+
+    @staticmethod
+    def _global_state(code: int) -> int:
+        if code == NM_DEVICE_STATE_ACTIVATED:
+            return NM_STATE_CONNECTED_GLOBAL
+        if code == NM_DEVICE_STATE_DEACTIVATING:
+            return NM_STATE_DISCONNECTING
+        if NM_DEVICE_STATE_PREPARE <= code < NM_DEVICE_STATE_ACTIVATED:
+            return NM_STATE_CONNECTING
+        return NM_STATE_DISCONNECTED
+
+    def _ap_properties(self, ap: dict) -> Dict[str, Variant]:
+        security = ap.get("security", "").split()
+        return {
+            "Ssid": Variant("ay", ap["ssid"].encode()),
+            "HwAddress": Variant("s", ap["bssid"]),
+            "Frequency": Variant("u", ap["freq"]),
+            "Strength": Variant("y", ap["signal"]),
+            "Mode": Variant("u", ap.get("mode", NM_802_11_MODE_INFRA)),
+            "Flags": Variant("u", AP_FLAGS_PRIVACY if security else 0),
+            "WpaFlags": Variant("u", AP_SEC_KEY_MGMT_PSK if "WPA1" in security else 0),
+            "RsnFlags": Variant("u", AP_SEC_KEY_MGMT_PSK if "WPA2" in security else 0),
+        }
+
+    def _properties(self, path: str, interface: str) -> Dict[str, Variant]:
+        state = self._sim.read()
+        device = state["device"]
+
+        if path == NM_PATH and interface == NM_IFACE:
+            return {
+                "Version": Variant("s", "1.42.4-nmsim"),
+                "State": Variant("u", self._global_state(device["state"])),
+                "Devices": Variant("ao", [DEVICE_PATH]),
+                "WirelessEnabled": Variant("b", True),
+            }
+        if path == DEVICE_PATH and interface == NM_DEVICE_IFACE:
+            return {
+                "Interface": Variant("s", device["iface"]),
+                "DeviceType": Variant("u", NM_DEVICE_TYPE_WIFI),
+                "Managed": Variant("b", True),
+                "State": Variant("u", device["state"]),
+                "StateReason": Variant("(uu)", [device["state"], device.get("reason", 0)]),
+                "ActiveConnection": Variant("o", self._device_active_path(state)),
+                "Ip4Config": Variant("o", IP4_CONFIG_PATH if device["ip"] else "/"),
+            }
+        if path == DEVICE_PATH and interface == NM_WIRELESS_IFACE:
+            return {
+                "ActiveAccessPoint": Variant("o", self._active_ap_path(state)),
+                "AccessPoints": Variant("ao", [self._ap_path(ap) for ap in _visible(state)]),
+                "LastScan": Variant("x", self._last_scan),
+            }
+        if path == IP4_CONFIG_PATH and interface == NM_IP4_IFACE and device["ip"]:
+            address = {"address": Variant("s", device["ip"]), "prefix": Variant("u", 24)}
+            return {"AddressData": Variant("aa{sv}", [address])}
+        if path.startswith(AP_PATH + "/") and interface == NM_AP_IFACE:
+            ap = self._find_ap(state, path)
+            if ap is not None:
+                return self._ap_properties(ap)
+        if path in self._active_uuids and interface == NM_ACTIVE_IFACE:
+            uuid = self._active_uuids[path]
+            profile = next((p for p in state["profiles"] if p["uuid"] == uuid), None)
+            return {
+                "Id": Variant("s", profile["name"] if profile else ""),
+                "Uuid": Variant("s", uuid),
+                "Type": Variant("s", "802-11-wireless"),
+                "Connection": Variant("o", self._profile_path(uuid)),
+                "Devices": Variant("ao", [DEVICE_PATH]),
+                "State": Variant(
+                    "u", self._active_state(path, device["state"], device["active"])
+                ),
+            }
+        raise DBusError("org.freedesktop.DBus.Error.UnknownObject", f"No {interface} at {path}")
+
+    def _settings(self, profile: dict) -> Dict[str, Dict[str, Variant]]:
+        # Like NetworkManager, GetSettings leaves out secrets
+        settings = {
+            "connection": {
+                "id": Variant("s", profile["name"]),
+                "uuid": Variant("s", profile["uuid"]),
+                "type": Variant("s", "802-11-wireless"),
+                "timestamp": Variant("t", profile["timestamp"]),
+                "autoconnect": Variant("b", profile["mode"] != "ap"),
+            },
+            "802-11-wireless": {
+                "ssid": Variant("ay", profile["ssid"].encode()),
+                "mode": Variant("s", profile["mode"]),
+            },
+        }
+        if profile.get("psk"):
+            settings["802-11-wireless-security"] = {"key-mgmt": Variant("s", "wpa-psk")}
+        if profile["mode"] == "ap":
+            settings["ipv4"] = {"method": Variant("s", "shared")}
+        return settings
+
+    @staticmethod
+    def _profile_from_settings(settings: dict) -> dict:
+        settings = _plain(settings)
+        connection = settings.get("connection", {})
+        wireless = settings.get("802-11-wireless", {})
+        extra = {}
+        address_data = settings.get("ipv4", {}).get("address-data")
+        if address_data:
+            extra["address"] = address_data[0]["address"]
+        return _new_profile(
+            bytes(wireless.get("ssid", b"")).decode("utf-8", errors="replace"),
+            name=connection.get("id"),
+            psk=settings.get("802-11-wireless-security", {}).get("psk", ""),
+            mode=wireless.get("mode", "infrastructure"),
+            uuid=connection.get("uuid"),
+            **extra,
+        )
+
+    # ------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------
+
+    def _on_message(self, message: Message):
+        if message.message_type != MessageType.METHOD_CALL:
+            return None
+        method = self._methods.get((message.interface, message.member))
+        if method is None:
+            return None
+        signature, body = method(message.path, *message.body)
+        return Message.new_method_return(message, signature, body)
+
+    def _get(self, path: str, interface: str, name: str):
+        properties = self._properties(path, interface)
+        if name not in properties:
+            raise DBusError(
+                "org.freedesktop.DBus.Error.InvalidArgs", f"No property {interface}.{name}"
+            )
+        return "v", [properties[name]]
+
+    def _get_all(self, path: str, interface: str):
+        return "a{sv}", [self._properties(path, interface)]
+
+    def _get_devices(self, path: str):
+        return "ao", [[DEVICE_PATH]]
+
+    def _get_access_points(self, path: str):
+        return "ao", [[self._ap_path(ap) for ap in _visible(self._sim.read())]]
+
+    def _request_scan(self, path: str, options: dict):
+        if self._hotspot_ap(self._sim.read()) is not None:
+            raise DBusError(
+                "org.freedesktop.NetworkManager.Device.NotAllowed", "Scanning not allowed in AP mode"
+            )
+        self._spawn(self._scan())
+        return "", []
+
+    def _activate_connection(self, path: str, connection: str, device: str, specific: str):
+        profile = self._find_profile(self._sim.read(), connection)
+        if profile is None:
+            raise DBusError(
+                "org.freedesktop.NetworkManager.UnknownConnection", f"No connection {connection}"
+            )
+        return "o", [self._start_activation(profile)]
+
+    def _add_and_activate(self, path: str, settings: dict, device: str, specific: str):
+        profile = self._profile_from_settings(settings)
+        _add_profile(self._sim, profile)
+        return "oo", [self._profile_path(profile["uuid"]), self._start_activation(profile)]
+
+    def _deactivate_connection(self, path: str, active_path: str):
+        uuid = self._active_uuids.get(active_path)
+        if uuid is None or self._sim.read()["device"]["active"] != uuid:
+            raise DBusError(
+                "org.freedesktop.NetworkManager.ConnectionNotActive", f"{active_path} is not active"
+            )
+        self._spawn(self._run_job(_deactivate))
+        return "", []
+
+    def _list_connections(self, path: str):
+        profiles = self._sim.read()["profiles"]
+        return "ao", [[self._profile_path(p["uuid"]) for p in profiles]]
+
+    def _get_connection_by_uuid(self, path: str, uuid: str):
+        if not any(p["uuid"] == uuid for p in self._sim.read()["profiles"]):
+            raise DBusError(
+                "org.freedesktop.NetworkManager.Settings.InvalidConnection", f"No connection {uuid}"
+            )
+        return "o", [self._profile_path(uuid)]
+
+    def _add_connection(self, path: str, settings: dict):
+        profile = self._profile_from_settings(settings)
+        _add_profile(self._sim, profile)
+        return "o", [self._profile_path(profile["uuid"])]
+
+    def _get_settings(self, path: str):
+        profile = self._find_profile(self._sim.read(), path)
+        if profile is None:
+            raise DBusError("org.freedesktop.DBus.Error.UnknownObject", f"No connection {path}")
+        return "a{sa{sv}}", [self._settings(profile)]
+
+    def _delete(self, path: str):
+        profile = self._find_profile(self._sim.read(), path)
+        if profile is None:
+            raise DBusError("org.freedesktop.DBus.Error.UnknownObject", f"No connection {path}")
+        _delete_profile(self._sim, profile["uuid"])
+        return "", []
+
+    # ------------------------------------------------------------------
+    # Simulated work
+    # ------------------------------------------------------------------
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_job(self, job: Callable, *args):
+        """Run a simulator function in a worker thread, one at a time
+
+        The simulator sleeps through its latencies, so (de)activations run
+        off the event loop while D-Bus calls keep being answered.
+        """
+
+        def run():
+            sim = _Sim(self.state_path)
+            try:
+                sim.read()
+                return job(sim, *args)
+            finally:
+                sim.close()
+
+        if self._job_lock is None:
+            self._job_lock = asyncio.Lock()
+
+        async with self._job_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, run)
+
+    def _start_activation(self, profile: dict) -> str:
+        path = self._new_active_path(profile["uuid"])
+        self._activating.add(path)
+        self._active_states[path] = NM_ACTIVE_CONNECTION_STATE_ACTIVATING
+        self._spawn(self._activation(path, profile))
+        return path
+
+    async def _activation(self, path: str, profile: dict):
+        try:
+            await self._run_job(_activate_profile, profile)
+        finally:
+            # Normally cleared once the device takes the connection; not if
+            # the job failed before that
+            if path in self._activating:
+                self._activating.discard(path)
+                self._publish_active_states(self._device_state, None)
+
+    async def _scan(self):
+        delay = self._sim.read().get("latency", {}).get("scan", 0)
+        await asyncio.sleep(delay)
+        self._last_scan = self._now_ms()
+        self._properties_changed(DEVICE_PATH, NM_WIRELESS_IFACE, ["LastScan", "AccessPoints"])
+
+    # ------------------------------------------------------------------
+    # Signals
+    # ------------------------------------------------------------------
+
+    def _signal(self, path: str, interface: str, member: str, signature: str, body: List):
+        self._bus.send(Message.new_signal(path, interface, member, signature, body))
+
+    def _properties_changed(self, path: str, interface: str, names: List[str]):
+        properties = self._properties(path, interface)
+        changed = {name: properties[name] for name in names if name in properties}
+        self._signal(
+            path, PROPERTIES_IFACE, "PropertiesChanged", "sa{sv}as", [interface, changed, []]
+        )
+
+    async def _follow_events(self):
+        """Publish the simulator's event log as signals"""
+        events_path = os.path.join(os.path.dirname(self.state_path), "events.log")
+        with open(events_path) as f:
+            f.seek(0, os.SEEK_END)
+            while True:
+                line = f.readline()
+                if not line:
+                    await asyncio.sleep(POLL_INTERVAL)
+                    continue
+                _, _, text = line.rstrip("\n").rpartition(": ")
+                if text in DEVICE_STATES:
+                    self._publish_device_state(DEVICE_STATES[text])
+                elif text.startswith("connection profile"):
+                    self._publish_profiles()
+
+    def _publish_device_state(self, code: int):
+        # The state file may already be further along than this event, so
+        # derived states follow the event's code
+        device = self._sim.read()["device"]
+        old, self._device_state = self._device_state, code
+        reason = device.get("reason", 0)
+        self._signal(DEVICE_PATH, NM_DEVICE_IFACE, "StateChanged", "uuu", [code, old, reason])
+        self._properties_changed(
+            DEVICE_PATH,
+            NM_DEVICE_IFACE,
+            ["State", "StateReason", "ActiveConnection", "Ip4Config"],
+        )
+        self._properties_changed(DEVICE_PATH, NM_WIRELESS_IFACE, ["ActiveAccessPoint"])
+        self._publish_active_states(code, device["active"])
+
+        nm_state = self._global_state(code)
+        if nm_state != self._nm_state:
+            self._nm_state = nm_state
+            self._signal(NM_PATH, NM_IFACE, "StateChanged", "u", [nm_state])
+            self._properties_changed(NM_PATH, NM_IFACE, ["State"])
+
+    def _publish_active_states(self, device_state: int, active_uuid: Optional[str]):
+        for path in list(self._latest_active.values()):
+            active_state = self._active_state(path, device_state, active_uuid)
+            if active_state == self._active_states.get(path):
+                continue
+            self._active_states[path] = active_state
+            self._signal(path, NM_ACTIVE_IFACE, "StateChanged", "uu", [active_state, 0])
+            self._properties_changed(path, NM_ACTIVE_IFACE, ["State"])
+
+    def _publish_profiles(self):
+        profiles = {p["uuid"] for p in self._sim.read()["profiles"]}
+        for uuid in profiles - self._profiles:
+            path = self._profile_path(uuid)
+            self._signal(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "NewConnection", "o", [path])
+        for uuid in self._profiles - profiles:
+            path = self._profile_path(uuid)
+            self._signal(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "ConnectionRemoved", "o", [path])
+        self._profiles = profiles
+
+
+class NMDBusMock:
+    """Runs a private dbus-daemon with the mock serving an NMSimulator's state"""
+
+    def __init__(self, sim: NMSimulator):
+        self.sim = sim
+        self.address: Optional[str] = None
+        self._daemon: Optional[subprocess.Popen] = None
+        self._service: Optional[subprocess.Popen] = None
+        self._saved_env: Optional[str] = None
+        self._activated = False
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.sim.workdir, "dbus-mock.log")
+
+    def start(self):
+        """Start the bus and the mock; returns once NetworkManager is on the bus"""
+        self._daemon = subprocess.Popen(
+            ["dbus-daemon", "--session", "--nofork", "--print-address"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.address = self._daemon.stdout.readline().strip()
+        if not self.address:
+            self.stop()
+            raise RuntimeError("dbus-daemon did not start")
+
+        with open(self.log_path, "w") as log:
+            self._service = subprocess.Popen(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--state",
+                    self.sim.state_path,
+                    "--address",
+                    self.address,
+                ],
+                stdout=subprocess.PIPE,
+                stderr=log,
+                text=True,
+            )
+        # The mock prints the address once it owns the name
+        if self._service.stdout.readline().strip() != self.address:
+            self.stop()
+            raise RuntimeError(f"D-Bus mock did not start (see {self.log_path})")
+
+    def activate(self):
+        """Point NMDBusClient in this process (and its children) at the mock"""
+        self._saved_env = os.environ.get("WIFI_NM_DBUS_ADDRESS")
+        os.environ["WIFI_NM_DBUS_ADDRESS"] = self.address
+        self._activated = True
+
+    def deactivate(self):
+        if not self._activated:
+            return
+        if self._saved_env is None:
+            os.environ.pop("WIFI_NM_DBUS_ADDRESS", None)
+        else:
+            os.environ["WIFI_NM_DBUS_ADDRESS"] = self._saved_env
+        self._activated = False
+
+    def stop(self):
+        self.deactivate()
+        for process in (self._service, self._daemon):
+            if process is None or process.poll() is not None:
+                continue
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        for process in (self._service, self._daemon):
+            if process is not None and process.stdout is not None:
+                process.stdout.close()
+        self._service = self._daemon = None
+
+    def __enter__(self):
+        self.start()
+        self.activate()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock NetworkManager on a private D-Bus")
+    parser.add_argument("--state", help="Simulator state file to serve")
+    parser.add_argument("--address", help="Bus to serve on (default: start a private bus)")
+    args = parser.parse_args()
+
+    if args.address:
+        if not args.state:
+            parser.error("--address needs --state")
+        try:
+            asyncio.run(MockNetworkManager(args.state).serve(args.address))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    with NMSimulator() as sim, NMDBusMock(sim) as mock:
+        print(f"WIFI_NM_DBUS_ADDRESS={mock.address}")
+        print(f"NMSIM_STATE={sim.state_path}")
+        print(f"PATH={SIM_BIN}:$PATH")
+        print("Ctrl-C to stop", flush=True)
+        try:
+            mock._service.wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
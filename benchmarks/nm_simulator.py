@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+NetworkManager Simulator
+
+A stand-in for NetworkManager that WiFiManager can be pointed at without a
+radio: `sim_bin/nmcli` and `sim_bin/ip` are fake commands backed by a JSON
+state file. Put `sim_bin` first on PATH and set NMSIM_STATE to the state
+file (NMSimulator.activate() does both) and every nmcli call the services
+make is answered by the simulator.
+
+Simulated:
+    - scan results, saved profiles, one WiFi device (wlan0) and its state
+    - configurable latencies for scan, association, DHCP and hotspot start
+    - injectable failures: wrong password, association timeout, DHCP
+      timeout and unknown SSID
+    - `nmcli monitor` output for every state change, so event-driven code
+      paths run as they would against NetworkManager
+    - an invocation log, so benchmarks can count subprocesses
+
+Only the nmcli commands and output formats used by this repository are
+implemented. nm_dbus_mock.py serves the same state over D-Bus.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid as uuid_module
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+SIM_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sim_bin")
+
+DEFAULT_LATENCIES = {
+    "command": 0.01,  # every nmcli invocation
+    "scan": 1.5,  # radio rescan (dev wifi list --rescan yes, dev wifi connect)
+    "associate": 1.0,  # authentication + association
+    "dhcp": 0.8,  # IPv4 configuration
+    "hotspot": 0.6,  # AP mode bring-up
+    "deactivate": 0.3,
+}
+
+DEFAULT_ACCESS_POINTS = [
+    {"ssid": "HomeNet", "bssid": "AA:BB:CC:00:00:01", "freq": 2437, "signal": 82, "security": "WPA2"},
+    {"ssid": "HomeNet", "bssid": "AA:BB:CC:00:00:02", "freq": 5180, "signal": 64, "security": "WPA2"},
+    {"ssid": "Cafe Guest", "bssid": "AA:BB:CC:00:00:03", "freq": 2462, "signal": 47, "security": ""},
+    {"ssid": "Neighbour", "bssid": "AA:BB:CC:00:00:04", "freq": 2412, "signal": 31, "security": "WPA1 WPA2"},
+]
+
+DEFAULT_PASSWORDS = {"HomeNet": "correct horse", "Neighbour": "neighbour123"}
+
+DEVICE_STATE_TEXT = {
+    20: "unavailable",
+    30: "disconnected",
+    40: "connecting (prepare)",
+    50: "connecting (configuring)",
+    70: "connecting (getting IP configuration)",
+    100: "connected",
+    110: "deactivating",
+    120: "connection failed",
+}
+
+
+class NMSimulator:
+    """Owns a simulator state directory and the environment that selects it"""
+
+    def __init__(
+        self,
+        latencies: Optional[Dict[str, float]] = None,
+        access_points: Optional[List[dict]] = None,
+        passwords: Optional[Dict[str, str]] = None,
+        profiles: Optional[List[dict]] = None,
+        failures: Optional[Dict[str, List[str]]] = None,
+        connected_to: Optional[str] = None,
+    ):
+        self.workdir = tempfile.mkdtemp(prefix="nmsim-")
+        self.state_path = os.path.join(self.workdir, "state.json")
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+        state = {
+            "latency": dict(DEFAULT_LATENCIES, **(latencies or {})),
+            "access_points": access_points if access_points is not None else DEFAULT_ACCESS_POINTS,
+            "passwords": passwords if passwords is not None else DEFAULT_PASSWORDS,
+            # failures: {"auth" | "associate" | "dhcp": [ssid, ...]}
+            "failures": failures or {},
+            "profiles": [],
+            # reason: NMDeviceStateReason of the last failure (0 = none)
+            "device": {"iface": "wlan0", "state": 30, "active": None, "ip": None, "reason": 0},
+        }
+        for profile in profiles or []:
+            state["profiles"].append(_new_profile(**profile))
+        if connected_to:
+            profile = next(p for p in state["profiles"] if p["ssid"] == connected_to)
+            state["device"].update(state=100, active=profile["uuid"], ip="192.168.1.50")
+
+        with open(self.state_path, "w") as f:
+            json.dump(state, f, indent=2)
+        open(self.events_path, "w").close()
+        open(self.invocations_path, "w").close()
+
+    @property
+    def events_path(self) -> str:
+        return os.path.join(self.workdir, "events.log")
+
+    @property
+    def invocations_path(self) -> str:
+        return os.path.join(self.workdir, "invocations.log")
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Environment variables that route nmcli/ip to the simulator"""
+        return {
+            "PATH": SIM_BIN + os.pathsep + os.environ.get("PATH", ""),
+            "NMSIM_STATE": self.state_path,
+        }
+
+    def activate(self):
+        """Point this process (and its children) at the simulator"""
+        for key, value in self.env.items():
+            self._saved_env.setdefault(key, os.environ.get(key))
+            os.environ[key] = value
+
+    def deactivate(self):
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env = {}
+
+    def close(self):
+        self.deactivate()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def state(self) -> dict:
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def invocations(self) -> List[str]:
+        """Every simulated command run so far, one string per process"""
+        with open(self.invocations_path) as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Fake command implementation (runs inside the sim_bin processes)
+# ---------------------------------------------------------------------------
+
+
+def _new_profile(
+    ssid: str,
+    name: Optional[str] = None,
+    psk: str = "",
+    mode: str = "infrastructure",
+    uuid: Optional[str] = None,
+    timestamp: int = 0,
+    **extra,
+) -> dict:
+    profile = {
+        "name": name or ssid,
+        "uuid": uuid or str(uuid_module.uuid4()),
+        "ssid": ssid,
+        "psk": psk,
+        "mode": mode,
+        "timestamp": timestamp,
+    }
+    profile.update(extra)
+    return profile
+
+
+class _Sim:
+    """State file access for one fake command invocation"""
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self.workdir = os.path.dirname(state_path)
+        self._lock_file = open(state_path + ".lock", "a+")
+        self.state: dict = {}
+
+    @contextmanager
+    def locked(self):
+        """Load the state under an exclusive lock and save it on exit"""
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+            yield self.state
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def read(self) -> dict:
+        """Load the current state without modifying it"""
+        fcntl.flock(self._lock_file, fcntl.LOCK_SH)
+        try:
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+            return self.state
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def latency(self, name: str):
+        delay = self.state.get("latency", {}).get(name, 0)
+        if delay:
+            time.sleep(delay)
+
+    def emit(self, line: str):
+        with open(os.path.join(self.workdir, "events.log"), "a") as f:
+            f.write(line + "\n")
+
+    def set_device_state(self, state_code: int, **updates):
+        with self.locked() as state:
+            device = state["device"]
+            device["state"] = state_code
+            device.update(updates)
+            iface = device["iface"]
+        self.emit(f"{iface}: {DEVICE_STATE_TEXT.get(state_code, state_code)}")
+
+    def log_invocation(self, argv: List[str]):
+        with open(os.path.join(self.workdir, "invocations.log"), "a") as f:
+            f.write(" ".join(argv) + "\n")
+
+    def close(self):
+        self._lock_file.close()
+
+
+def _escape(value) -> str:
+    return str("" if value is None else value).replace("\\", "\\\\").replace(":", "\\:")
+
+
+def _fail(message: str, code: int = 1) -> int:
+    sys.stderr.write(message + "\n")
+    return code
+
+
+def _find_profiles(state: dict, key: str) -> List[dict]:
+    return [p for p in state["profiles"] if key in (p["uuid"], p["name"])]
+
+
+def _active_profile(state: dict) -> Optional[dict]:
+    active = state["device"]["active"]
+    return next((p for p in state["profiles"] if p["uuid"] == active), None)
+
+
+def _visible(state: dict) -> List[dict]:
+    # A radio in AP mode does not report scan results
+    profile = _active_profile(state)
+    if profile and profile["mode"] == "ap":
+        return []
+    return state["access_points"]
+
+
+def _activate(sim: _Sim, profile: dict, password: Optional[str] = None) -> int:
+    """Run a simulated activation: association, then DHCP"""
+    state = sim.state
+    ssid = profile["ssid"]
+    failures = state.get("failures", {})
+
+    if profile["mode"] == "ap":
+        sim.set_device_state(40, active=profile["uuid"], ip=None, reason=0)
+        sim.latency("hotspot")
+        sim.set_device_state(100, ip=profile.get("address", "192.168.4.1"))
+        return 0
+
+    if not any(ap["ssid"] == ssid for ap in _visible(state)):
+        return _fail(
+            "Error: Connection activation failed: (53) The Wi-Fi network could not be found.", 4
+        )
+
+    sim.set_device_state(40, active=profile["uuid"], ip=None, reason=0)
+    sim.latency("associate")
+    expected = state.get("passwords", {}).get(ssid, "")
+    supplied = profile.get("psk", "") if password is None else password
+    if ssid in failures.get("auth", []) or (expected and supplied != expected):
+        sim.set_device_state(120, active=None, reason=7)
+        sim.set_device_state(30)
+        return _fail(
+            "Error: Connection activation failed: (7) Secrets were required, but not provided.", 4
+        )
+    if ssid in failures.get("associate", []):
+        sim.set_device_state(120, active=None, reason=11)
+        sim.set_device_state(30)
+        return _fail("Error: Connection activation failed: (11) Supplicant timeout.", 4)
+
+    sim.set_device_state(70)
+    sim.latency("dhcp")
+    if ssid in failures.get("dhcp", []):
+        sim.set_device_state(120, active=None, reason=5)
+        sim.set_device_state(30)
+        return _fail(
+            "Error: Connection activation failed: IP configuration could not be reserved.", 4
+        )
+
+    with sim.locked() as state:
+        for saved in state["profiles"]:
+            if saved["uuid"] == profile["uuid"]:
+                saved["timestamp"] = int(time.time())
+    sim.set_device_state(100, ip="192.168.1.50")
+    return 0
+
+
+def _deactivate(sim: _Sim):
+    sim.set_device_state(110, reason=0)
+    sim.latency("deactivate")
+    sim.set_device_state(30, active=None, ip=None)
+
+
+def _device_fields(state: dict) -> Dict[str, List[str]]:
+    device = state["device"]
+    profile = _active_profile(state)
+    fields = {
+        "GENERAL.DEVICE": [device["iface"]],
+        "GENERAL.TYPE": ["wifi"],
+        "GENERAL.STATE": [f"{device['state']} ({DEVICE_STATE_TEXT.get(device['state'], '')})"],
+        "GENERAL.CONNECTION": [profile["name"] if profile else ""],
+        "GENERAL.CON-UUID": [profile["uuid"] if profile else ""],
+        "IP4.ADDRESS": [f"{device['ip']}/24"] if device["ip"] else [],
+    }
+    connected = device["state"] == 100 and profile is not None
+    for index, ap in enumerate(_visible(state), 1):
+        in_use = connected and ap["ssid"] == profile["ssid"]
+        fields.setdefault("AP.IN-USE", []).append((f"AP[{index}].IN-USE", "*" if in_use else ""))
+        fields.setdefault("AP.SSID", []).append((f"AP[{index}].SSID", ap["ssid"]))
+    return fields
+
+
+def _cmd_device_show(state: dict, fields: List[str], terse: bool) -> int:
+    values = _device_fields(state)
+    for field in fields or ["GENERAL.DEVICE", "GENERAL.TYPE", "GENERAL.STATE", "GENERAL.CONNECTION"]:
+        for index, value in enumerate(values.get(field, [])):
+            if isinstance(value, tuple):
+                key, value = value
+            elif field == "IP4.ADDRESS":
+                key = f"IP4.ADDRESS[{index + 1}]"
+            else:
+                key = field
+            print(f"{key}:{_escape(value) if terse else value}")
+    # Second, non-WiFi device so parsers see more than one record
+    if not fields or "GENERAL.DEVICE" in fields:
+        print("GENERAL.DEVICE:lo")
+        if "GENERAL.TYPE" in (fields or ["GENERAL.TYPE"]):
+            print("GENERAL.TYPE:loopback")
+        if "GENERAL.STATE" in (fields or ["GENERAL.STATE"]):
+            print("GENERAL.STATE:10 (unmanaged)")
+    return 0
+
+
+def _cmd_wifi_list(sim: _Sim, fields: List[str], rescan: bool) -> int:
+    if rescan:
+        sim.latency("scan")
+    state = sim.read()
+    profile = _active_profile(state)
+    connected = state["device"]["state"] == 100 and profile is not None
+    fields = fields or ["IN-USE", "BSSID", "SSID", "FREQ", "SIGNAL", "SECURITY"]
+    for ap in _visible(state):
+        row = {
+            "IN-USE": "*" if connected and ap["ssid"] == profile["ssid"] else "",
+            "BSSID": ap["bssid"],
+            "SSID": ap["ssid"],
+            "FREQ": f"{ap['freq']} MHz",
+            "SIGNAL": str(ap["signal"]),
+            "SECURITY": ap["security"] or "--",
+        }
+        print(":".join(_escape(row.get(field, "")) for field in fields))
+    return 0
+
+
+def _cmd_wifi_connect(sim: _Sim, ssid: str, password: Optional[str]) -> int:
+    sim.latency("scan")
+    with sim.locked() as state:
+        if not any(ap["ssid"] == ssid for ap in _visible(state)):
+            return _fail(f"Error: No network with SSID '{ssid}' found.", 10)
+        name = ssid
+        names = {p["name"] for p in state["profiles"]}
+        suffix = 1
+        while name in names:
+            name = f"{ssid} {suffix}"
+            suffix += 1
+        profile = _new_profile(ssid, name=name, psk=password or "")
+        state["profiles"].append(profile)
+    sim.emit(f"{name}: connection profile created")
+
+    if state.get("device", {}).get("active"):
+        _deactivate(sim)
+    sim.read()
+    result = _activate(sim, profile, password or "")
+    if result == 0:
+        print(f"Device 'wlan0' successfully activated with '{profile['uuid']}'.")
+    return result
+
+
+def _cmd_connection(sim: _Sim, args: List[str], fields: List[str], terse: bool) -> int:
+    verb = args[0] if args else "show"
+    rest = args[1:]
+
+    if verb == "show":
+        state = sim.read()
+        active_only = "--active" in rest
+        names = [arg for arg in rest if not arg.startswith("--")]
+        if names:
+            profiles = _find_profiles(state, names[0])
+            if not profiles:
+                return _fail(f"Error: {names[0]} - no such connection profile.", 10)
+            profile = profiles[0]
+            values = {
+                "connection.id": profile["name"],
+                "connection.uuid": profile["uuid"],
+                "connection.timestamp": profile["timestamp"],
+                "802-11-wireless.ssid": profile["ssid"],
+                "802-11-wireless.mode": profile["mode"],
+            }
+            for field in fields or list(values):
+                print(f"{field}:{_escape(values.get(field, ''))}")
+            return 0
+
+        device = state["device"]
+        for profile in state["profiles"]:
+            is_active = profile["uuid"] == device["active"]
+            if active_only and not is_active:
+                continue
+            row = {
+                "NAME": profile["name"],
+                "UUID": profile["uuid"],
+                "TYPE": "802-11-wireless",
+                "TIMESTAMP": str(profile["timestamp"]),
+                "DEVICE": device["iface"] if is_active else "",
+                "STATE": "activated" if is_active and device["state"] == 100 else "",
+            }
+            print(":".join(_escape(row.get(field, "")) for field in fields or ["NAME", "UUID", "TYPE", "DEVICE"]))
+        return 0
+
+    if verb == "up":
+        state = sim.read()
+        profiles = _find_profiles(state, rest[0]) if rest else []
+        if not profiles:
+            return _fail(f"Error: unknown connection '{rest[0] if rest else ''}'.", 10)
+        if state["device"]["active"]:
+            _deactivate(sim)
+        sim.read()
+        result = _activate(sim, profiles[0])
+        if result == 0:
+            print("Connection successfully activated")
+        return result
+
+    if verb == "down":
+        state = sim.read()
+        profiles = _find_profiles(state, rest[0]) if rest else []
+        if not profiles:
+            return _fail(f"Error: '{rest[0] if rest else ''}' is not an active connection.", 10)
+        if state["device"]["active"] == profiles[0]["uuid"]:
+            _deactivate(sim)
+        print(f"Connection '{profiles[0]['name']}' successfully deactivated")
+        return 0
+
+    if verb == "delete":
+        with sim.locked() as state:
+            profiles = _find_profiles(state, rest[0]) if rest else []
+            if not profiles:
+                return _fail(f"Error: unknown connection '{rest[0] if rest else ''}'.", 10)
+            removed = {p["uuid"] for p in profiles}
+            state["profiles"] = [p for p in state["profiles"] if p["uuid"] not in removed]
+            if state["device"]["active"] in removed:
+                state["device"].update(state=30, active=None, ip=None)
+        for profile in profiles:
+            sim.emit(f"{profile['name']}: connection profile removed")
+            print(f"Connection '{profile['name']}' ({profile['uuid']}) successfully deleted.")
+        return 0
+
+    if verb == "add":
+        options = dict(zip(rest[0::2], rest[1::2]))
+        profile = _new_profile(
+            options.get("ssid", ""),
+            name=options.get("con-name"),
+            psk=options.get("802-11-wireless-security.psk", options.get("wifi-sec.psk", "")),
+            mode=options.get("802-11-wireless.mode", options.get("wifi.mode", "infrastructure")),
+            address=options.get("ipv4.addresses", "").split("/")[0] or None,
+        )
+        with sim.locked() as state:
+            state["profiles"].append(profile)
+        sim.emit(f"{profile['name']}: connection profile created")
+        print(f"Connection '{profile['name']}' ({profile['uuid']}) successfully added.")
+        return 0
+
+    return _fail(f"nmsim: unsupported connection command: {verb}", 2)
+
+
+def _cmd_monitor(sim: _Sim) -> int:
+    events_path = os.path.join(sim.workdir, "events.log")
+    with open(events_path) as f:
+        f.seek(0, os.SEEK_END)
+        while True:
+            line = f.readline()
+            if line:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            else:
+                time.sleep(0.02)
+
+
+def nmcli_main(argv: List[str]) -> int:
+    """Entry point of the fake nmcli"""
+    sim = _Sim(os.environ["NMSIM_STATE"])
+    sim.log_invocation(["nmcli"] + argv)
+
+    terse = False
+    ask = False
+    fields: List[str] = []
+    args = list(argv)
+    while args and args[0].startswith("-"):
+        option = args.pop(0)
+        if option in ("-t", "--terse"):
+            terse = True
+        elif option in ("-f", "--fields") and args:
+            fields = args.pop(0).split(",")
+        elif option == "--ask":
+            ask = True
+
+    if not args:
+        return _fail("nmsim: no command", 2)
+    obj, rest = args[0], args[1:]
+
+    if obj == "monitor":
+        return _cmd_monitor(sim)
+
+    sim.state = sim.read()
+    sim.latency("command")
+
+    if obj in ("dev", "device"):
+        verb = rest[0] if rest else "status"
+        if verb == "show":
+            return _cmd_device_show(sim.read(), fields, terse)
+        if verb == "wifi":
+            sub = rest[1] if len(rest) > 1 else "list"
+            if sub == "list":
+                rescan = "--rescan" in rest and rest[rest.index("--rescan") + 1] == "yes"
+                return _cmd_wifi_list(sim, fields, rescan)
+            if sub == "connect" and len(rest) > 2:
+                password = None
+                if "password" in rest:
+                    password = rest[rest.index("password") + 1]
+                elif ask:
+                    password = sys.stdin.readline().rstrip("\n")
+                return _cmd_wifi_connect(sim, rest[2], password)
+    elif obj in ("c", "con", "connection"):
+        return _cmd_connection(sim, rest, fields, terse)
+
+    return _fail(f"nmsim: unsupported command: {' '.join(argv)}", 2)
+
+
+def ip_main(argv: List[str]) -> int:
+    """Entry point of the fake ip (only `ip route get`)"""
+    sim = _Sim(os.environ["NMSIM_STATE"])
+    sim.log_invocation(["ip"] + argv)
+    state = sim.read()
+
+    if argv[:2] == ["route", "get"]:
+        profile = _active_profile(state)
+        device = state["device"]
+        if device["state"] == 100 and profile and profile["mode"] != "ap":
+            print(f"{argv[2]} via 192.168.1.1 dev {device['iface']} src {device['ip']} uid 0")
+            return 0
+        return _fail("RTNETLINK answers: Network is unreachable", 2)
+
+    return _fail(f"nmsim: unsupported command: ip {' '.join(argv)}", 2)
@@ -0,0 +1,360 @@
+"""
+Button Input
+
+Event-driven tracking of one key on an evdev input device. The device is
+opened once and read through the event loop (async_read_loop), so key
+down/up events arrive with their kernel timestamps instead of being
+sampled by re-opening the device and calling active_keys() every 100 ms.
+A hold is measured from the press timestamp and decided the moment it
+reaches the requested duration or ends with a release.
+
+InputDeviceIndex finds a device by name from sysfs
+(/sys/class/input/event*/device/name) without opening any device node.
+A resolved device is cached with its sysfs identity (device path and
+major:minor) and re-validated from that on each lookup; a kernel uevent
+watcher drops entries when input devices are plugged or unplugged.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from network import netlink
+
+try:
+    from evdev import InputDevice
+
+    EVDEV_AVAILABLE = True
+except ImportError:
+    EVDEV_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# linux/input-event-codes.h
+EV_KEY = 0x01
+KEY_ENTER = 28
+KEY_UP = 0
+KEY_DOWN = 1  # 2 is autorepeat, which does not change the state
+
+
+SYSFS_INPUT = "/sys/class/input"
+DEV_INPUT = "/dev/input"
+
+
+class InputDeviceIdentity(NamedTuple):
+    """Where an input device lives, as sysfs describes it"""
+
+    node: str  # event node name, e.g. event3
+    syspath: str  # resolved sysfs path of the event node
+    dev: str  # major:minor
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class InputDeviceIndex:
+    """Resolves input device names to event nodes from sysfs"""
+
+    def __init__(self, sysfs_root: str = SYSFS_INPUT, dev_root: str = DEV_INPUT):
+        self.sysfs_root = sysfs_root
+        self.dev_root = dev_root
+        self._cache: Dict[str, InputDeviceIdentity] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self.stats = {"hits": 0, "scans": 0, "hotplug": 0}
+
+    @property
+    def watching(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _identity(self, node: str) -> Optional[InputDeviceIdentity]:
+        base = os.path.join(self.sysfs_root, node)
+        dev = _read(os.path.join(base, "dev"))
+        if dev is None:
+            return None
+        return InputDeviceIdentity(node, os.path.realpath(base), dev)
+
+    def _name(self, node: str) -> Optional[str]:
+        return _read(os.path.join(self.sysfs_root, node, "device", "name"))
+
+    def scan(self) -> Dict[str, InputDeviceIdentity]:
+        """Name -> identity for every event node (lowest node wins a name)"""
+        try:
+            nodes = [n for n in os.listdir(self.sysfs_root) if n.startswith("event")]
+        except OSError:
+            return {}
+        found: Dict[str, InputDeviceIdentity] = {}
+        for node in sorted(nodes, key=lambda n: int(n[5:]) if n[5:].isdigit() else 0):
+            name = self._name(node)
+            if name is None or name in found:
+                continue
+            identity = self._identity(node)
+            if identity is not None:
+                found[name] = identity
+        self.stats["scans"] += 1
+        return found
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Device node path for name, or None if no such device"""
+        identity = self._cache.get(name)
+        if identity is not None:
+            # Still the same device behind that node?
+            if self._identity(identity.node) == identity and self._name(identity.node) == name:
+                self.stats["hits"] += 1
+                return os.path.join(self.dev_root, identity.node)
+        self._cache = self.scan()
+        identity = self._cache.get(name)
+        return os.path.join(self.dev_root, identity.node) if identity else None
+
+    def invalidate(self):
+        self._cache = {}
+
+    async def wait_for(self, name: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait until a device called name is present
+
+        Re-checks on input hotplug events while watch() runs, otherwise
+        once a second.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            path = self.resolve(name)
+            if path is not None:
+                return path
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            wait = remaining if self.watching else min(remaining or 1.0, 1.0)
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def watch(self) -> bool:
+        """Follow input hotplug uevents to keep the cache current
+
+        Returns:
+            bool: False if uevents are unavailable
+        """
+        if self.watching:
+            return True
+        try:
+            netlink.NetlinkSocket(netlink.NETLINK_KOBJECT_UEVENT).close()
+        except netlink.NetlinkError as e:
+            logger.debug(f"Input hotplug watch unavailable: {e}")
+            return False
+        self._task = asyncio.create_task(self._follow(netlink.uevents("input")))
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _follow(self, stream):
+        try:
+            async for event in stream:
+                node = os.path.basename(event.get("DEVNAME", ""))
+                if event["ACTION"] == netlink.RESYNC:
+                    self.invalidate()
+                elif node.startswith("event") and event["ACTION"] in ("add", "remove"):
+                    self.stats["hotplug"] += 1
+                    logger.debug(f"Input device {event['ACTION']}: {node}")
+                    self._cache = {n: i for n, i in self._cache.items() if i.node != node}
+                else:
+                    continue
+                changed, self._changed = self._changed, asyncio.Event()
+                changed.set()
+        except netlink.NetlinkError as e:
+            logger.warning(f"Input hotplug watch ended: {e}")
+        finally:
+            await stream.aclose()
+
+
+class ButtonEvent(NamedTuple):
+    """A press or release of the tracked key"""
+
+    pressed: bool
+    timestamp: float  # event time, time.time() clock
+    held_for: Optional[float] = None  # seconds, on release
+
+
+ButtonListener = Callable[[ButtonEvent], None]
+
+
+class ButtonMonitor:
+    """Tracks one key's state from a persistently open input device"""
+
+    def __init__(self, path: str, key: int = KEY_ENTER):
+        """
+        Args:
+            path: Input device node, e.g. /dev/input/event0
+            key: Key code to track (default: KEY_ENTER)
+        """
+        self.path = path
+        self.key = key
+        self.pressed_at: Optional[float] = None
+        self.last_hold: Optional[float] = None  # seconds the last press lasted
+        self._device = None
+        self._task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self._listeners: List[ButtonListener] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def held(self) -> bool:
+        return self.pressed_at is not None
+
+    def hold_duration(self) -> float:
+        """Seconds the key has been held so far (0 when released)"""
+        if self.pressed_at is None:
+            return 0.0
+        return max(time.time() - self.pressed_at, 0.0)
+
+    def add_listener(self, listener: ButtonListener):
+        """Call listener(event) for every press and release"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ButtonListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def start(self) -> bool:
+        """Open the device and start following its key events
+
+        Returns:
+            bool: False if evdev is unavailable or the device cannot be opened
+        """
+        if self.running:
+            return True
+        if not EVDEV_AVAILABLE:
+            return False
+        try:
+            self._device = InputDevice(self.path)
+            # One query for a key already held when we open the device (the
+            # usual case at boot); events take over from here
+            if self.key in self._device.active_keys():
+                self.pressed_at = time.time()
+        except OSError as e:
+            logger.warning(f"Cannot open input device {self.path}: {e}")
+            self._close_device()
+            return False
+        self._task = asyncio.create_task(self._read())
+        return True
+
+    async def stop(self):
+        """Stop reading and close the device"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._close_device()
+
+    def _close_device(self):
+        if self._device is not None:
+            try:
+                self._device.close()
+            except OSError:
+                pass
+            self._device = None
+
+    async def _read(self):
+        try:
+            async for event in self._device.async_read_loop():
+                if event.type == EV_KEY and event.code == self.key and event.value in (KEY_UP, KEY_DOWN):
+                    self._on_key(event.value == KEY_DOWN, event.timestamp())
+        except OSError as e:
+            logger.warning(f"Input device {self.path} went away: {e}")
+        finally:
+            if self.held:
+                self._on_key(False, time.time())
+            self._close_device()
+            self._notify()
+
+    def _on_key(self, pressed: bool, timestamp: float):
+        if pressed == self.held:
+            return
+        if pressed:
+            self.pressed_at = timestamp
+            event = ButtonEvent(True, timestamp)
+        else:
+            self.last_hold = round(max(timestamp - self.pressed_at, 0.0), 3)
+            self.pressed_at = None
+            event = ButtonEvent(False, timestamp, self.last_hold)
+        self._notify()
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Button listener failed: {e}")
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _wait_for_change(self, timeout: Optional[float]) -> bool:
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_press(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the key is down
+
+        Returns:
+            bool: False on timeout or if the device went away
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running and not self.held:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            await self._wait_for_change(remaining)
+        return self.held
+
+    async def wait_for_release(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the key is up
+
+        Returns:
+            bool: False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running and self.held:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            await self._wait_for_change(remaining)
+        return not self.held
+
+    async def wait_for_hold(self, duration: float) -> bool:
+        """Decide whether the current press lasts at least duration seconds
+
+        Returns as soon as it is known: True the moment the hold reaches
+        duration, False at once if the key is not down, or on release.
+        """
+        while self.running and self.held:
+            remaining = duration - self.hold_duration()
+            if remaining <= 0:
+                return True
+            if not await self._wait_for_change(remaining):
+                return True  # no release before the threshold
+        return False
@@ -0,0 +1,132 @@
+"""
+Asyncio Network Information
+
+AsyncNetworkUtils offers the NetworkUtils API as coroutines for callers
+running inside an event loop. Collection runs in worker threads so the loop
+never blocks on a command-line tool; when the native backend is unavailable
+the independent tool lookups (interfaces, signal, SSID, MAC, IP) run
+concurrently. Every call takes a timeout, and a call that times out or is
+cancelled kills the tools it started. watch() keeps an interface table live
+from rtnetlink notifications so snapshots stop re-dumping the interfaces.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .interface_table import InterfaceTable
+from .network_utils import SNAPSHOT_MAX_AGE, NetworkSnapshot, NetworkUtils
+
+logger = logging.getLogger(__name__)
+
+# Default bound for one snapshot (seconds)
+DEFAULT_TIMEOUT = 10.0
+
+
+class AsyncNetworkUtils:
+    """Non-blocking network information for asyncio code"""
+
+    def __init__(self, native: bool = True, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            native: Read from sysfs/procfs/netlink first (as NetworkUtils)
+            timeout: Default per-call timeout in seconds
+        """
+        self.native = native
+        self.timeout = timeout
+        self.table = InterfaceTable()
+        self._last_snapshot: Optional[NetworkSnapshot] = None
+
+    async def watch(self) -> bool:
+        """Keep the interface table current from rtnetlink notifications
+
+        Returns:
+            bool: False if rtnetlink is unavailable (snapshots then dump
+            the interfaces each time)
+        """
+        return await self.table.start()
+
+    async def stop(self):
+        """Stop following interface changes"""
+        await self.table.stop()
+
+    async def snapshot(
+        self, max_age: float = 0.0, timeout: Optional[float] = None
+    ) -> NetworkSnapshot:
+        """Capture the current network state without blocking the loop
+
+        Args:
+            max_age: Return the previous snapshot if it is at most this old
+            timeout: Seconds before giving up (default: self.timeout)
+
+        Returns:
+            NetworkSnapshot
+
+        Raises:
+            asyncio.TimeoutError: if collection took longer than timeout
+        """
+        previous = self._last_snapshot
+        if previous is not None and max_age > 0 and previous.age <= max_age:
+            return previous
+
+        # A worker per call so cancelling one call only kills its own tools
+        worker = NetworkUtils(native=self.native, table=self.table)
+        try:
+            snapshot = await asyncio.wait_for(
+                self._collect(worker), self.timeout if timeout is None else timeout
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            worker.cancel_commands()
+            raise
+
+        self._last_snapshot = snapshot
+        return snapshot
+
+    async def _collect(self, worker: NetworkUtils) -> NetworkSnapshot:
+        if worker.native:
+            try:
+                return await asyncio.to_thread(worker._native_snapshot)
+            except OSError as e:
+                logger.debug(f"Native network snapshot unavailable, using command-line tools: {e}")
+
+        parts = list(NetworkUtils.TOOL_PARTS.items())
+        results = await asyncio.gather(
+            *(asyncio.to_thread(getattr(worker, method)) for _, method in parts)
+        )
+        return NetworkUtils._assemble_tool_snapshot(
+            **{part: result for (part, _), result in zip(parts, results)}
+        )
+
+    async def _view(self, field: str, error: str, timeout: Optional[float]):
+        try:
+            return getattr(await self.snapshot(SNAPSHOT_MAX_AGE, timeout), field)
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out getting {field.replace('_', ' ')}")
+            return error
+        except Exception as e:
+            logger.error(f"Error getting {field.replace('_', ' ')}: {e}")
+            return error
+
+    async def get_wifi_name(self, timeout: Optional[float] = None) -> str:
+        """Get the WiFi SSID name (or an error message)"""
+        return await self._view("ssid", "Unknown WiFi", timeout)
+
+    async def get_wifi_ip_address(self, timeout: Optional[float] = None) -> str:
+        """Get the IP address to display (or an error message)"""
+        return await self._view("ip_address", "Error getting IP address", timeout)
+
+    async def get_wifi_mac_address(self, timeout: Optional[float] = None) -> str:
+        """Get the WiFi MAC address (or an error message)"""
+        return await self._view("mac_address", "Error getting MAC address", timeout)
+
+    async def get_wifi_signal_strength(self, timeout: Optional[float] = None) -> str:
+        """Get the WiFi signal strength (or an error message)"""
+        return await self._view("signal_strength", "Error getting signal strength", timeout)
+
+    async def get_network_details(self, timeout: Optional[float] = None) -> dict:
+        """Get detailed information about the network"""
+        try:
+            return (await self.snapshot(SNAPSHOT_MAX_AGE, timeout)).details()
+        except Exception as e:
+            logger.error(f"Error getting network details: {e}")
+            return {"error": "Failed to get network details"}
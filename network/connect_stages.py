@@ -0,0 +1,306 @@
+"""
+Connection Stage Timing
+
+Splits one WiFi connection attempt into the stages that matter when a
+connect is slow, timed from what NetworkManager and the kernel report
+rather than from when our own calls return:
+
+    prepare        attempt start until NM starts configuring the device
+    association    NM's config state: 802.11 association and the WPA
+                   handshake (time spent waiting for secrets excluded)
+    auth           NM's need-auth state: waiting for secrets (0 when the
+                   saved secrets were enough)
+    ip_config      NM's ip-config state until the kernel has an IPv4
+                   address on the interface (DHCP)
+    default_route  address until the interface's default route appears
+
+Device states come from the NMEventMonitor, addresses and routes from
+rtnetlink events. Every attempt is kept, failures included, in a bounded
+history in the state store so slow DHCP servers can be diagnosed from data
+across restarts.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from . import linux_net, netlink
+from .nm_dbus import (
+    NM_DEVICE_STATE_ACTIVATED,
+    NM_DEVICE_STATE_CONFIG,
+    NM_DEVICE_STATE_FAILED,
+    NM_DEVICE_STATE_IP_CONFIG,
+    NM_DEVICE_STATE_NEED_AUTH,
+)
+from .nm_events import DEVICE_STATE, NMEvent, NMEventMonitor, NMEventSubscription
+from .state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("prepare", "association", "auth", "ip_config", "default_route")
+
+# State document holding recent attempts
+CONNECT_ATTEMPTS_STATE = "connect-attempts"
+MAX_ATTEMPTS = 50
+
+# How long to wait for the default route once the attempt has an address
+ROUTE_GRACE = 1.0
+
+# Device states whose first entry is recorded as a milestone
+_STATE_MILESTONES = {
+    NM_DEVICE_STATE_CONFIG: "config",
+    NM_DEVICE_STATE_NEED_AUTH: "need_auth",
+    NM_DEVICE_STATE_IP_CONFIG: "ip_config",
+    NM_DEVICE_STATE_ACTIVATED: "activated",
+    NM_DEVICE_STATE_FAILED: "failed",
+}
+
+
+@dataclass
+class ConnectAttempt:
+    """Stage timings of one connection attempt"""
+
+    ssid: str
+    attempt: int
+    started_at: float  # time.time()
+    ok: bool = False
+    path: Optional[str] = None  # saved-profile or new-profile
+    interface: Optional[str] = None
+    total_seconds: float = 0.0
+    # Seconds per STAGES entry; None when the stage was not observed
+    stages: Dict[str, Optional[float]] = field(default_factory=dict)
+    # Seconds from the attempt start to each milestone
+    milestones: Dict[str, float] = field(default_factory=dict)
+    address: Optional[str] = None
+    gateway: Optional[str] = None
+    failure_reason: Optional[int] = None  # NM device state reason
+    sources: List[str] = field(default_factory=list)  # nm-dbus/nm-nmcli/netlink
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _stage_seconds(milestones: Dict[str, float]) -> Dict[str, Optional[float]]:
+    def between(start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None or end < start:
+            return None
+        return round(end - start, 3)
+
+    get = milestones.get
+    auth = between(get("need_auth"), get("auth_done"))
+    association = between(get("config"), get("ip_config"))
+    if association is not None and auth is not None:
+        association = round(association - auth, 3)
+    if auth is None and association is not None:
+        auth = 0.0  # went straight from config to ip-config
+    # Without rtnetlink, NM's activation is the closest thing to "has an address"
+    address = get("address", get("activated"))
+    return {
+        "prepare": between(0.0, get("config")),
+        "association": association,
+        "auth": auth,
+        "ip_config": between(get("ip_config"), address),
+        "default_route": between(get("address"), get("default_route")),
+    }
+
+
+class ConnectStageTracker:
+    """Collects NM device states and rtnetlink events during one attempt"""
+
+    def __init__(
+        self,
+        ssid: str,
+        attempt: int = 1,
+        events: Optional[NMEventMonitor] = None,
+        interface: Optional[str] = None,
+    ):
+        """
+        Args:
+            ssid: Network being connected to
+            attempt: Attempt number within the connect call
+            events: Running NM event monitor (device state milestones)
+            interface: WiFi interface (default: the first one found)
+        """
+        self.record = ConnectAttempt(ssid=ssid, attempt=attempt, started_at=time.time())
+        self._events = events
+        self.interface = interface
+        self._started = 0.0
+        self._tasks: List[asyncio.Task] = []
+        self._nm_states = False
+        self._subscription: Optional[NMEventSubscription] = None
+        self._addresses: List[netlink.NetlinkEvent] = []
+        self._routes: List[netlink.NetlinkEvent] = []
+        self._route_added = asyncio.Event()
+
+    def _mark(self, name: str, timestamp: float):
+        milestones = self.record.milestones
+        if name not in milestones:
+            milestones[name] = round(max(timestamp - self._started, 0.0), 3)
+
+    async def start(self):
+        """Subscribe to both event sources; call before starting the attempt"""
+        self._started = time.monotonic()
+        if self.interface is None:
+            try:
+                self.interface = linux_net.find_wifi_interface()
+            except OSError:
+                pass
+        self.record.interface = self.interface
+
+        if self._events is not None and self._events.running:
+            self.record.sources.append(f"nm-{self._events.source}")
+            self._nm_states = True
+            self._subscription = self._events.subscribe()
+            self._tasks.append(asyncio.create_task(self._follow_nm(self._subscription)))
+
+        try:
+            netlink.NetlinkSocket().close()
+        except netlink.NetlinkError as e:
+            logger.debug(f"Connect stage timing without netlink: {e}")
+        else:
+            self.record.sources.append("netlink")
+            self._tasks.append(asyncio.create_task(self._follow_netlink(netlink.events())))
+        # Let the netlink generator open its socket before the attempt starts
+        await asyncio.sleep(0)
+
+    def _ours(self, interface: Optional[str]) -> bool:
+        return self.interface is None or interface is None or interface == self.interface
+
+    def _on_nm_event(self, event: NMEvent):
+        if event.kind != DEVICE_STATE or not self._ours(event.interface):
+            return
+        milestones = self.record.milestones
+        if "need_auth" in milestones and event.new_state != NM_DEVICE_STATE_NEED_AUTH:
+            self._mark("auth_done", event.timestamp)
+        name = _STATE_MILESTONES.get(event.new_state)
+        if name is not None:
+            self._mark(name, event.timestamp)
+        if event.new_state == NM_DEVICE_STATE_FAILED and self.record.failure_reason is None:
+            self.record.failure_reason = event.reason
+
+    async def _follow_nm(self, subscription):
+        try:
+            async for event in subscription:
+                self._on_nm_event(event)
+        finally:
+            # Events published but not yet consumed still belong to the attempt
+            for event in subscription.drain():
+                self._on_nm_event(event)
+            subscription.close()
+
+    async def _follow_netlink(self, stream):
+        try:
+            async for event in stream:
+                if not self._ours(event.interface):
+                    continue
+                if event.kind == netlink.ADDRESS_ADDED and ":" not in (event.address or ":"):
+                    self._addresses.append(event)
+                elif event.kind == netlink.DEFAULT_ROUTE_ADDED:
+                    self._routes.append(event)
+                    self._route_added.set()
+        except netlink.NetlinkError as e:
+            logger.debug(f"Netlink stream for connect timing ended: {e}")
+        finally:
+            await stream.aclose()
+
+    def _first_after(self, events, since: Optional[float]):
+        # D-Bus and rtnetlink deliver independently, so order by timestamp
+        # rather than by arrival
+        return next(
+            (e for e in events if since is None or e.timestamp - self._started >= since), None
+        )
+
+    def _resolve(self):
+        """Catch up on queued NM states, then pick the attempt's address and route"""
+        if self._subscription is not None:
+            for event in self._subscription.drain():
+                self._on_nm_event(event)
+        milestones = self.record.milestones
+        # Addresses from before NM's ip-config state belong to the hotspot
+        # or a previous connection
+        since = milestones.get("ip_config") if self._nm_states else 0.0
+        if since is None:
+            return
+        address = self._first_after(self._addresses, since)
+        if address is None:
+            return
+        self.record.address = address.address
+        self._mark("address", address.timestamp)
+        route = self._first_after(self._routes, milestones["address"])
+        if route is not None:
+            self.record.gateway = route.gateway
+            self._mark("default_route", route.timestamp)
+
+    async def finish(self, ok: bool, path: Optional[str] = None) -> ConnectAttempt:
+        """Stop collecting and compute the stage durations"""
+        if ok and "netlink" in self.record.sources:
+            # The route usually lands right after the address
+            deadline = time.monotonic() + ROUTE_GRACE
+            self._resolve()
+            milestones = self.record.milestones
+            while "address" in milestones and "default_route" not in milestones:
+                self._route_added.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._route_added.wait(), max(deadline - time.monotonic(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    break
+                self._resolve()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+        record = self.record
+        self._resolve()
+        record.ok = ok
+        record.path = path
+        record.total_seconds = round(time.monotonic() - self._started, 3)
+        record.stages = _stage_seconds(record.milestones)
+        return record
+
+
+class ConnectHistory:
+    """Recent connection attempts, persisted in the state store"""
+
+    def __init__(self, store: StateStore, limit: int = MAX_ATTEMPTS):
+        self._store = store
+        saved = store.load(CONNECT_ATTEMPTS_STATE, []) or []
+        self._attempts = deque(saved[-limit:], maxlen=limit)
+
+    def add(self, attempt: ConnectAttempt):
+        self._attempts.append(attempt.as_dict())
+        self._store.save(CONNECT_ATTEMPTS_STATE, list(self._attempts))
+
+    def __len__(self) -> int:
+        return len(self._attempts)
+
+    def recent(self, limit: int = 10, ssid: Optional[str] = None) -> List[Dict]:
+        """Most recent attempts first"""
+        attempts = [a for a in reversed(self._attempts) if ssid is None or a["ssid"] == ssid]
+        return attempts[:limit]
+
+    def stage_summary(self, ssid: Optional[str] = None) -> Dict[str, Dict]:
+        """Median and max seconds per stage over the recorded attempts"""
+        summary = {}
+        for stage in STAGES:
+            values = [
+                a["stages"][stage]
+                for a in self._attempts
+                if (ssid is None or a["ssid"] == ssid) and a["stages"].get(stage) is not None
+            ]
+            summary[stage] = {
+                "median": round(statistics.median(values), 3) if values else None,
+                "max": max(values) if values else None,
+                "samples": len(values),
+            }
+        return summary
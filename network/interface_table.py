@@ -0,0 +1,282 @@
+"""
+Interface Table
+
+Typed records for every network interface (name, kind, MAC, IPv4/IPv6
+addresses, operstate, driver, wireless flag), built from one rtnetlink
+link dump plus one address dump instead of parsing `ip addr show`.
+
+A table can be refreshed on demand, or started as a live table that
+subscribes to rtnetlink link/address notifications and applies each one
+incrementally. Records are immutable and each change swaps in a new
+mapping, so readers in worker threads (NetworkUtils under
+AsyncNetworkUtils) always see a consistent table without locking.
+`generation` changes with every update, which lets callers such as the
+IP ranker reuse results while the table is unchanged.
+"""
+
+import asyncio
+import logging
+import socket
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import linux_net, netlink
+
+logger = logging.getLogger(__name__)
+
+ARPHRD_LOOPBACK = 772
+NULL_MAC = "00:00:00:00:00:00"
+
+# Notifications a live table follows
+TABLE_GROUPS = netlink.RTMGRP_LINK | netlink.RTMGRP_IPV4_IFADDR | netlink.RTMGRP_IPV6_IFADDR
+
+
+class InterfaceRecord(NamedTuple):
+    """One interface as the kernel reports it"""
+
+    index: int
+    name: str
+    kind: str  # wifi, ethernet, loopback, or the virtual kind (veth, bridge, tun, ...)
+    mac: Optional[str]
+    operstate: str
+    wireless: bool
+    driver: Optional[str]
+    ipv4: Tuple[str, ...] = ()
+    ipv6: Tuple[str, ...] = ()
+
+    @property
+    def up(self) -> bool:
+        return self.operstate == "up"
+
+    def as_dict(self) -> Dict:
+        result = self._asdict()
+        result["ipv4"] = list(self.ipv4)
+        result["ipv6"] = list(self.ipv6)
+        return result
+
+
+def _link_kind(link: Dict, wireless: bool) -> str:
+    if link["kind"]:
+        return link["kind"]
+    if wireless:
+        return "wifi"
+    if link["link_type"] == ARPHRD_LOOPBACK:
+        return "loopback"
+    if link["link_type"] == linux_net.ARPHRD_ETHER:
+        return "ethernet"
+    return "other"
+
+
+def _sysfs_facts(name: str) -> Tuple[bool, Optional[str]]:
+    """(wireless, driver) - the two facts rtnetlink does not carry"""
+    try:
+        wireless = linux_net.is_wireless(name)
+    except OSError:
+        wireless = False
+    return wireless, linux_net.interface_driver(name)
+
+
+class InterfaceTable:
+    """All interfaces keyed by ifindex, refreshed by dump or kept live by events"""
+
+    def __init__(self):
+        self._records: Dict[int, InterfaceRecord] = {}
+        # (name -> (wireless, driver)); sysfs is only read for new names
+        self._sysfs: Dict[str, Tuple[bool, Optional[str]]] = {}
+        self.generation = 0
+        self.loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"dumps": 0, "updates": 0, "resyncs": 0}
+
+    # Reading
+
+    def records(self) -> Tuple[InterfaceRecord, ...]:
+        """All interfaces in ifindex order"""
+        records = self._records
+        return tuple(records[index] for index in sorted(records))
+
+    def __iter__(self) -> Iterator[InterfaceRecord]:
+        return iter(self.records())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, name: str) -> Optional[InterfaceRecord]:
+        return next((r for r in self._records.values() if r.name == name), None)
+
+    def addresses(self, family: int = socket.AF_INET) -> List[Tuple[str, str]]:
+        """(interface, address) pairs in ifindex order"""
+        field = "ipv4" if family == socket.AF_INET else "ipv6"
+        return [(r.name, address) for r in self.records() for address in getattr(r, field)]
+
+    def wifi_interface(self) -> Optional[str]:
+        """First wireless interface, like linux_net.find_wifi_interface()"""
+        records = self.records()
+        for record in records:
+            if record.wireless:
+                return record.name
+        return next((r.name for r in records if r.name.startswith("wl")), None)
+
+    @property
+    def live(self) -> bool:
+        """Whether notifications are being applied as they arrive"""
+        return self._task is not None and not self._task.done()
+
+    # Building
+
+    def refresh(self):
+        """Rebuild from a link dump and an address dump
+
+        Raises:
+            NetlinkError: if rtnetlink is unavailable
+        """
+        with netlink.NetlinkSocket() as sock:
+            links = netlink.dump_links(sock)
+            addresses = netlink.dump_addresses(socket.AF_UNSPEC, sock)
+
+        records = {}
+        for link in links:
+            records[link["index"]] = self._record(link)
+        by_index: Dict[int, Dict[int, List[str]]] = {}
+        for entry in addresses:
+            if entry["address"] and entry["index"] in records:
+                family = by_index.setdefault(entry["index"], {})
+                family.setdefault(entry["family"], []).append(entry["address"])
+        for index, families in by_index.items():
+            records[index] = records[index]._replace(
+                ipv4=tuple(families.get(socket.AF_INET, ())),
+                ipv6=tuple(families.get(socket.AF_INET6, ())),
+            )
+
+        names = {record.name for record in records.values()}
+        self._sysfs = {name: facts for name, facts in self._sysfs.items() if name in names}
+        self._records = records
+        self.loaded = True
+        self.generation += 1
+        self.stats["dumps"] += 1
+
+    def _record(self, link: Dict, previous: Optional[InterfaceRecord] = None) -> InterfaceRecord:
+        name = link["name"]
+        facts = self._sysfs.get(name)
+        if facts is None:
+            facts = self._sysfs[name] = _sysfs_facts(name)
+        wireless, driver = facts
+        return InterfaceRecord(
+            index=link["index"],
+            name=name,
+            kind=_link_kind(link, wireless),
+            mac=link["mac"] if link["link_type"] == linux_net.ARPHRD_ETHER and link["mac"] != NULL_MAC else None,
+            operstate=link["operstate"],
+            wireless=wireless,
+            driver=driver,
+            ipv4=previous.ipv4 if previous else (),
+            ipv6=previous.ipv6 if previous else (),
+        )
+
+    def apply(self, msg_type: int, body: bytes) -> bool:
+        """Apply one rtnetlink notification
+
+        Returns:
+            bool: True if the table changed
+        """
+        records = self._records
+        if msg_type == netlink.RTM_NEWLINK:
+            link = netlink.parse_link(body)
+            previous = records.get(link["index"])
+            if previous is not None and previous.name != link["name"]:
+                self._sysfs.pop(previous.name, None)  # renamed
+            record = self._record(link, previous)
+            if record == previous:
+                return False
+            updated = dict(records)
+            updated[record.index] = record
+        elif msg_type == netlink.RTM_DELLINK:
+            link = netlink.parse_link(body)
+            if link["index"] not in records:
+                return False
+            updated = dict(records)
+            self._sysfs.pop(updated.pop(link["index"]).name, None)
+        elif msg_type in (netlink.RTM_NEWADDR, netlink.RTM_DELADDR):
+            entry = netlink.parse_address(body)
+            record = records.get(entry["index"])
+            if record is None or not entry["address"]:
+                return False
+            field = "ipv4" if entry["family"] == socket.AF_INET else "ipv6"
+            current = getattr(record, field)
+            if msg_type == netlink.RTM_NEWADDR:
+                if entry["address"] in current:
+                    return False
+                changed = current + (entry["address"],)
+            else:
+                if entry["address"] not in current:
+                    return False
+                changed = tuple(a for a in current if a != entry["address"])
+            updated = dict(records)
+            updated[record.index] = record._replace(**{field: changed})
+        else:
+            return False
+
+        self._records = updated
+        self.generation += 1
+        self.stats["updates"] += 1
+        return True
+
+    # Live updates
+
+    async def start(self) -> bool:
+        """Load the table and keep it current from rtnetlink notifications
+
+        Returns:
+            bool: False if rtnetlink is unavailable
+        """
+        if self.live:
+            return True
+        stream = netlink.messages(TABLE_GROUPS)
+        pending = asyncio.ensure_future(stream.__anext__())
+        # Subscribe before dumping so no change between the two is lost
+        await asyncio.sleep(0)
+        try:
+            if pending.done() and pending.exception() is not None:
+                raise pending.exception()
+            self.refresh()
+        except netlink.NetlinkError as e:
+            logger.debug(f"Interface table cannot go live: {e}")
+            await _close(stream, pending)
+            return False
+        self._task = asyncio.create_task(self._follow(stream, pending))
+        return True
+
+    async def stop(self):
+        """Stop applying notifications (the last state is kept)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _follow(self, stream, pending: asyncio.Future):
+        try:
+            while True:
+                msg_type, body = await pending
+                if msg_type == netlink.RESYNC:
+                    self.stats["resyncs"] += 1
+                    self.refresh()
+                else:
+                    self.apply(msg_type, body)
+                pending = asyncio.ensure_future(stream.__anext__())
+        except netlink.NetlinkError as e:
+            logger.warning(f"Interface table no longer live: {e}")
+        finally:
+            await _close(stream, pending)
+
+
+async def _close(stream, pending: asyncio.Future):
+    # The generator cannot be closed while a __anext__ is still running in it
+    if not pending.done():
+        pending.cancel()
+    try:
+        await pending
+    except (asyncio.CancelledError, netlink.NetlinkError, StopAsyncIteration):
+        pass
+    await stream.aclose()
@@ -0,0 +1,186 @@
+"""
+IP Ranking Engine
+
+Chooses which IPv4 address to show the user (e-ink screen, status pages)
+when a device has several: WiFi before Ethernet, private ranges before
+public ones, physical interfaces before docker/veth/tun bridges. The policy
+is compiled once into a prefix regex and network lists; ranking returns
+every candidate with its score and the reasons behind it, and the result is
+memoized per address table so repeated callers pay nothing while the table
+is unchanged.
+"""
+
+import ipaddress
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class InterfaceAddress(NamedTuple):
+    """One address assigned to an interface"""
+
+    interface: str
+    address: str
+
+
+class RankedAddress(NamedTuple):
+    """A candidate address with its score and why it got it"""
+
+    address: str
+    interface: str
+    score: int
+    reasons: Tuple[str, ...]
+
+    def as_dict(self) -> Dict:
+        return {
+            "address": self.address,
+            "interface": self.interface,
+            "score": self.score,
+            "reasons": list(self.reasons),
+        }
+
+
+@dataclass(frozen=True)
+class RankingPolicy:
+    """Scoring rules; the defaults reproduce the original best-IP heuristic"""
+
+    # (label, interface name prefixes, score); the first match applies
+    interface_classes: Tuple[Tuple[str, Tuple[str, ...], int], ...] = (
+        ("wifi", ("wlan", "wl"), 1000),
+        ("ethernet", ("eth", "en"), 800),
+    )
+    private_networks: Tuple[str, ...] = ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16")
+    private_score: int = 100
+    # Interfaces whose name contains one of these are virtual/bridges
+    virtual_markers: Tuple[str, ...] = (
+        "docker", "br-", "veth", "lxc", "virbr", "vmnet", "tun", "tap",
+    )
+    physical_score: int = 50
+    # Docker commonly takes 172.x; prefer home/office ranges
+    preferred_networks: Tuple[str, ...] = ("192.168.0.0/16", "10.0.0.0/8")
+    preferred_score: int = 20
+    excluded_addresses: Tuple[str, ...] = ("127.0.0.1",)
+
+
+@dataclass
+class _CompiledPolicy:
+    classes: List[Tuple[str, "re.Pattern", int]]
+    virtual: "re.Pattern"
+    private: List[ipaddress.IPv4Network]
+    preferred: List[ipaddress.IPv4Network]
+    excluded: frozenset
+    policy: RankingPolicy = field(repr=False)
+
+
+def _compile(policy: RankingPolicy) -> _CompiledPolicy:
+    return _CompiledPolicy(
+        classes=[
+            (label, re.compile("|".join(re.escape(p) for p in prefixes)), score)
+            for label, prefixes, score in policy.interface_classes
+        ],
+        virtual=re.compile("|".join(re.escape(m) for m in policy.virtual_markers) or "(?!)"),
+        private=[ipaddress.ip_network(n) for n in policy.private_networks],
+        preferred=[ipaddress.ip_network(n) for n in policy.preferred_networks],
+        excluded=frozenset(policy.excluded_addresses),
+        policy=policy,
+    )
+
+
+class IPRanker:
+    """Ranks interface addresses under a compiled policy"""
+
+    def __init__(self, policy: Optional[RankingPolicy] = None):
+        self.policy = policy or RankingPolicy()
+        self._compiled = _compile(self.policy)
+        self._memo_key: Optional[Hashable] = None
+        self._memo: Tuple[RankedAddress, ...] = ()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def score(self, interface: str, address: str) -> RankedAddress:
+        """Score one candidate"""
+        compiled = self._compiled
+        policy = self.policy
+        score = 0
+        reasons = []
+
+        name = interface.lower()
+        for label, pattern, points in compiled.classes:
+            if pattern.match(interface):
+                score += points
+                reasons.append(f"{label} interface +{points}")
+                break
+
+        try:
+            ip = ipaddress.IPv4Address(address)
+        except ValueError:
+            ip = None
+        if ip is not None:
+            private = next((n for n in compiled.private if ip in n), None)
+            if private is not None:
+                score += policy.private_score
+                reasons.append(f"private range {private} +{policy.private_score}")
+
+        virtual = compiled.virtual.search(name)
+        if virtual:
+            reasons.append(f"virtual interface ({virtual.group(0)})")
+        else:
+            score += policy.physical_score
+            reasons.append(f"physical interface +{policy.physical_score}")
+
+        if ip is not None:
+            preferred = next((n for n in compiled.preferred if ip in n), None)
+            if preferred is not None:
+                score += policy.preferred_score
+                reasons.append(f"preferred range {preferred} +{policy.preferred_score}")
+
+        return RankedAddress(address, interface, score, tuple(reasons))
+
+    def rank(
+        self,
+        records: Iterable[Tuple[str, str]],
+        generation: Optional[Hashable] = None,
+    ) -> Tuple[RankedAddress, ...]:
+        """Rank candidates, best first (ties keep their input order)
+
+        Args:
+            records: (interface, address) pairs, e.g. InterfaceAddress
+            generation: Identifier of the address table; when it matches
+                the previous call the memoized ranking is returned without
+                looking at records. By default the records themselves are
+                the key.
+
+        Returns:
+            Every non-excluded candidate as a RankedAddress
+        """
+        if generation is None:
+            records = tuple(records)
+            key = ("records", records)
+        else:
+            key = ("generation", generation)
+        if key == self._memo_key:
+            self.stats["hits"] += 1
+            return self._memo
+
+        self.stats["misses"] += 1
+        ranked = [
+            self.score(interface, address)
+            for interface, address in records
+            if address not in self._compiled.excluded
+        ]
+        ranked.sort(key=lambda candidate: candidate.score, reverse=True)
+        self._memo_key = key
+        self._memo = tuple(ranked)
+        return self._memo
+
+    def best(
+        self,
+        records: Iterable[Tuple[str, str]],
+        generation: Optional[Hashable] = None,
+    ) -> Optional[RankedAddress]:
+        """Top-ranked candidate, or None"""
+        ranked = self.rank(records, generation)
+        return ranked[0] if ranked else None
+
+
+# Shared ranker with the default policy
+default_ranker = IPRanker()
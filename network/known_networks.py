@@ -0,0 +1,215 @@
+"""
+Known Network Ranking
+
+Ranks the saved networks that are currently in range, so the service can
+choose between them instead of leaving it to NetworkManager's autoconnect
+order. A network's score combines its current scan signal with what past
+connections to it showed: success rate, time to an IP address, internet
+latency and link bitrate.
+
+History lives in a small state-store document keyed by SSID. It decays
+with a half-life: success and failure counts shrink, and old measurements
+count for less and less until they weigh no more than a network we know
+nothing about. A network that was bad last month is then no longer
+penalised for it.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .state_store import StateStore
+
+# State document holding per-SSID connection history
+HISTORY_STATE = "network-history"
+MAX_HISTORY = 64
+
+# EWMA weight of a new measurement
+ALPHA = 0.3
+
+METRICS = ("time_to_ip", "latency_ms", "bitrate")
+
+
+@dataclass(frozen=True)
+class ScoringPolicy:
+    """Weights and reference points; each metric earns up to its weight"""
+
+    signal_weight: float = 1.0  # x scan signal (0-100)
+    min_signal: int = 15  # networks weaker than this are not candidates
+    success_weight: float = 60.0  # x smoothed success rate
+    time_to_ip_weight: float = 20.0
+    slow_time_to_ip: float = 20.0  # seconds that earn no points
+    latency_weight: float = 20.0
+    slow_latency_ms: float = 300.0
+    throughput_weight: float = 20.0
+    fast_bitrate: float = 150.0  # Mbit/s that earn full points
+    half_life: float = 7 * 24 * 3600.0
+    # Points a better network must be ahead by before leaving a working one
+    switch_margin: float = 15.0
+
+
+class RankedNetwork(NamedTuple):
+    """A candidate network with its score and the points behind it"""
+
+    ssid: str
+    score: float
+    signal: int
+    points: Tuple[Tuple[str, float], ...]
+
+    def as_dict(self) -> Dict:
+        return {
+            "ssid": self.ssid,
+            "score": self.score,
+            "signal": self.signal,
+            "points": dict(self.points),
+        }
+
+
+def _clamp(value: float) -> float:
+    return min(1.0, max(0.0, value))
+
+
+class NetworkHistory:
+    """Decaying per-SSID connection history"""
+
+    def __init__(self, store: StateStore, half_life: float = ScoringPolicy.half_life):
+        self._store = store
+        self.half_life = half_life
+        self._entries: Dict[str, dict] = store.load(HISTORY_STATE, {}) or {}
+
+    def _decay(self, since: Optional[float], now: float) -> float:
+        if since is None:
+            return 0.0
+        return 0.5 ** (max(now - since, 0.0) / self.half_life)
+
+    def _entry(self, ssid: str, now: float) -> dict:
+        entry = self._entries.setdefault(ssid, {"successes": 0.0, "failures": 0.0})
+        factor = self._decay(entry.get("counted_at"), now)
+        entry["successes"] = entry["successes"] * factor
+        entry["failures"] = entry["failures"] * factor
+        entry["counted_at"] = now
+        return entry
+
+    def record_attempt(self, ssid: str, ok: bool, time_to_ip: Optional[float] = None):
+        """Count a connection attempt (and how long the address took)"""
+        now = time.time()
+        entry = self._entry(ssid, now)
+        entry["successes" if ok else "failures"] += 1
+        if ok and time_to_ip is not None:
+            self._measure(entry, "time_to_ip", time_to_ip, now)
+        self._save()
+
+    def record_metrics(
+        self, ssid: str, latency_ms: Optional[float] = None, bitrate: Optional[float] = None
+    ):
+        """Fold in internet latency and link bitrate measured on the network"""
+        now = time.time()
+        entry = self._entry(ssid, now)
+        if latency_ms is not None:
+            self._measure(entry, "latency_ms", latency_ms, now)
+        if bitrate is not None:
+            self._measure(entry, "bitrate", bitrate, now)
+        self._save()
+
+    @staticmethod
+    def _measure(entry: dict, metric: str, value: float, now: float):
+        previous = entry.get(metric)
+        entry[metric] = value if previous is None else previous + ALPHA * (value - previous)
+        entry[f"{metric}_at"] = now
+
+    def _save(self):
+        if len(self._entries) > MAX_HISTORY:
+            keep = sorted(self._entries, key=lambda s: self._entries[s].get("counted_at", 0))
+            for ssid in keep[: len(self._entries) - MAX_HISTORY]:
+                del self._entries[ssid]
+        self._store.save(HISTORY_STATE, self._entries)
+
+    def stats(self, ssid: str, now: Optional[float] = None) -> dict:
+        """Decayed view of an SSID's history
+
+        Returns:
+            successes/failures (decayed counts) and, per metric, its value
+            and the weight (0-1) its age leaves it
+        """
+        now = time.time() if now is None else now
+        entry = self._entries.get(ssid, {})
+        factor = self._decay(entry.get("counted_at"), now)
+        result = {
+            "successes": round(entry.get("successes", 0.0) * factor, 3),
+            "failures": round(entry.get("failures", 0.0) * factor, 3),
+        }
+        for metric in METRICS:
+            result[metric] = entry.get(metric)
+            result[f"{metric}_weight"] = round(self._decay(entry.get(f"{metric}_at"), now), 3)
+        return result
+
+    def forget(self, ssid: str):
+        if self._entries.pop(ssid, None) is not None:
+            self._save()
+
+
+class KnownNetworkScorer:
+    """Scores saved networks from scan signal and decayed history"""
+
+    def __init__(self, history: NetworkHistory, policy: Optional[ScoringPolicy] = None):
+        self.history = history
+        self.policy = policy or ScoringPolicy()
+
+    def score(self, ssid: str, signal: int, now: Optional[float] = None) -> RankedNetwork:
+        policy = self.policy
+        stats = self.history.stats(ssid, now)
+
+        def aged(metric: str, quality: Optional[float], weight: float) -> float:
+            # Unknown or fully decayed measurements earn the neutral half
+            neutral = weight / 2
+            if quality is None:
+                return neutral
+            return neutral + (quality * weight - neutral) * stats[f"{metric}_weight"]
+
+        successes, failures = stats["successes"], stats["failures"]
+        time_to_ip, latency, bitrate = stats["time_to_ip"], stats["latency_ms"], stats["bitrate"]
+        points = (
+            ("signal", signal * policy.signal_weight),
+            # Laplace smoothing: no history means a 50% success rate
+            ("success_rate", (successes + 1) / (successes + failures + 2) * policy.success_weight),
+            (
+                "time_to_ip",
+                aged(
+                    "time_to_ip",
+                    None if time_to_ip is None else _clamp(1 - time_to_ip / policy.slow_time_to_ip),
+                    policy.time_to_ip_weight,
+                ),
+            ),
+            (
+                "latency",
+                aged(
+                    "latency_ms",
+                    None if latency is None else _clamp(1 - latency / policy.slow_latency_ms),
+                    policy.latency_weight,
+                ),
+            ),
+            (
+                "throughput",
+                aged(
+                    "bitrate",
+                    None if bitrate is None else _clamp(bitrate / policy.fast_bitrate),
+                    policy.throughput_weight,
+                ),
+            ),
+        )
+        points = tuple((name, round(value, 2)) for name, value in points)
+        return RankedNetwork(ssid, round(sum(value for _, value in points), 2), signal, points)
+
+    def rank(self, candidates: Iterable[Tuple[str, int]]) -> List[RankedNetwork]:
+        """Rank (ssid, scan signal) candidates, best first
+
+        Candidates below the policy's minimum signal are left out.
+        """
+        now = time.time()
+        ranked = [
+            self.score(ssid, signal, now)
+            for ssid, signal in candidates
+            if signal >= self.policy.min_signal
+        ]
+        ranked.sort(key=lambda network: network.score, reverse=True)
+        return ranked
@@ -0,0 +1,273 @@
+"""
+WiFi Link Quality Sampler
+
+Samples the client link's signal, noise, bitrates and transmit retry/failure
+counters at a fixed rate into a fixed-size numpy ring buffer, without
+spawning any process: station statistics come from nl80211, link quality
+and noise from /proc/net/wireless. Readers (e-ink signal bars, status
+pages, roaming decisions) get cached values: the latest sample, an EWMA,
+or min/max/mean over a recent window.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from . import linux_net, netlink
+
+logger = logging.getLogger(__name__)
+
+# Columns of the ring buffer. tx_retries and tx_failed hold the change since
+# the previous sample rather than the kernel's cumulative counters.
+FIELDS = (
+    "signal_dbm",
+    "noise_dbm",
+    "link_quality",
+    "tx_bitrate",
+    "rx_bitrate",
+    "tx_retries",
+    "tx_failed",
+)
+_COLUMN = {name: i for i, name in enumerate(FIELDS)}
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_CAPACITY = 300  # 10 minutes at the default interval
+DEFAULT_ALPHA = 0.3
+
+
+def signal_percent(dbm: Optional[float]) -> Optional[int]:
+    """Map dBm to 0-100 the way NetworkUtils does (-100 dBm = 0, -50 dBm = 100)"""
+    if dbm is None or math.isnan(dbm):
+        return None
+    return int(min(100, max(0, 2 * (dbm + 100))))
+
+
+def _as_dict(row: np.ndarray) -> Dict[str, Optional[float]]:
+    return {
+        name: (None if math.isnan(value) else round(float(value), 2))
+        for name, value in zip(FIELDS, row)
+    }
+
+
+class LinkQualitySampler:
+    """Periodic WiFi link statistics with smoothed views"""
+
+    def __init__(
+        self,
+        interface: Optional[str] = None,
+        interval: float = DEFAULT_INTERVAL,
+        capacity: int = DEFAULT_CAPACITY,
+        alpha: float = DEFAULT_ALPHA,
+    ):
+        """
+        Args:
+            interface: WiFi interface (default: the first one found)
+            interval: Seconds between samples
+            capacity: Samples kept in the ring buffer
+            alpha: EWMA weight of the newest sample (0-1)
+        """
+        self.interface = interface
+        self._auto_interface = interface is None
+        self.interval = interval
+        self.capacity = capacity
+        self.alpha = alpha
+        self.connected = False
+
+        self._times = np.full(capacity, np.nan)
+        self._values = np.full((capacity, len(FIELDS)), np.nan)
+        self._next = 0
+        self._count = 0
+        self._ewma = np.full(len(FIELDS), np.nan)
+        self._counters: Optional[Dict[str, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # Sampling
+
+    def _resolve_interface(self) -> Optional[str]:
+        if self.interface is None and self._auto_interface:
+            self.interface = linux_net.find_wifi_interface()
+        return self.interface
+
+    def _read(self) -> Optional[np.ndarray]:
+        """Read one sample; None when the interface is not associated"""
+        interface = self._resolve_interface()
+        if interface is None:
+            return None
+
+        row = np.full(len(FIELDS), np.nan)
+        station = None
+        try:
+            ifindex = linux_net.interface_index(interface)
+            # In AP mode (setup hotspot) the station list holds our clients
+            if netlink.wireless_interface(ifindex)["mode"] != "station":
+                self._counters = None
+                return None
+            station = netlink.station_info(ifindex)
+        except (OSError, ValueError) as e:
+            logger.debug(f"nl80211 station query failed on {interface}: {e}")
+            if self._auto_interface:
+                self.interface = None  # re-resolve, the interface may have been renamed
+
+        try:
+            proc = linux_net.read_wireless_stats().get(interface)
+        except OSError:
+            proc = None
+
+        if station is None and not (proc and proc["link"] > 0):
+            self._counters = None
+            return None
+
+        if station is not None:
+            signal = station["signal_avg"] if station["signal_avg"] is not None else station["signal"]
+            if signal is not None:
+                row[_COLUMN["signal_dbm"]] = signal
+            for name in ("tx_bitrate", "rx_bitrate"):
+                if station[name] is not None:
+                    row[_COLUMN[name]] = station[name]
+
+            counters = {name: station[name] for name in ("tx_retries", "tx_failed")}
+            previous = self._counters
+            if previous is not None:
+                for name, value in counters.items():
+                    if value is not None and previous.get(name) is not None:
+                        # Counters restart on reassociation
+                        row[_COLUMN[name]] = max(value - previous[name], 0)
+            self._counters = counters
+
+        if proc:
+            row[_COLUMN["link_quality"]] = proc["link"]
+            if proc["noise"] < 0 and proc["noise"] > -256:
+                row[_COLUMN["noise_dbm"]] = proc["noise"]
+            if np.isnan(row[_COLUMN["signal_dbm"]]) and proc["level"] < 0:
+                row[_COLUMN["signal_dbm"]] = proc["level"]
+        return row
+
+    def sample(self) -> Optional[Dict[str, Optional[float]]]:
+        """Take one sample now and add it to the history
+
+        Returns:
+            The sample as a dict, or None if the link is down
+        """
+        row = self._read()
+        if row is None:
+            if self.connected:
+                logger.info("WiFi link down, link quality history paused")
+            self.connected = False
+            self._ewma[:] = np.nan
+            return None
+
+        self.connected = True
+        self._times[self._next] = time.time()
+        self._values[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+        # EWMA per column; a column's first value (or first after a gap) seeds it
+        present = ~np.isnan(row)
+        seed = present & np.isnan(self._ewma)
+        update = present & ~seed
+        self._ewma[seed] = row[seed]
+        self._ewma[update] += self.alpha * (row[update] - self._ewma[update])
+        return _as_dict(row)
+
+    def start(self):
+        """Start sampling every interval seconds in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Stop background sampling (history is kept)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _loop(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Link quality sample failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # Queries
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _ordered(self, seconds: Optional[float] = None):
+        """Times and rows oldest first, limited to the last `seconds`"""
+        start = (self._next - self._count) % self.capacity
+        order = (start + np.arange(self._count)) % self.capacity
+        times = self._times[order]
+        values = self._values[order]
+        if seconds is not None:
+            keep = times >= time.time() - seconds
+            times, values = times[keep], values[keep]
+        return times, values
+
+    def latest(self) -> Optional[Dict[str, Optional[float]]]:
+        """Most recent sample, or None if there is none or the link is down"""
+        if not self.connected or not self._count:
+            return None
+        return _as_dict(self._values[(self._next - 1) % self.capacity])
+
+    def smoothed(self) -> Dict[str, Optional[float]]:
+        """Exponentially weighted moving average per field"""
+        return _as_dict(self._ewma)
+
+    def window(self, seconds: float = 60.0) -> Dict[str, Dict[str, Optional[float]]]:
+        """min/max/mean per field over the last `seconds`"""
+        _, values = self._ordered(seconds)
+        stats = {}
+        for name in FIELDS:
+            column = values[:, _COLUMN[name]]
+            column = column[~np.isnan(column)]
+            if len(column):
+                stats[name] = {
+                    "min": round(float(column.min()), 2),
+                    "max": round(float(column.max()), 2),
+                    "mean": round(float(column.mean()), 2),
+                }
+            else:
+                stats[name] = {"min": None, "max": None, "mean": None}
+        return stats
+
+    def history(self, seconds: Optional[float] = None) -> List[Dict]:
+        """Samples oldest first, each with its capture time"""
+        times, values = self._ordered(seconds)
+        return [
+            {"timestamp": round(float(t), 3), **_as_dict(row)} for t, row in zip(times, values)
+        ]
+
+    def signal_percent(self) -> Optional[int]:
+        """Smoothed signal as 0-100, or None without a recent sample"""
+        if not self.connected:
+            return None
+        return signal_percent(self._ewma[_COLUMN["signal_dbm"]])
+
+    def summary(self, seconds: float = 60.0) -> Dict:
+        """JSON-ready overview for status endpoints"""
+        return {
+            "interface": self.interface,
+            "connected": self.connected,
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self._count,
+            "signal_percent": self.signal_percent(),
+            "latest": self.latest(),
+            "smoothed": self.smoothed() if self.connected else None,
+            "window_seconds": seconds,
+            "window": self.window(seconds),
+        }
@@ -0,0 +1,137 @@
+"""
+Native Interface Readers
+
+Reads interface facts from sysfs and procfs instead of parsing `ip`,
+`iwconfig` or `ifconfig` output:
+
+    /sys/class/net/<iface>/{address,operstate,ifindex,type,wireless}
+    /sys/class/net/<iface>/device/driver
+    /proc/net/wireless          link quality and signal level (dBm)
+
+plus the SIOCGIWESSID ioctl for kernels whose nl80211 replies omit the SSID.
+All readers raise OSError when the information source is unavailable, so
+callers can fall back to the command-line tools.
+"""
+
+import array
+import fcntl
+import os
+import socket
+import struct
+from typing import Dict, List, Optional
+
+SYS_CLASS_NET = "/sys/class/net"
+PROC_NET_WIRELESS = "/proc/net/wireless"
+
+ARPHRD_ETHER = 1
+SIOCGIWESSID = 0x8B1B
+IW_ESSID_MAX_SIZE = 32
+IWREQ_SIZE = 32  # struct iwreq: ifr_name[16] + union iwreq_data
+IWREQ_POINT = struct.Struct("16sPHH")  # ifr_name, iw_point{pointer, length, flags}
+
+
+def read_attr(interface: str, name: str) -> str:
+    """Read one /sys/class/net/<interface>/<name> attribute"""
+    with open(os.path.join(SYS_CLASS_NET, interface, name)) as f:
+        return f.read().strip()
+
+
+def list_interfaces() -> List[str]:
+    """Interface names in ifindex order (the order `ip link` prints them)"""
+    names = os.listdir(SYS_CLASS_NET)
+
+    def index(name: str) -> int:
+        try:
+            return int(read_attr(name, "ifindex"))
+        except (OSError, ValueError):
+            return 1 << 30
+
+    return sorted(names, key=index)
+
+
+def is_wireless(interface: str) -> bool:
+    """Whether the interface is a WiFi device (cfg80211 or wireless extensions)"""
+    base = os.path.join(SYS_CLASS_NET, interface)
+    return os.path.isdir(os.path.join(base, "wireless")) or os.path.exists(
+        os.path.join(base, "phy80211")
+    )
+
+
+def find_wifi_interface() -> Optional[str]:
+    """First WiFi interface, or None if the system has none"""
+    interfaces = list_interfaces()
+    for name in interfaces:
+        if is_wireless(name):
+            return name
+    # Drivers that expose neither sysfs marker still follow the naming scheme
+    for name in interfaces:
+        if name.startswith("wl"):
+            return name
+    return None
+
+
+def interface_mac(interface: str) -> Optional[str]:
+    """Hardware address of an Ethernet-type interface (WiFi included)"""
+    if read_attr(interface, "type") != str(ARPHRD_ETHER):
+        return None
+    address = read_attr(interface, "address")
+    return address if address and address != "00:00:00:00:00:00" else None
+
+
+def interface_index(interface: str) -> int:
+    return int(read_attr(interface, "ifindex"))
+
+
+def interface_driver(interface: str) -> Optional[str]:
+    """Kernel driver bound to the interface's device (None for virtual ones)"""
+    try:
+        return os.path.basename(os.readlink(os.path.join(SYS_CLASS_NET, interface, "device", "driver")))
+    except OSError:
+        return None
+
+
+def read_wireless_stats() -> Dict[str, Dict[str, float]]:
+    """Parse /proc/net/wireless into {iface: {status, link, level, noise}}
+
+    Example input:
+
+        Inter-| sta-|   Quality        |   Discarded packets ...
+         face | tus | link level noise |  nwid  crypt ...
+         wlan0: 0000   58.  -52.  -256        0      0 ...
+    """
+    with open(PROC_NET_WIRELESS) as f:
+        lines = f.read().splitlines()[2:]
+
+    stats = {}
+    for line in lines:
+        name, _, rest = line.partition(":")
+        fields = rest.split()
+        if len(fields) < 4:
+            continue
+        try:
+            stats[name.strip()] = {
+                "status": int(fields[0], 16),
+                "link": float(fields[1].rstrip(".")),
+                "level": float(fields[2].rstrip(".")),
+                "noise": float(fields[3].rstrip(".")),
+            }
+        except ValueError:
+            continue
+    return stats
+
+
+def read_essid(interface: str) -> Optional[str]:
+    """SSID via the wireless-extensions SIOCGIWESSID ioctl
+
+    Returns None when the interface is not associated.
+    """
+    buffer = array.array("B", bytes(IW_ESSID_MAX_SIZE + 1))
+    address, _ = buffer.buffer_info()
+    request = IWREQ_POINT.pack(interface.encode()[:15], address, len(buffer), 0)
+    request += bytes(IWREQ_SIZE - len(request))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        reply = fcntl.ioctl(sock.fileno(), SIOCGIWESSID, request)
+    length = IWREQ_POINT.unpack_from(reply)[2]
+    ssid = buffer.tobytes()[:length].rstrip(b"\0")
+    return ssid.decode(errors="replace") if ssid else None
@@ -0,0 +1,658 @@
+"""
+Minimal Netlink Client
+
+Reads link, address and wireless interface state straight from the kernel
+over rtnetlink (NETLINK_ROUTE) and nl80211 (generic netlink), without
+spawning `ip` or `iw`. Only the handful of messages this service needs are
+implemented; everything is parsed with struct from the raw socket buffers.
+
+events() subscribes to rtnetlink multicast groups and yields link up/down,
+address added/removed and default route changes as they happen, so waits
+for connectivity can await the kernel instead of polling. messages() yields
+the same notifications undecoded, for state that is kept up to date from
+them (see interface_table). uevents() follows kernel device hotplug
+notifications (NETLINK_KOBJECT_UEVENT), the stream udev itself reads.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# netlink message header: length, type, flags, sequence, port id
+NLMSG_HDR = struct.Struct("=IHHII")
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+# rtnetlink
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+RTM_GETROUTE = 26
+IFINFOMSG = struct.Struct("=BxHiII")  # family, type, index, flags, change
+IFADDRMSG = struct.Struct("=BBBBI")  # family, prefixlen, flags, scope, index
+RTMSG = struct.Struct("=BBBBBBBBI")  # family, dst_len, src_len, tos, table, protocol, scope, type, flags
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IFLA_LINKINFO = 18
+IFLA_INFO_KIND = 1
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_LABEL = 3
+RTA_OIF = 4
+RTA_GATEWAY = 5
+RTA_TABLE = 15
+RT_TABLE_MAIN = 254
+RTN_UNICAST = 1
+IFF_UP = 0x1
+IFF_LOWER_UP = 0x10000
+
+# rtnetlink multicast groups
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+DEFAULT_GROUPS = (
+    RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE
+)
+
+# RFC 2863 operational states reported in IFLA_OPERSTATE
+OPERSTATES = {
+    0: "unknown",
+    1: "notpresent",
+    2: "down",
+    3: "lowerlayerdown",
+    4: "testing",
+    5: "dormant",
+    6: "up",
+}
+
+# generic netlink / nl80211
+NETLINK_GENERIC = 16
+GENL_HDR = struct.Struct("=BBH")  # cmd, version, reserved
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_IFNAME = 4
+NL80211_ATTR_IFTYPE = 5
+NL80211_ATTR_MAC = 6
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_SSID = 52
+NL80211_ATTR_STA_INFO = 21
+NL80211_STA_INFO_TX_PACKETS = 10
+NL80211_STA_INFO_TX_RETRIES = 11
+NL80211_STA_INFO_TX_FAILED = 12
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_STA_INFO_SIGNAL_AVG = 13
+NL80211_STA_INFO_RX_BITRATE = 14
+NL80211_RATE_INFO_BITRATE = 1  # u16, 100 kbit/s
+NL80211_RATE_INFO_BITRATE32 = 5  # u32, 100 kbit/s
+NL80211_IFTYPES = {1: "adhoc", 2: "station", 3: "ap", 6: "monitor", 7: "mesh"}
+
+# Kernel device hotplug notifications
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_KERNEL_GROUP = 1
+
+NLA_HDR = struct.Struct("=HH")
+
+# Event kinds
+LINK_UP = "link-up"
+LINK_DOWN = "link-down"
+ADDRESS_ADDED = "address-added"
+ADDRESS_REMOVED = "address-removed"
+DEFAULT_ROUTE_ADDED = "default-route-added"
+DEFAULT_ROUTE_REMOVED = "default-route-removed"
+# Messages were lost (receive buffer overrun); state must be re-read
+RESYNC = "resync"
+
+# Kinds that can make a host go from offline to online
+CONNECTIVITY_EVENT_KINDS = (LINK_UP, ADDRESS_ADDED, DEFAULT_ROUTE_ADDED, RESYNC)
+
+logger = logging.getLogger(__name__)
+
+
+class NetlinkError(OSError):
+    """A netlink request failed or netlink is unavailable"""
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def pack_attr(attr_type: int, payload: bytes) -> bytes:
+    """Encode one netlink attribute (header plus padded payload)"""
+    length = NLA_HDR.size + len(payload)
+    return NLA_HDR.pack(length, attr_type) + payload + b"\0" * (_align(length) - length)
+
+
+def parse_attrs(data: bytes, offset: int = 0) -> Dict[int, bytes]:
+    """Decode a run of netlink attributes into {type: payload}"""
+    attrs = {}
+    while offset + NLA_HDR.size <= len(data):
+        length, attr_type = NLA_HDR.unpack_from(data, offset)
+        if length < NLA_HDR.size:
+            break
+        attrs[attr_type & 0x3FFF] = data[offset + NLA_HDR.size : offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def _cstring(payload: bytes) -> str:
+    return payload.split(b"\0", 1)[0].decode(errors="replace")
+
+
+def _mac(payload: bytes) -> str:
+    return ":".join(f"{byte:02x}" for byte in payload)
+
+
+def iter_messages(data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """Split a receive buffer into (type, sequence, payload) messages"""
+    offset = 0
+    while offset + NLMSG_HDR.size <= len(data):
+        length, msg_type, _, seq, _ = NLMSG_HDR.unpack_from(data, offset)
+        if length < NLMSG_HDR.size:
+            break
+        yield msg_type, seq, data[offset + NLMSG_HDR.size : offset + length]
+        offset += _align(length)
+
+
+class NetlinkSocket:
+    """Blocking request/response netlink socket"""
+
+    def __init__(self, protocol: int = socket.NETLINK_ROUTE, groups: int = 0):
+        try:
+            self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol)
+            self.sock.bind((0, groups))
+        except (OSError, AttributeError) as e:
+            raise NetlinkError(f"netlink unavailable: {e}") from e
+        self._seq = 0
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, msg_type: int, flags: int, payload: bytes) -> List[Tuple[int, bytes]]:
+        """Send one request and collect the (type, payload) replies"""
+        self._seq += 1
+        seq = self._seq
+        header = NLMSG_HDR.pack(NLMSG_HDR.size + len(payload), msg_type, flags, seq, 0)
+        self.sock.send(header + payload)
+
+        replies = []
+        dump = flags & NLM_F_DUMP == NLM_F_DUMP
+        while True:
+            data = self.sock.recv(65536)
+            for reply_type, reply_seq, body in iter_messages(data):
+                if reply_seq != seq:
+                    continue
+                if reply_type == NLMSG_DONE:
+                    return replies
+                if reply_type == NLMSG_ERROR:
+                    code = -struct.unpack_from("=i", body)[0]
+                    if code == 0:
+                        return replies  # ACK
+                    raise NetlinkError(code, os.strerror(code))
+                replies.append((reply_type, body))
+                if not dump:
+                    return replies
+
+
+def dump_links(sock: Optional[NetlinkSocket] = None) -> List[Dict]:
+    """List network links: index, name, mac, operstate, flags, type and kind"""
+    own = sock is None
+    sock = sock or NetlinkSocket()
+    try:
+        replies = sock.request(
+            RTM_GETLINK, NLM_F_REQUEST | NLM_F_DUMP, IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        )
+    finally:
+        if own:
+            sock.close()
+    return [parse_link(body) for msg_type, body in replies if msg_type == RTM_NEWLINK]
+
+
+def parse_link(body: bytes) -> Dict:
+    """Decode an RTM_NEWLINK/RTM_DELLINK payload"""
+    _, link_type, index, flags, _ = IFINFOMSG.unpack_from(body)
+    attrs = parse_attrs(body, IFINFOMSG.size)
+    operstate = attrs.get(IFLA_OPERSTATE)
+    # Virtual devices name their driver kind (veth, bridge, tun, ...)
+    info = parse_attrs(attrs[IFLA_LINKINFO]) if IFLA_LINKINFO in attrs else {}
+    return {
+        "index": index,
+        "name": _cstring(attrs.get(IFLA_IFNAME, b"")),
+        "mac": _mac(attrs[IFLA_ADDRESS]) if IFLA_ADDRESS in attrs else None,
+        "operstate": OPERSTATES.get(operstate[0], "unknown") if operstate else "unknown",
+        "flags": flags,
+        "link_type": link_type,
+        "kind": _cstring(info[IFLA_INFO_KIND]) if IFLA_INFO_KIND in info else None,
+    }
+
+
+def dump_addresses(
+    family: int = socket.AF_INET, sock: Optional[NetlinkSocket] = None
+) -> List[Dict]:
+    """List interface addresses: index, label, address and prefix length"""
+    own = sock is None
+    sock = sock or NetlinkSocket()
+    try:
+        replies = sock.request(
+            RTM_GETADDR, NLM_F_REQUEST | NLM_F_DUMP, IFADDRMSG.pack(family, 0, 0, 0, 0)
+        )
+    finally:
+        if own:
+            sock.close()
+    return [parse_address(body) for msg_type, body in replies if msg_type == RTM_NEWADDR]
+
+
+def parse_address(body: bytes) -> Dict:
+    """Decode an RTM_NEWADDR/RTM_DELADDR payload"""
+    family, prefixlen, _, scope, index = IFADDRMSG.unpack_from(body)
+    attrs = parse_attrs(body, IFADDRMSG.size)
+    raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+    return {
+        "index": index,
+        "family": family,
+        "label": _cstring(attrs[IFA_LABEL]) if IFA_LABEL in attrs else None,
+        "address": socket.inet_ntop(family, raw) if raw else None,
+        "prefixlen": prefixlen,
+        "scope": scope,
+    }
+
+
+_nl80211_family: Optional[int] = None
+
+
+def _resolve_family(sock: NetlinkSocket, name: str) -> int:
+    payload = GENL_HDR.pack(CTRL_CMD_GETFAMILY, 1, 0) + pack_attr(
+        CTRL_ATTR_FAMILY_NAME, name.encode() + b"\0"
+    )
+    for _, body in sock.request(GENL_ID_CTRL, NLM_F_REQUEST, payload):
+        attrs = parse_attrs(body, GENL_HDR.size)
+        if CTRL_ATTR_FAMILY_ID in attrs:
+            return struct.unpack("=H", attrs[CTRL_ATTR_FAMILY_ID][:2])[0]
+    raise NetlinkError(errno.ENOENT, f"generic netlink family {name} not found")
+
+
+def _nl80211_request(cmd: int, ifindex: int, dump: bool = False) -> List[Dict[int, bytes]]:
+    """Send an nl80211 command for one interface; returns each reply's attributes"""
+    global _nl80211_family
+    with NetlinkSocket(NETLINK_GENERIC) as sock:
+        if _nl80211_family is None:
+            _nl80211_family = _resolve_family(sock, "nl80211")
+        payload = GENL_HDR.pack(cmd, 0, 0) + pack_attr(
+            NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)
+        )
+        flags = NLM_F_REQUEST | (NLM_F_DUMP if dump else 0)
+        replies = sock.request(_nl80211_family, flags, payload)
+    return [parse_attrs(body, GENL_HDR.size) for _, body in replies]
+
+
+def wireless_interface(ifindex: int) -> Dict:
+    """Query nl80211 for a wireless interface's mode, SSID and frequency
+
+    Raises:
+        NetlinkError: if nl80211 is unavailable or the interface is not wireless
+    """
+    replies = _nl80211_request(NL80211_CMD_GET_INTERFACE, ifindex)
+    if not replies:
+        raise NetlinkError(errno.ENODEV, "no nl80211 reply")
+    attrs = replies[0]
+    iftype = attrs.get(NL80211_ATTR_IFTYPE)
+    frequency = attrs.get(NL80211_ATTR_WIPHY_FREQ)
+    return {
+        "name": _cstring(attrs.get(NL80211_ATTR_IFNAME, b"")),
+        "mode": NL80211_IFTYPES.get(struct.unpack("=I", iftype)[0]) if iftype else None,
+        "mac": _mac(attrs[NL80211_ATTR_MAC]) if NL80211_ATTR_MAC in attrs else None,
+        # Present while associated (station) or beaconing (AP)
+        "ssid": attrs[NL80211_ATTR_SSID].decode(errors="replace")
+        if attrs.get(NL80211_ATTR_SSID)
+        else None,
+        "frequency": struct.unpack("=I", frequency)[0] if frequency else None,
+    }
+
+
+def _bitrate(payload: Optional[bytes]) -> Optional[float]:
+    """Decode a nested rate info attribute to Mbit/s"""
+    if not payload:
+        return None
+    rate = parse_attrs(payload)
+    if NL80211_RATE_INFO_BITRATE32 in rate:
+        return struct.unpack("=I", rate[NL80211_RATE_INFO_BITRATE32][:4])[0] / 10
+    if NL80211_RATE_INFO_BITRATE in rate:
+        return struct.unpack("=H", rate[NL80211_RATE_INFO_BITRATE][:2])[0] / 10
+    return None
+
+
+def station_info(ifindex: int) -> Optional[Dict]:
+    """Link statistics of the station a WiFi client interface is associated to
+
+    Returns:
+        Dict with mac, signal/signal_avg (dBm), tx/rx bitrate (Mbit/s) and
+        the cumulative tx_packets, tx_retries and tx_failed counters, or
+        None when not associated
+
+    Raises:
+        NetlinkError: if nl80211 is unavailable
+    """
+    for attrs in _nl80211_request(NL80211_CMD_GET_STATION, ifindex, dump=True):
+        if NL80211_ATTR_STA_INFO not in attrs:
+            continue
+        info = parse_attrs(attrs[NL80211_ATTR_STA_INFO])
+
+        def signed(key):
+            return struct.unpack("=b", info[key][:1])[0] if key in info else None
+
+        def counter(key):
+            return struct.unpack("=I", info[key][:4])[0] if key in info else None
+
+        return {
+            "mac": _mac(attrs[NL80211_ATTR_MAC]) if NL80211_ATTR_MAC in attrs else None,
+            "signal": signed(NL80211_STA_INFO_SIGNAL),
+            "signal_avg": signed(NL80211_STA_INFO_SIGNAL_AVG),
+            "tx_bitrate": _bitrate(info.get(NL80211_STA_INFO_TX_BITRATE)),
+            "rx_bitrate": _bitrate(info.get(NL80211_STA_INFO_RX_BITRATE)),
+            "tx_packets": counter(NL80211_STA_INFO_TX_PACKETS),
+            "tx_retries": counter(NL80211_STA_INFO_TX_RETRIES),
+            "tx_failed": counter(NL80211_STA_INFO_TX_FAILED),
+        }
+    return None
+
+
+def dump_routes(
+    family: int = socket.AF_INET, sock: Optional[NetlinkSocket] = None
+) -> List[Dict]:
+    """List routes of the main table: prefix length, gateway and interface"""
+    own = sock is None
+    sock = sock or NetlinkSocket()
+    try:
+        replies = sock.request(
+            RTM_GETROUTE, NLM_F_REQUEST | NLM_F_DUMP, RTMSG.pack(family, 0, 0, 0, 0, 0, 0, 0, 0)
+        )
+    finally:
+        if own:
+            sock.close()
+    routes = [parse_route(body) for msg_type, body in replies if msg_type == RTM_NEWROUTE]
+    return [route for route in routes if route["table"] == RT_TABLE_MAIN]
+
+
+def parse_route(body: bytes) -> Dict:
+    """Decode an RTM_NEWROUTE/RTM_DELROUTE payload"""
+    family, dst_len, _, _, table, _, _, route_type, _ = RTMSG.unpack_from(body)
+    attrs = parse_attrs(body, RTMSG.size)
+    if RTA_TABLE in attrs:
+        table = struct.unpack("=I", attrs[RTA_TABLE][:4])[0]
+    gateway = attrs.get(RTA_GATEWAY)
+    oif = attrs.get(RTA_OIF)
+    return {
+        "family": family,
+        "dst_len": dst_len,
+        "table": table,
+        "type": route_type,
+        "gateway": socket.inet_ntop(family, gateway) if gateway else None,
+        "index": struct.unpack("=I", oif)[0] if oif else None,
+    }
+
+
+def has_default_route(family: int = socket.AF_INET) -> bool:
+    """Whether the main table has a default route (what `ip route get` needs)"""
+    return any(
+        route["dst_len"] == 0 and route["type"] == RTN_UNICAST for route in dump_routes(family)
+    )
+
+
+@dataclass
+class NetlinkEvent:
+    """A link, address or default route change reported by the kernel"""
+
+    kind: str
+    index: Optional[int] = None
+    interface: Optional[str] = None
+    address: Optional[str] = None
+    gateway: Optional[str] = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+def _interface_name(index: Optional[int]) -> Optional[str]:
+    if not index:
+        return None
+    try:
+        return socket.if_indextoname(index)
+    except OSError:
+        return None  # already gone
+
+
+def _decode_event(msg_type: int, body: bytes, link_up: Dict[int, bool]) -> Optional[NetlinkEvent]:
+    if msg_type in (RTM_NEWLINK, RTM_DELLINK):
+        link = parse_link(body)
+        up = (
+            msg_type == RTM_NEWLINK
+            and link["flags"] & IFF_UP
+            and (link["flags"] & IFF_LOWER_UP or link["operstate"] == "up")
+        )
+        up = bool(up)
+        # RTM_NEWLINK also reports unrelated attribute changes; only
+        # transitions are events
+        if link_up.get(link["index"]) == up:
+            return None
+        link_up[link["index"]] = up
+        if msg_type == RTM_DELLINK:
+            link_up.pop(link["index"], None)
+        return NetlinkEvent(LINK_UP if up else LINK_DOWN, link["index"], link["name"])
+
+    if msg_type in (RTM_NEWADDR, RTM_DELADDR):
+        address = parse_address(body)
+        return NetlinkEvent(
+            ADDRESS_ADDED if msg_type == RTM_NEWADDR else ADDRESS_REMOVED,
+            address["index"],
+            address["label"] or _interface_name(address["index"]),
+            address=address["address"],
+        )
+
+    if msg_type in (RTM_NEWROUTE, RTM_DELROUTE):
+        route = parse_route(body)
+        if route["dst_len"] != 0 or route["table"] != RT_TABLE_MAIN:
+            return None
+        return NetlinkEvent(
+            DEFAULT_ROUTE_ADDED if msg_type == RTM_NEWROUTE else DEFAULT_ROUTE_REMOVED,
+            route["index"],
+            _interface_name(route["index"]),
+            gateway=route["gateway"],
+        )
+    return None
+
+
+async def messages(groups: int = DEFAULT_GROUPS) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield raw (type, payload) rtnetlink notifications
+
+    A (RESYNC, b"") item means notifications were lost (receive buffer
+    overrun) and any state built from them must be re-read. The
+    subscription is live once the first item is requested; close the
+    generator (or leave `async for`) to release the socket.
+
+    Raises:
+        NetlinkError: if rtnetlink is unavailable
+    """
+    sock = NetlinkSocket(groups=groups)
+    sock.sock.setblocking(False)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                data = await loop.sock_recv(sock.sock, 65536)
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                logger.debug("Netlink receive buffer overrun, requesting resync")
+                yield RESYNC, b""
+                continue
+            for msg_type, _, body in iter_messages(data):
+                yield msg_type, body
+    finally:
+        sock.close()
+
+
+async def events(groups: int = DEFAULT_GROUPS) -> AsyncIterator[NetlinkEvent]:
+    """Yield link, address and default route changes as the kernel reports them
+
+    The subscription is live once the first event is requested; close the
+    generator (or leave `async for`) to release the socket.
+
+    Raises:
+        NetlinkError: if rtnetlink is unavailable
+    """
+    stream = messages(groups)
+    link_up: Dict[int, bool] = {}
+    try:
+        async for msg_type, body in stream:
+            if msg_type == RESYNC:
+                link_up.clear()
+                yield NetlinkEvent(RESYNC)
+                continue
+            event = _decode_event(msg_type, body, link_up)
+            if event is not None:
+                yield event
+    finally:
+        await stream.aclose()
+
+
+def parse_uevent(data: bytes) -> Optional[Dict[str, str]]:
+    """Decode a kernel uevent: "action@devpath" then KEY=value fields"""
+    header, _, fields = data.partition(b"\0")
+    if b"@" not in header:
+        return None  # libudev-format message
+    env = {}
+    for item in fields.split(b"\0"):
+        key, sep, value = item.partition(b"=")
+        if sep:
+            env[key.decode(errors="replace")] = value.decode(errors="replace")
+    return env
+
+
+async def uevents(subsystem: Optional[str] = None) -> AsyncIterator[Dict[str, str]]:
+    """Yield kernel device uevents (ACTION, DEVPATH, SUBSYSTEM, DEVNAME, ...)
+
+    Args:
+        subsystem: Only yield events for this subsystem (e.g. "input")
+
+    An {"ACTION": RESYNC} item means events were lost and any state built
+    from them must be re-read. The subscription is live once the first
+    item is requested.
+
+    Raises:
+        NetlinkError: if uevents are unavailable
+    """
+    sock = NetlinkSocket(NETLINK_KOBJECT_UEVENT, UEVENT_KERNEL_GROUP)
+    sock.sock.setblocking(False)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                data = await loop.sock_recv(sock.sock, 65536)
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                logger.debug("Uevent receive buffer overrun, requesting resync")
+                yield {"ACTION": RESYNC}
+                continue
+            env = parse_uevent(data)
+            if env is not None and (subsystem is None or env.get("SUBSYSTEM") == subsystem):
+                yield env
+    finally:
+        sock.close()
+
+
+Ready = Callable[[], Union[bool, Awaitable[bool]]]
+
+
+async def _ready(check: Ready) -> bool:
+    result = check()
+    if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+        result = await result
+    return bool(result)
+
+
+async def wait_for_event(
+    kinds: Collection[str] = CONNECTIVITY_EVENT_KINDS,
+    timeout: Optional[float] = None,
+    ready: Optional[Ready] = None,
+) -> bool:
+    """Wait for the first matching event, or for ready() to hold
+
+    Args:
+        kinds: Event kinds that end the wait (or trigger a ready() check)
+        timeout: Maximum seconds to wait (None waits indefinitely)
+        ready: Optional sync or async condition. It is checked once after
+            subscribing (so an already-satisfied condition returns at once)
+            and again on each matching event; the wait ends only when it
+            holds. Without it the first matching event ends the wait.
+
+    Returns:
+        bool: True if satisfied, False on timeout
+
+    Raises:
+        NetlinkError: if rtnetlink is unavailable
+    """
+    stream = events()
+    pending = asyncio.ensure_future(stream.__anext__())
+    try:
+        # Let the generator open its socket before the state check
+        await asyncio.sleep(0)
+        if ready is not None and await _ready(ready):
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=remaining)
+            if not done:
+                return False
+            event = pending.result()
+            pending = None
+            if event.kind in kinds and (ready is None or await _ready(ready)):
+                logger.debug(f"Netlink wait satisfied by {event.kind} on {event.interface}")
+                return True
+            pending = asyncio.ensure_future(stream.__anext__())
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except asyncio.CancelledError:
+                pass
+        await stream.aclose()
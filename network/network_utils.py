@@ -1,18 +1,181 @@
+import ipaddress
 import re
 import subprocess
 import logging
 import socket
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from . import linux_net, netlink
+from .interface_table import InterfaceTable
+from .ip_ranking import RankedAddress, default_ranker
 
 logger = logging.getLogger(__name__)
 
+# How long the single-fact getters reuse the last snapshot (seconds)
+SNAPSHOT_MAX_AGE = 1.0
+
+# Upper bound for any single command-line tool invocation (seconds)
+COMMAND_TIMEOUT = 10.0
+
+
+class InterfaceInfo(NamedTuple):
+    """One network interface as seen in a snapshot"""
+
+    name: str
+    type: str  # "wireless" or "wired"
+    state: Optional[str] = None  # operstate, when known
+    ip_address: Optional[str] = None
+    mac_address: Optional[str] = None
+
+    def as_dict(self):
+        """Dictionary form used by get_network_details (unknown fields omitted)"""
+        return {key: value for key, value in self._asdict().items() if value is not None}
+
+
+class NetworkSnapshot:
+    """Immutable record of the network state captured in one pass."""
+
+    __slots__ = (
+        "captured_at",
+        "monotonic",
+        "hostname",
+        "interfaces",
+        "addresses",
+        "wifi_interface",
+        "ssid",
+        "mac_address",
+        "signal_strength",
+        "signal_dbm",
+        "ip_address",
+        "ip_ranking",
+    )
+
+    def __init__(
+        self,
+        hostname: str,
+        interfaces: Tuple[InterfaceInfo, ...],
+        addresses: Tuple[Tuple[str, str], ...],
+        wifi_interface: Optional[str],
+        ssid: str,
+        mac_address: str,
+        signal_strength: str,
+        signal_dbm: Optional[int],
+        ip_address: str,
+        ip_ranking: Tuple[RankedAddress, ...] = (),
+    ):
+        """
+        Args:
+            hostname: System hostname
+            interfaces: All interfaces in ifindex order
+            addresses: (interface, IPv4) pairs the IP choice was ranked from
+            wifi_interface: Name of the WiFi interface, if any
+            ssid: SSID, or a "No WiFi ..." message like get_wifi_name()
+            mac_address: MAC address, or a message like get_wifi_mac_address()
+            signal_strength: Display string like get_wifi_signal_strength()
+            signal_dbm: Signal level in dBm, when the source reports one
+            ip_address: Ranked IP choice, or "No network IP found"
+            ip_ranking: Every candidate address, best first, with reasons
+        """
+        values = dict(locals())
+        del values["self"]
+        values["captured_at"] = time.time()
+        values["monotonic"] = time.monotonic()
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    __delattr__ = __setattr__
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was captured"""
+        return time.monotonic() - self.monotonic
+
+    @property
+    def has_ip(self) -> bool:
+        """Whether ip_address is an address rather than an error message"""
+        try:
+            ipaddress.ip_address(self.ip_address)
+            return True
+        except ValueError:
+            return False
+
+    def details(self):
+        """Dictionary in the get_network_details() format"""
+        details = {
+            "hostname": self.hostname,
+            "ip_address": self.ip_address,
+            "mac_address": self.mac_address,
+            "signal_strength": self.signal_strength,
+        }
+        if self.interfaces:
+            details["interfaces"] = [interface.as_dict() for interface in self.interfaces]
+        return details
+
+    def __repr__(self):
+        return (
+            f"NetworkSnapshot(ssid={self.ssid!r}, ip_address={self.ip_address!r}, "
+            f"wifi_interface={self.wifi_interface!r}, captured_at={self.captured_at:.3f})"
+        )
+
 
 class NetworkUtils:
     """
     Utility class for network-related functionality.
 
     Provides methods for obtaining network information such as IP addresses.
+    snapshot() collects everything in one pass; the get_* methods are views
+    over a recent snapshot. Facts are read natively from sysfs, procfs and
+    netlink; the `ip`, `iwconfig`, `iw`, `nmcli` and `ifconfig` parsers are
+    only used when the native source is unavailable.
     """
 
+    def __init__(self, native=True, command_timeout=COMMAND_TIMEOUT, table=None):
+        """
+        Args:
+            native: Read from sysfs/procfs/netlink first (False forces the
+                command-line tools, e.g. for comparison)
+            command_timeout: Seconds before a command-line tool is killed
+            table: Live InterfaceTable to read interfaces from; without one
+                (or while it is not live) each snapshot dumps the table
+        """
+        self.native = native
+        self.command_timeout = command_timeout
+        self.table = table
+        self._last_snapshot: Optional[NetworkSnapshot] = None
+        self._processes = set()
+        self._processes_lock = threading.Lock()
+
+    def snapshot(self, max_age: float = 0.0) -> NetworkSnapshot:
+        """Capture the current network state in one pass.
+
+        Args:
+            max_age: Return the previous snapshot instead if it is at most
+                this many seconds old (0 always captures a new one)
+
+        Returns:
+            NetworkSnapshot
+        """
+        previous = self._last_snapshot
+        if previous is not None and max_age > 0 and previous.age <= max_age:
+            return previous
+
+        snapshot = None
+        if self.native:
+            try:
+                snapshot = self._native_snapshot()
+            except OSError as e:
+                logger.debug(f"Native network snapshot unavailable, using command-line tools: {e}")
+        if snapshot is None:
+            snapshot = self._tool_snapshot()
+
+        self._last_snapshot = snapshot
+        return snapshot
+
     def get_wifi_name(self):
         """Get the WiFi SSID name.
 
@@ -20,7 +183,7 @@ class NetworkUtils:
             SSID name as a string or an error message
         """
         try:
-            return self._get_linux_wifi_name()
+            return self.snapshot(SNAPSHOT_MAX_AGE).ssid
         except Exception as e:
             logger.error(f"Error getting WiFi name: {e}")
             return "Unknown WiFi"
@@ -32,7 +195,7 @@ class NetworkUtils:
             IP address as a string or an error message
         """
         try:
-            return self._get_linux_ip()
+            return self.snapshot(SNAPSHOT_MAX_AGE).ip_address
         except Exception as e:
             logger.error(f"Error getting IP address: {e}")
             return "Error getting IP address"
@@ -44,7 +207,7 @@ class NetworkUtils:
             MAC address as a string or an error message
         """
         try:
-            return self._get_linux_mac()
+            return self.snapshot(SNAPSHOT_MAX_AGE).mac_address
         except Exception as e:
             logger.error(f"Error getting MAC address: {e}")
             return "Error getting MAC address"
@@ -56,7 +219,7 @@ class NetworkUtils:
             Signal strength as a string or an error message
         """
         try:
-            return self._get_linux_signal_strength()
+            return self.snapshot(SNAPSHOT_MAX_AGE).signal_strength
         except Exception as e:
             logger.error(f"Error getting signal strength: {e}")
             return "Error getting signal strength"
@@ -68,23 +231,204 @@ class NetworkUtils:
             Dictionary with network details
         """
         try:
-            details = {
-                "hostname": socket.gethostname(),
-                "ip_address": self.get_wifi_ip_address(),
-                "mac_address": self.get_wifi_mac_address(),
-                "signal_strength": self.get_wifi_signal_strength(),
-            }
-
-            # Add interface information
-            interfaces = self._get_network_interfaces()
-            if interfaces:
-                details["interfaces"] = interfaces
-
-            return details
+            return self.snapshot(SNAPSHOT_MAX_AGE).details()
         except Exception as e:
             logger.error(f"Error getting network details: {e}")
             return {"error": "Failed to get network details"}
 
+    def _native_snapshot(self):
+        """One pass over the interface table, procfs and nl80211.
+
+        Raises:
+            OSError: if sysfs or rtnetlink is unavailable
+        """
+        table = self.table
+        if table is not None and table.live:
+            # Unchanged table, unchanged ranking
+            generation = (id(table), table.generation)
+        else:
+            table = InterfaceTable()
+            table.refresh()
+            generation = None
+
+        records = table.records()
+        addresses = table.addresses()
+        interfaces = tuple(
+            InterfaceInfo(
+                name=record.name,
+                type="wireless" if record.wireless else "wired",
+                state=record.operstate,
+                ip_address=record.ipv4[0] if record.ipv4 else None,
+                mac_address=record.mac,
+            )
+            for record in records
+        )
+
+        wifi_interface = table.wifi_interface()
+        signal_strength, signal_dbm = self._native_signal(wifi_interface)
+        ranking = default_ranker.rank(addresses, generation)
+        return NetworkSnapshot(
+            hostname=socket.gethostname(),
+            interfaces=interfaces,
+            addresses=tuple(addresses),
+            wifi_interface=wifi_interface,
+            ssid=self._native_wifi_name(wifi_interface),
+            mac_address=self._native_mac(wifi_interface, interfaces),
+            signal_strength=signal_strength,
+            signal_dbm=signal_dbm,
+            ip_address=ranking[0].address if ranking else "No network IP found",
+            ip_ranking=ranking,
+        )
+
+    # Independent command-line tool lookups that make up a snapshot, by the
+    # _assemble_tool_snapshot() argument they fill (AsyncNetworkUtils runs
+    # them concurrently)
+    TOOL_PARTS = {
+        "interfaces": "_get_network_interfaces",
+        "signal_strength": "_get_linux_signal_strength",
+        "ssid": "_get_linux_wifi_name",
+        "mac_address": "_get_linux_mac",
+        "ip_address": "_get_linux_ip",
+    }
+
+    def _tool_snapshot(self):
+        """Snapshot assembled from the command-line tool parsers."""
+        return self._assemble_tool_snapshot(
+            **{part: getattr(self, method)() for part, method in self.TOOL_PARTS.items()}
+        )
+
+    @staticmethod
+    def _assemble_tool_snapshot(interfaces, signal_strength, ssid, mac_address, ip_address):
+        interfaces = tuple(
+            InterfaceInfo(
+                name=entry["name"],
+                type=entry["type"],
+                ip_address=entry.get("ip_address"),
+                mac_address=entry.get("mac_address"),
+            )
+            for entry in interfaces
+        )
+        dbm_match = re.search(r"\((-?\d+)dBm\)", signal_strength)
+        wifi_interface = next(
+            (interface.name for interface in interfaces if interface.type == "wireless"), None
+        )
+        addresses = tuple(
+            (interface.name, interface.ip_address)
+            for interface in interfaces
+            if interface.ip_address
+        )
+        return NetworkSnapshot(
+            hostname=socket.gethostname(),
+            interfaces=interfaces,
+            addresses=addresses,
+            wifi_interface=wifi_interface,
+            ssid=ssid,
+            mac_address=mac_address,
+            signal_strength=signal_strength,
+            signal_dbm=int(dbm_match.group(1)) if dbm_match else None,
+            ip_address=ip_address,
+            ip_ranking=default_ranker.rank(addresses),
+        )
+
+    def _run(self, args):
+        """Run a command-line tool like subprocess.run(check=True).
+
+        The process is tracked so cancel_commands() can kill it.
+
+        Returns:
+            subprocess.CompletedProcess with text stdout/stderr
+        """
+        process = subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        with self._processes_lock:
+            self._processes.add(process)
+        try:
+            stdout, stderr = process.communicate(timeout=self.command_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._processes_lock:
+                self._processes.discard(process)
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+        return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+    def cancel_commands(self):
+        """Kill command-line tools this instance is still waiting on."""
+        with self._processes_lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def _native_mac(self, wifi_interface, interfaces):
+        """WiFi MAC, else the first Ethernet-type MAC."""
+        for interface in interfaces:
+            if interface.name == wifi_interface and interface.mac_address:
+                return interface.mac_address
+
+        for interface in interfaces:
+            if interface.mac_address:
+                return interface.mac_address
+        return "No WiFi MAC address found"
+
+    def _native_signal(self, wifi_interface):
+        """Signal of the WiFi interface from /proc/net/wireless.
+
+        Returns:
+            (display string, dBm or None); falls back to iwconfig/iw
+            when /proc/net/wireless is unavailable
+        """
+        if not wifi_interface:
+            return "No WiFi interface found", None
+
+        try:
+            stats = linux_net.read_wireless_stats().get(wifi_interface)
+        except OSError as e:
+            logger.debug(f"/proc/net/wireless unavailable, using iwconfig/iw: {e}")
+            signal_strength = self._get_linux_signal_strength()
+            dbm_match = re.search(r"\((-?\d+)dBm\)", signal_strength)
+            return signal_strength, int(dbm_match.group(1)) if dbm_match else None
+
+        if not stats or (stats["link"] == 0 and stats["level"] == 0):
+            return "No signal strength information available", None
+
+        if stats["level"] < 0:
+            dbm = int(stats["level"])
+            # Typical WiFi range is -30 dBm (excellent) to -90 dBm (poor)
+            percent = min(100, max(0, 2 * (dbm + 100)))
+            return f"{int(percent)}% ({dbm}dBm)", dbm
+
+        # Driver reports a relative level; fall back to link quality (x/70)
+        quality = int(stats["link"])
+        return f"{int(quality / 70 * 100)}% (Quality: {quality}/70)", None
+
+    def _native_wifi_name(self, wifi_interface):
+        """SSID via nl80211, else SIOCGIWESSID, else the command-line tools."""
+        if not wifi_interface:
+            return "No WiFi interface found"
+
+        ssid = None
+        try:
+            info = netlink.wireless_interface(linux_net.interface_index(wifi_interface))
+            ssid = info["ssid"]
+        except (OSError, ValueError) as e:
+            logger.debug(f"nl80211 query failed, trying wireless extensions: {e}")
+        if not ssid:
+            # Older kernels omit the SSID of a station in nl80211 replies
+            try:
+                ssid = linux_net.read_essid(wifi_interface)
+            except OSError as e:
+                logger.debug(f"SIOCGIWESSID failed, using command-line tools: {e}")
+                return self._get_linux_wifi_name()
+        return ssid or "No WiFi name found"
+
     def _get_linux_ip(self):
         """Get the IP address for Linux systems.
 
@@ -94,12 +438,7 @@ class NetworkUtils:
         try:
             # Try using ip command first (modern)
             try:
-                result = subprocess.run(
-                    ["ip", "-4", "addr", "show"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["ip", "-4", "addr", "show"])
 
                 # Use smart IP prioritization logic instead of just finding WiFi
                 output = result.stdout
@@ -107,9 +446,7 @@ class NetworkUtils:
 
             except FileNotFoundError:
                 # Fall back to ifconfig
-                result = subprocess.run(
-                    ["ifconfig"], capture_output=True, text=True, check=True
-                )
+                result = self._run(["ifconfig"])
 
                 # Use smart IP prioritization logic for ifconfig output too
                 output = result.stdout
@@ -129,11 +466,7 @@ class NetworkUtils:
         Returns:
             Best IP address or "No network IP found"
         """
-        # Virtual/bridge interfaces to avoid
-        virtual_interfaces = ["docker", "br-", "veth", "lxc", "virbr", "vmnet", "tun", "tap"]
-        
-        # Collect all potential IPs with their interfaces
-        candidate_ips = []
+        candidates = []
         current_interface = None
         
         for line in output.split("\n"):
@@ -146,41 +479,9 @@ class NetworkUtils:
             elif "inet " in line and current_interface:
                 ip_match = re.search(r"inet (\d+\.\d+\.\d+\.\d+)", line)
                 if ip_match:
-                    ip = ip_match.group(1)
-                    if ip != "127.0.0.1":  # Skip loopback
-                        # Check if it's a virtual interface
-                        is_virtual = any(vif in current_interface.lower() for vif in virtual_interfaces)
-                        candidate_ips.append({
-                            'ip': ip,
-                            'interface': current_interface,
-                            'is_virtual': is_virtual,
-                            'is_ethernet': current_interface.startswith(('eth', 'en')),
-                            'is_wifi': current_interface.startswith(('wlan', 'wl')),
-                            'is_private': self._is_private_network_ip(ip)
-                        })
-        
-        # Prioritize IPs: WiFi > Ethernet > Private Network > Non-virtual
-        def ip_priority(ip_info):
-            priority = 0
-            if ip_info['is_wifi']:
-                priority += 1000
-            elif ip_info['is_ethernet']:
-                priority += 800
-            if ip_info['is_private']:
-                priority += 100
-            if not ip_info['is_virtual']:
-                priority += 50
-            # Prefer 192.168.x.x and 10.x.x.x over 172.x.x.x (which Docker often uses)
-            if ip_info['ip'].startswith('192.168.') or ip_info['ip'].startswith('10.'):
-                priority += 20
-            return priority
-        
-        if candidate_ips:
-            # Sort by priority and return the best one
-            candidate_ips.sort(key=ip_priority, reverse=True)
-            return candidate_ips[0]['ip']
+                    candidates.append((current_interface, ip_match.group(1)))
         
-        return "No network IP found"
+        return self._pick_best_ip(candidates)
 
     def _find_best_ip_from_ifconfig_output(self, output):
         """Find the best IP address from ifconfig output, avoiding virtual interfaces.
@@ -191,87 +492,31 @@ class NetworkUtils:
         Returns:
             Best IP address or "No network IP found"
         """
-        # Virtual/bridge interfaces to avoid
-        virtual_interfaces = ["docker", "br-", "veth", "lxc", "virbr", "vmnet", "tun", "tap"]
-        
-        # Collect all potential IPs with their interfaces
-        candidate_ips = []
+        candidates = []
         current_interface = None
         
         for line in output.split("\n"):
-            line = line.strip()
-            # Check if this is a new interface (starts at beginning of line)
-            if line and not line.startswith(" ") and ":" in line:
+            # Interface sections start at the beginning of the line
+            if line and not line[0].isspace() and ":" in line:
                 current_interface = line.split(":")[0].strip()
             elif "inet " in line and current_interface:
                 ip_match = re.search(r"inet (\d+\.\d+\.\d+\.\d+)", line)
                 if ip_match:
-                    ip = ip_match.group(1)
-                    if ip != "127.0.0.1":  # Skip loopback
-                        # Check if it's a virtual interface
-                        is_virtual = any(vif in current_interface.lower() for vif in virtual_interfaces)
-                        candidate_ips.append({
-                            'ip': ip,
-                            'interface': current_interface,
-                            'is_virtual': is_virtual,
-                            'is_ethernet': current_interface.startswith(('eth', 'en')),
-                            'is_wifi': current_interface.startswith(('wlan', 'wl')),
-                            'is_private': self._is_private_network_ip(ip)
-                        })
-        
-        # Use same prioritization logic
-        def ip_priority(ip_info):
-            priority = 0
-            if ip_info['is_wifi']:
-                priority += 1000
-            elif ip_info['is_ethernet']:
-                priority += 800
-            if ip_info['is_private']:
-                priority += 100
-            if not ip_info['is_virtual']:
-                priority += 50
-            # Prefer 192.168.x.x and 10.x.x.x over 172.x.x.x (which Docker often uses)
-            if ip_info['ip'].startswith('192.168.') or ip_info['ip'].startswith('10.'):
-                priority += 20
-            return priority
-        
-        if candidate_ips:
-            # Sort by priority and return the best one
-            candidate_ips.sort(key=ip_priority, reverse=True)
-            return candidate_ips[0]['ip']
+                    candidates.append((current_interface, ip_match.group(1)))
         
-        return "No network IP found"
+        return self._pick_best_ip(candidates)
+
+    def _pick_best_ip(self, candidates):
+        """Choose the IP to display from (interface, ip) pairs.
 
-    def _is_private_network_ip(self, ip):
-        """Check if an IP address is in a private network range.
-        
         Args:
-            ip: IP address string
-            
+            candidates: Iterable of (interface name, IPv4 address)
+
         Returns:
-            True if IP is in private network range, False otherwise
+            Best IP address or "No network IP found"
         """
-        try:
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            
-            first = int(parts[0])
-            second = int(parts[1])
-            
-            # 10.0.0.0/8
-            if first == 10:
-                return True
-            # 172.16.0.0/12
-            elif first == 172 and 16 <= second <= 31:
-                return True
-            # 192.168.0.0/16
-            elif first == 192 and second == 168:
-                return True
-                
-            return False
-        except (ValueError, IndexError):
-            return False
+        best = default_ranker.best(candidates)
+        return best.address if best else "No network IP found"
 
     def _get_linux_mac(self):
         """Get the MAC address for Linux systems.
@@ -282,12 +527,7 @@ class NetworkUtils:
         try:
             # Try using ip command first (modern)
             try:
-                result = subprocess.run(
-                    ["ip", "link", "show"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["ip", "link", "show"])
 
                 # Parse output looking for wifi interface (wlan0, wlp2s0, etc.)
                 output = result.stdout
@@ -320,9 +560,7 @@ class NetworkUtils:
 
             except FileNotFoundError:
                 # Fall back to ifconfig
-                result = subprocess.run(
-                    ["ifconfig"], capture_output=True, text=True, check=True
-                )
+                result = self._run(["ifconfig"])
 
                 output = result.stdout
                 wifi_regex = r"(wl\w+)"
@@ -362,9 +600,7 @@ class NetworkUtils:
             try:
                 # Find WiFi interface
                 wifi_interface = None
-                ip_result = subprocess.run(
-                    ["ip", "link", "show"], capture_output=True, text=True, check=True
-                )
+                ip_result = self._run(["ip", "link", "show"])
                 wifi_regex = r"(wl\w+)"
                 wifi_interfaces = re.findall(wifi_regex, ip_result.stdout)
                 if wifi_interfaces:
@@ -374,12 +610,7 @@ class NetworkUtils:
                     return "No WiFi interface found"
 
                 # Get signal strength using iwconfig
-                result = subprocess.run(
-                    ["iwconfig", wifi_interface],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["iwconfig", wifi_interface])
 
                 output = result.stdout
                 for line in output.split("\n"):
@@ -415,12 +646,7 @@ class NetworkUtils:
                 try:
                     # Find WiFi interface
                     wifi_interface = None
-                    ip_result = subprocess.run(
-                        ["ip", "link", "show"],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
+                    ip_result = self._run(["ip", "link", "show"])
                     wifi_regex = r"(wl\w+)"
                     wifi_interfaces = re.findall(wifi_regex, ip_result.stdout)
                     if wifi_interfaces:
@@ -430,12 +656,7 @@ class NetworkUtils:
                         return "No WiFi interface found"
 
                     # Get signal strength using iw
-                    result = subprocess.run(
-                        ["iw", "dev", wifi_interface, "link"],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
+                    result = self._run(["iw", "dev", wifi_interface, "link"])
 
                     output = result.stdout
                     for line in output.split("\n"):
@@ -473,21 +694,20 @@ class NetworkUtils:
             try:
                 command = ["ip", "addr", "show"]
 
-                result = subprocess.run(
-                    command, capture_output=True, text=True, check=True
-                )
+                result = self._run(command)
 
                 output = result.stdout
                 current_interface = None
 
                 for line in output.split("\n"):
+                    # New interface starts: "2: wlan0: <BROADCAST,...>"
+                    header = re.match(r"\d+:\s*([^:@]+)", line)
                     line = line.strip()
-                    # New interface starts
-                    if line and not line.startswith(" ") and ":" in line:
+                    if header:
                         if current_interface:
                             interfaces.append(current_interface)
 
-                        if_name = line.split(":")[0].strip()
+                        if_name = header.group(1).strip()
                         current_interface = {
                             "name": if_name,
                             "type": (
@@ -525,12 +745,7 @@ class NetworkUtils:
         try:
             # Try nmcli first (NetworkManager)
             try:
-                result = subprocess.run(
-                    ["nmcli", "-t", "-f", "active,ssid", "dev", "wifi"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["nmcli", "-t", "-f", "active,ssid", "dev", "wifi"])
 
                 # Parse output to find active connection
                 for line in result.stdout.split("\n"):
@@ -543,9 +758,7 @@ class NetworkUtils:
             try:
                 # Find WiFi interface
                 wifi_interface = None
-                ip_result = subprocess.run(
-                    ["ip", "link", "show"], capture_output=True, text=True, check=True
-                )
+                ip_result = self._run(["ip", "link", "show"])
                 wifi_regex = r"(wl\w+)"
                 wifi_interfaces = re.findall(wifi_regex, ip_result.stdout)
                 if wifi_interfaces:
@@ -555,12 +768,7 @@ class NetworkUtils:
                     return "No WiFi interface found"
 
                 # Get SSID using iwconfig
-                result = subprocess.run(
-                    ["iwconfig", wifi_interface],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["iwconfig", wifi_interface])
 
                 # Extract ESSID from output
                 essid_match = re.search(r'ESSID:"([^"]*)"', result.stdout)
@@ -573,9 +781,7 @@ class NetworkUtils:
             try:
                 # Find WiFi interface
                 wifi_interface = None
-                ip_result = subprocess.run(
-                    ["ip", "link", "show"], capture_output=True, text=True, check=True
-                )
+                ip_result = self._run(["ip", "link", "show"])
                 wifi_regex = r"(wl\w+)"
                 wifi_interfaces = re.findall(wifi_regex, ip_result.stdout)
                 if wifi_interfaces:
@@ -585,12 +791,7 @@ class NetworkUtils:
                     return "No WiFi interface found"
 
                 # Get SSID using iw
-                result = subprocess.run(
-                    ["iw", "dev", wifi_interface, "link"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                result = self._run(["iw", "dev", wifi_interface, "link"])
 
                 # Extract SSID from output
                 ssid_match = re.search(r"SSID: (.*?)$", result.stdout, re.MULTILINE)
@@ -0,0 +1,566 @@
+"""
+NetworkManager D-Bus Client
+
+Keeps one long-lived connection to NetworkManager on the system bus and
+issues method calls and property reads directly, so routine queries no
+longer fork an nmcli process each time.
+
+The bus address can be overridden with WIFI_NM_DBUS_ADDRESS to point the
+client at a private bus running a mock NetworkManager (for example the
+python-dbusmock "networkmanager" template).
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from dbus_next import BusType, Message, MessageType, Variant
+    from dbus_next.aio import MessageBus
+
+    DBUS_AVAILABLE = True
+except ImportError:
+    DBUS_AVAILABLE = False
+
+
+NM_BUS_NAME = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+NM_IFACE = NM_BUS_NAME
+NM_DEVICE_IFACE = f"{NM_BUS_NAME}.Device"
+NM_WIRELESS_IFACE = f"{NM_BUS_NAME}.Device.Wireless"
+NM_AP_IFACE = f"{NM_BUS_NAME}.AccessPoint"
+NM_ACTIVE_IFACE = f"{NM_BUS_NAME}.Connection.Active"
+NM_IP4_IFACE = f"{NM_BUS_NAME}.IP4Config"
+NM_SETTINGS_PATH = f"{NM_PATH}/Settings"
+NM_SETTINGS_IFACE = f"{NM_BUS_NAME}.Settings"
+NM_CONNECTION_IFACE = f"{NM_BUS_NAME}.Settings.Connection"
+PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+
+NM_DEVICE_TYPE_WIFI = 2
+
+NM_DEVICE_STATE_UNAVAILABLE = 20
+NM_DEVICE_STATE_DISCONNECTED = 30
+NM_DEVICE_STATE_PREPARE = 40
+NM_DEVICE_STATE_CONFIG = 50
+NM_DEVICE_STATE_NEED_AUTH = 60
+NM_DEVICE_STATE_IP_CONFIG = 70
+NM_DEVICE_STATE_ACTIVATED = 100
+NM_DEVICE_STATE_DEACTIVATING = 110
+NM_DEVICE_STATE_FAILED = 120
+
+NM_ACTIVE_CONNECTION_STATE_ACTIVATING = 1
+NM_ACTIVE_CONNECTION_STATE_ACTIVATED = 2
+NM_ACTIVE_CONNECTION_STATE_DEACTIVATED = 4
+
+NM_DEVICE_STATE_REASON_NO_SECRETS = 7
+NM_DEVICE_STATE_REASON_SUPPLICANT_DISCONNECT = 8
+NM_DEVICE_STATE_REASON_SUPPLICANT_TIMEOUT = 11
+NM_DEVICE_STATE_REASON_SSID_NOT_FOUND = 53
+
+NM_802_11_MODE_AP = 3
+
+# Seconds to wait before retrying a bus connection that failed
+RECONNECT_BACKOFF = 30.0
+
+# Re-read interval while waiting on an object's signals; only a safety net
+# for missed signals, so kept long
+SIGNAL_POLL_INTERVAL = 5.0
+
+
+class NMDBusError(Exception):
+    """NetworkManager D-Bus call failures"""
+
+    pass
+
+
+def _unwrap(value: Any) -> Any:
+    """Recursively convert dbus-next Variants into plain Python values"""
+    if DBUS_AVAILABLE and isinstance(value, Variant):
+        return _unwrap(value.value)
+    if isinstance(value, dict):
+        return {k: _unwrap(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    return value
+
+
+def _to_variant(value: Any) -> "Variant":
+    """Wrap a plain Python value in the Variant NetworkManager expects"""
+    if isinstance(value, Variant):
+        return value
+    if isinstance(value, bool):
+        return Variant("b", value)
+    if isinstance(value, (bytes, bytearray)):
+        return Variant("ay", bytes(value))
+    if isinstance(value, int):
+        return Variant("u", value)
+    if isinstance(value, str):
+        return Variant("s", value)
+    if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+        return Variant(
+            "aa{sv}", [{k: _to_variant(v) for k, v in item.items()} for item in value]
+        )
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return Variant("as", value)
+    raise NMDBusError(f"Unsupported settings value: {value!r}")
+
+
+def to_connection_settings(settings: Dict[str, Dict[str, Any]]) -> Dict:
+    """Convert a nested plain dict into an a{sa{sv}} settings payload"""
+    return {
+        group: {key: _to_variant(value) for key, value in values.items()}
+        for group, values in settings.items()
+    }
+
+
+def decode_ssid(raw: Any) -> Optional[str]:
+    """Decode an SSID byte array as reported by NetworkManager"""
+    if not raw:
+        return None
+    if isinstance(raw, (bytes, bytearray)):
+        return bytes(raw).decode("utf-8", errors="replace")
+    if isinstance(raw, list):
+        return bytes(raw).decode("utf-8", errors="replace")
+    return str(raw)
+
+
+class ObjectWatch:
+    """Wakes a waiter whenever NetworkManager signals from one object"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._changed = asyncio.Event()
+
+    def notify(self, message):
+        if message.path == self.path:
+            self._changed.set()
+
+    async def wait_for(
+        self,
+        check: Callable[[], Awaitable[bool]],
+        timeout: float,
+        poll_interval: float = SIGNAL_POLL_INTERVAL,
+    ) -> bool:
+        """Wait until check() is true, re-checking after each signal
+
+        Returns:
+            bool: True if the condition was met, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            # Cleared before checking so a signal in between is not lost
+            self._changed.clear()
+            if await check():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), min(poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+
+class NMDBusClient:
+    """Persistent NetworkManager client over a single D-Bus connection"""
+
+    def __init__(self, bus_address: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.bus_address = bus_address or os.environ.get("WIFI_NM_DBUS_ADDRESS")
+        self._bus = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._last_failure = 0.0
+
+    @property
+    def connected(self) -> bool:
+        """Whether the bus connection is currently open"""
+        return self._bus is not None and self._bus.connected
+
+    async def connect(self) -> bool:
+        """Open the bus connection if needed
+
+        Returns:
+            bool: True if connected, False if D-Bus is unavailable
+        """
+        if not DBUS_AVAILABLE:
+            return False
+        if self.connected:
+            return True
+        if time.monotonic() - self._last_failure < RECONNECT_BACKOFF:
+            return False
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            try:
+                if self.bus_address:
+                    bus = MessageBus(bus_address=self.bus_address)
+                else:
+                    bus = MessageBus(bus_type=BusType.SYSTEM)
+                self._bus = await bus.connect()
+                # Make sure NetworkManager is actually on the bus
+                await self.get_property(NM_PATH, NM_IFACE, "Version")
+                self.logger.info("Connected to NetworkManager over D-Bus")
+                return True
+            except Exception as e:
+                self.logger.warning(f"NetworkManager D-Bus unavailable: {e}")
+                self._last_failure = time.monotonic()
+                self._disconnect()
+                return False
+
+    def _disconnect(self):
+        if self._bus is not None:
+            try:
+                self._bus.disconnect()
+            except Exception:
+                pass
+        self._bus = None
+
+    async def close(self):
+        """Close the bus connection"""
+        self._disconnect()
+
+    async def call(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: Optional[List] = None,
+        destination: str = NM_BUS_NAME,
+    ) -> List:
+        """Call a method and return the reply body"""
+        if not self.connected:
+            raise NMDBusError("Not connected to D-Bus")
+
+        try:
+            reply = await self._bus.call(
+                Message(
+                    destination=destination,
+                    path=path,
+                    interface=interface,
+                    member=member,
+                    signature=signature,
+                    body=body or [],
+                )
+            )
+        except Exception as e:
+            if not self.connected:
+                self._last_failure = time.monotonic()
+                self._disconnect()
+            raise NMDBusError(f"{interface}.{member} failed: {e}")
+
+        if reply.message_type == MessageType.ERROR:
+            detail = reply.body[0] if reply.body else reply.error_name
+            raise NMDBusError(f"{reply.error_name}: {detail}")
+
+        return reply.body
+
+    async def get_property(self, path: str, interface: str, name: str) -> Any:
+        """Read a single property"""
+        body = await self.call(
+            path, PROPERTIES_IFACE, "Get", "ss", [interface, name]
+        )
+        return _unwrap(body[0])
+
+    async def get_properties(self, path: str, interface: str) -> Dict[str, Any]:
+        """Read all properties of an interface in one round trip"""
+        body = await self.call(path, PROPERTIES_IFACE, "GetAll", "s", [interface])
+        return _unwrap(body[0])
+
+    async def get_wifi_devices(self) -> List[Dict[str, Any]]:
+        """List WiFi devices with their core device properties"""
+        paths = await self.call(NM_PATH, NM_IFACE, "GetDevices")
+        devices = []
+        for path in paths[0]:
+            props = await self.get_properties(path, NM_DEVICE_IFACE)
+            if props.get("DeviceType") == NM_DEVICE_TYPE_WIFI:
+                props["Path"] = path
+                devices.append(props)
+        return devices
+
+    async def get_wifi_device(self, interface: Optional[str] = None) -> Dict[str, Any]:
+        """Return the first (or named) WiFi device"""
+        devices = await self.get_wifi_devices()
+        for device in devices:
+            if interface is None or device.get("Interface") == interface:
+                return device
+        raise NMDBusError("No WiFi device found")
+
+    async def get_device_ip(self, device_path: str) -> Optional[str]:
+        """Return the first IPv4 address of a device"""
+        config_path = await self.get_property(device_path, NM_DEVICE_IFACE, "Ip4Config")
+        if not config_path or config_path == "/":
+            return None
+        address_data = await self.get_property(config_path, NM_IP4_IFACE, "AddressData")
+        for entry in address_data:
+            if entry.get("address"):
+                return entry["address"]
+        return None
+
+    async def get_device_ssid(self, device_path: str) -> Optional[str]:
+        """Return the SSID of the access point a device is using"""
+        ap_path = await self.get_property(
+            device_path, NM_WIRELESS_IFACE, "ActiveAccessPoint"
+        )
+        if not ap_path or ap_path == "/":
+            return None
+        return decode_ssid(await self.get_property(ap_path, NM_AP_IFACE, "Ssid"))
+
+    async def get_active_wifi(self) -> Optional[Dict[str, Any]]:
+        """Describe the activated WiFi connection, if any
+
+        Returns:
+            Dict with interface, connection_id, ssid and ip_address, or None
+        """
+        for device in await self.get_wifi_devices():
+            if device.get("State") != NM_DEVICE_STATE_ACTIVATED:
+                continue
+
+            path = device["Path"]
+            connection_id = None
+            active_path = device.get("ActiveConnection")
+            if active_path and active_path != "/":
+                connection_id = await self.get_property(active_path, NM_ACTIVE_IFACE, "Id")
+
+            return {
+                "interface": device.get("Interface"),
+                "connection_id": connection_id,
+                "ssid": await self.get_device_ssid(path),
+                "ip_address": await self.get_device_ip(path),
+            }
+        return None
+
+    async def get_access_points(self, device_path: str) -> List[Dict[str, Any]]:
+        """Return the device's current access point list without rescanning"""
+        body = await self.call(device_path, NM_WIRELESS_IFACE, "GetAllAccessPoints")
+        access_points = []
+        for ap_path in body[0]:
+            try:
+                props = await self.get_properties(ap_path, NM_AP_IFACE)
+            except NMDBusError:
+                continue  # AP vanished between the list and the read
+            props["Path"] = ap_path
+            props["SsidText"] = decode_ssid(props.get("Ssid"))
+            access_points.append(props)
+        return access_points
+
+    async def request_scan(self, device_path: str, timeout: float = 10.0) -> bool:
+        """Ask the device to rescan and wait for the scan to complete
+
+        Done when the device's PropertiesChanged reports a new LastScan.
+
+        Returns:
+            bool: True if a new scan result arrived before the timeout
+        """
+        async with self.watch_object(device_path) as watch:
+            before = await self.get_property(device_path, NM_WIRELESS_IFACE, "LastScan")
+            await self.call(device_path, NM_WIRELESS_IFACE, "RequestScan", "a{sv}", [{}])
+
+            async def scanned() -> bool:
+                last_scan = await self.get_property(device_path, NM_WIRELESS_IFACE, "LastScan")
+                return last_scan != before
+
+            return await watch.wait_for(scanned, timeout)
+
+    async def list_connections(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return (path, settings) for every saved connection profile"""
+        body = await self.call(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "ListConnections")
+        connections = []
+        for path in body[0]:
+            try:
+                settings = await self.get_connection_settings(path)
+            except NMDBusError:
+                continue
+            connections.append((path, settings))
+        return connections
+
+    async def get_connection_settings(self, path: str) -> Dict[str, Any]:
+        """Return the settings of a saved connection profile"""
+        body = await self.call(path, NM_CONNECTION_IFACE, "GetSettings")
+        return _unwrap(body[0])
+
+    async def find_connections(self, connection_id: str) -> List[str]:
+        """Return profile paths whose id or SSID matches"""
+        matches = []
+        for path, settings in await self.list_connections():
+            if settings.get("connection", {}).get("id") == connection_id:
+                matches.append(path)
+                continue
+            ssid = decode_ssid(settings.get("802-11-wireless", {}).get("ssid"))
+            if ssid == connection_id:
+                matches.append(path)
+        return matches
+
+    async def add_connection(self, settings: Dict[str, Dict[str, Any]]) -> str:
+        """Save a new connection profile and return its path"""
+        body = await self.call(
+            NM_SETTINGS_PATH,
+            NM_SETTINGS_IFACE,
+            "AddConnection",
+            "a{sa{sv}}",
+            [to_connection_settings(settings)],
+        )
+        return body[0]
+
+    async def get_connection_by_uuid(self, uuid: str) -> str:
+        """Return the path of a saved profile by UUID"""
+        body = await self.call(
+            NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "GetConnectionByUuid", "s", [uuid]
+        )
+        return body[0]
+
+    async def add_and_activate(
+        self, settings: Dict[str, Dict[str, Any]], device_path: str, specific_object: str = "/"
+    ) -> Tuple[str, str]:
+        """Create a profile and activate it in a single call
+
+        Returns:
+            Tuple of (connection path, active connection path)
+        """
+        body = await self.call(
+            NM_PATH,
+            NM_IFACE,
+            "AddAndActivateConnection",
+            "a{sa{sv}}oo",
+            [to_connection_settings(settings), device_path, specific_object],
+        )
+        return body[0], body[1]
+
+    async def activate_connection(
+        self, connection_path: str, device_path: str, specific_object: str = "/"
+    ) -> str:
+        """Activate an existing profile and return the active connection path"""
+        body = await self.call(
+            NM_PATH,
+            NM_IFACE,
+            "ActivateConnection",
+            "ooo",
+            [connection_path, device_path, specific_object],
+        )
+        return body[0]
+
+    async def deactivate_connection(self, active_path: str):
+        """Deactivate an active connection"""
+        await self.call(NM_PATH, NM_IFACE, "DeactivateConnection", "o", [active_path])
+
+    async def delete_connection(self, connection_path: str):
+        """Delete a saved connection profile"""
+        await self.call(connection_path, NM_CONNECTION_IFACE, "Delete")
+
+    async def add_signal_handler(
+        self, match_rule: str, handler: Callable[[Any], None]
+    ) -> Callable[[], None]:
+        """Subscribe to signals matching a D-Bus match rule
+
+        Args:
+            match_rule: D-Bus match rule, e.g. "type='signal',sender='...'"
+            handler: Called with each matching signal message
+
+        Returns:
+            Callable that removes the handler again
+        """
+        await self.call(
+            "/org/freedesktop/DBus",
+            "org.freedesktop.DBus",
+            "AddMatch",
+            "s",
+            [match_rule],
+            destination="org.freedesktop.DBus",
+        )
+
+        def on_message(message):
+            if message.message_type == MessageType.SIGNAL:
+                handler(message)
+
+        bus = self._bus
+        bus.add_message_handler(on_message)
+
+        def remove():
+            try:
+                bus.remove_message_handler(on_message)
+            except Exception:
+                pass
+            if bus.connected:
+                asyncio.ensure_future(self._remove_match(match_rule))
+
+        return remove
+
+    async def _remove_match(self, match_rule: str):
+        try:
+            await self.call(
+                "/org/freedesktop/DBus",
+                "org.freedesktop.DBus",
+                "RemoveMatch",
+                "s",
+                [match_rule],
+                destination="org.freedesktop.DBus",
+            )
+        except NMDBusError:
+            pass
+
+    @contextlib.asynccontextmanager
+    async def watch_object(self, path: str) -> AsyncIterator[ObjectWatch]:
+        """Follow the signals of one NetworkManager object while in the block"""
+        watch = ObjectWatch(path)
+        remove = await self.add_signal_handler(
+            f"type='signal',sender='{NM_BUS_NAME}',path='{path}'", watch.notify
+        )
+        try:
+            yield watch
+        finally:
+            remove()
+
+    async def get_device_interfaces(self) -> Dict[str, str]:
+        """Map every device object path to its interface name"""
+        paths = await self.call(NM_PATH, NM_IFACE, "GetDevices")
+        interfaces = {}
+        for path in paths[0]:
+            try:
+                interfaces[path] = await self.get_property(path, NM_DEVICE_IFACE, "Interface")
+            except NMDBusError:
+                continue
+        return interfaces
+
+    async def wait_for_activation(
+        self, active_path: str, device_path: str, timeout: float = 45.0
+    ) -> Tuple[bool, int]:
+        """Wait for an active connection to finish activating
+
+        Re-checked on the active connection's StateChanged and
+        PropertiesChanged signals.
+
+        Returns:
+            Tuple of (activated, device state reason)
+        """
+        state = None
+
+        async def settled() -> bool:
+            nonlocal state
+            try:
+                state = await self.get_property(active_path, NM_ACTIVE_IFACE, "State")
+            except NMDBusError:
+                state = NM_ACTIVE_CONNECTION_STATE_DEACTIVATED  # object already gone
+            return state in (
+                NM_ACTIVE_CONNECTION_STATE_ACTIVATED,
+                NM_ACTIVE_CONNECTION_STATE_DEACTIVATED,
+            )
+
+        async with self.watch_object(active_path) as watch:
+            await watch.wait_for(settled, timeout)
+        if state == NM_ACTIVE_CONNECTION_STATE_ACTIVATED:
+            return True, 0
+
+        reason = 0
+        try:
+            state_reason = await self.get_property(device_path, NM_DEVICE_IFACE, "StateReason")
+            reason = state_reason[1]
+        except (NMDBusError, IndexError, TypeError):
+            pass
+        return False, reason
@@ -0,0 +1,349 @@
+"""
+NetworkManager Event Monitor
+
+Turns NetworkManager state changes into an async event stream. Events come
+from D-Bus signals when the persistent client is connected, otherwise from
+a long-running `nmcli monitor` process. Consumers await the next relevant
+event instead of polling connection status on a timer.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from .nm_dbus import (
+    NM_ACTIVE_IFACE,
+    NM_BUS_NAME,
+    NM_DEVICE_IFACE,
+    NM_DEVICE_STATE_ACTIVATED,
+    NM_IFACE,
+    NM_SETTINGS_IFACE,
+    NMDBusClient,
+    NMDBusError,
+)
+
+# Event kinds
+DEVICE_STATE = "device-state"
+ACTIVE_STATE = "active-state"
+NM_STATE = "nm-state"
+CONNECTION_ADDED = "connection-added"
+CONNECTION_REMOVED = "connection-removed"
+
+# Kinds that can change what get_connection_status() reports
+STATE_EVENT_KINDS = (DEVICE_STATE, ACTIVE_STATE, NM_STATE)
+
+# nmcli monitor prints textual device states; map them to NMDeviceState values
+NMCLI_DEVICE_STATES = {
+    "unmanaged": 10,
+    "unavailable": 20,
+    "disconnected": 30,
+    "connecting (prepare)": 40,
+    "connecting (configuring)": 50,
+    "connecting (need authentication)": 60,
+    "connecting (getting IP configuration)": 70,
+    "connecting (checking IP connectivity)": 80,
+    "connecting (starting secondary connections)": 90,
+    "connected": 100,
+    "deactivating": 110,
+    "connection failed": 120,
+}
+
+NMCLI_DEVICE_LINE = re.compile(r"^(\S+): (.+)$")
+NMCLI_PROFILE_LINE = re.compile(r"^(.+): connection profile (created|removed)$")
+
+
+@dataclass
+class NMEvent:
+    """A single NetworkManager state change"""
+
+    kind: str
+    interface: Optional[str] = None
+    path: Optional[str] = None
+    new_state: Optional[int] = None
+    old_state: Optional[int] = None
+    reason: Optional[int] = None
+    connection_id: Optional[str] = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def activated(self) -> bool:
+        """Whether this event reports a device reaching the activated state"""
+        return self.kind == DEVICE_STATE and self.new_state == NM_DEVICE_STATE_ACTIVATED
+
+
+class NMEventSubscription:
+    """Bounded per-consumer queue of events"""
+
+    def __init__(self, monitor: "NMEventMonitor", maxsize: int = 256):
+        self._monitor = monitor
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, event: NMEvent):
+        if self._queue.full():
+            # Slow consumer: drop the oldest event rather than block publishers
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[NMEvent]:
+        """Return the next event, or None if the timeout expires"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> List[NMEvent]:
+        """Return the events already queued without waiting"""
+        events = []
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+
+    def close(self):
+        """Stop receiving events"""
+        self._monitor._unsubscribe(self)
+
+    async def __aenter__(self) -> "NMEventSubscription":
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> NMEvent:
+        return await self._queue.get()
+
+
+class NMEventMonitor:
+    """Publishes NetworkManager state changes to any number of subscribers"""
+
+    def __init__(self, nm_client: Optional[NMDBusClient] = None, use_nmcli: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self._nm = nm_client
+        self._use_nmcli = use_nmcli
+        self._subscribers: List[NMEventSubscription] = []
+        self._listeners: List[Callable[[NMEvent], None]] = []
+        self._device_names = {}
+        self._remove_handler: Optional[Callable[[], None]] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.source: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether events are currently being delivered"""
+        if self.source == "dbus":
+            return self._nm is not None and self._nm.connected
+        if self.source == "nmcli":
+            return self._process is not None and self._process.returncode is None
+        return False
+
+    async def start(self) -> bool:
+        """Start delivering events from D-Bus, or nmcli monitor as fallback
+
+        Returns:
+            bool: True if an event source is running
+        """
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self.running:
+                return True
+            await self._stop_sources()
+
+            if self._nm is not None and await self._nm.connect():
+                try:
+                    await self._start_dbus()
+                    self.source = "dbus"
+                    self.logger.info("Listening for NetworkManager D-Bus signals")
+                    return True
+                except NMDBusError as e:
+                    self.logger.warning(f"D-Bus signal subscription failed: {e}")
+
+            if self._use_nmcli:
+                try:
+                    await self._start_nmcli()
+                    self.source = "nmcli"
+                    self.logger.info("Listening for NetworkManager events via nmcli monitor")
+                    return True
+                except (OSError, FileNotFoundError) as e:
+                    self.logger.warning(f"nmcli monitor unavailable: {e}")
+
+            self.source = None
+            return False
+
+    async def stop(self):
+        """Stop the event source"""
+        await self._stop_sources()
+        self.source = None
+
+    async def _stop_sources(self):
+        if self._remove_handler:
+            self._remove_handler()
+            self._remove_handler = None
+
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.terminate()
+                await self._process.wait()
+            except ProcessLookupError:
+                pass
+        self._process = None
+
+    def subscribe(self) -> NMEventSubscription:
+        """Create a subscription that receives every subsequent event"""
+        subscription = NMEventSubscription(self)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def add_listener(self, callback: Callable[[NMEvent], None]):
+        """Register a synchronous callback run for every event
+
+        Listeners run before subscribers are woken, so they can update
+        shared state (e.g. drop caches) that subscribers then read.
+        """
+        self._listeners.append(callback)
+
+    def _unsubscribe(self, subscription: NMEventSubscription):
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+
+    async def wait_for(
+        self, predicate: Callable[[NMEvent], bool], timeout: Optional[float] = None
+    ) -> Optional[NMEvent]:
+        """Wait for the first event matching a predicate
+
+        Returns:
+            The matching event, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        async with self.subscribe() as events:
+            while True:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                event = await events.get(remaining)
+                if event is None:
+                    return None
+                if predicate(event):
+                    return event
+
+    def publish(self, event: NMEvent):
+        """Deliver an event to every subscriber"""
+        self.logger.debug(f"NetworkManager event: {event}")
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                self.logger.error(f"Event listener error: {e}")
+        for subscription in list(self._subscribers):
+            subscription._put(event)
+
+    async def _start_dbus(self):
+        self._device_names = await self._nm.get_device_interfaces()
+        self._remove_handler = await self._nm.add_signal_handler(
+            f"type='signal',sender='{NM_BUS_NAME}'", self._on_dbus_signal
+        )
+
+    def _on_dbus_signal(self, message):
+        interface = message.interface
+        member = message.member
+        body = message.body
+
+        if interface == NM_DEVICE_IFACE and member == "StateChanged":
+            self.publish(
+                NMEvent(
+                    kind=DEVICE_STATE,
+                    interface=self._device_names.get(message.path),
+                    path=message.path,
+                    new_state=body[0],
+                    old_state=body[1],
+                    reason=body[2],
+                )
+            )
+        elif interface == NM_ACTIVE_IFACE and member == "StateChanged":
+            self.publish(
+                NMEvent(
+                    kind=ACTIVE_STATE,
+                    path=message.path,
+                    new_state=body[0],
+                    reason=body[1],
+                )
+            )
+        elif interface == NM_IFACE and member == "StateChanged":
+            self.publish(NMEvent(kind=NM_STATE, new_state=body[0]))
+        elif interface == NM_IFACE and member == "DeviceAdded":
+            asyncio.ensure_future(self._learn_device(body[0]))
+        elif interface == NM_SETTINGS_IFACE and member == "NewConnection":
+            self.publish(NMEvent(kind=CONNECTION_ADDED, path=body[0]))
+        elif interface == NM_SETTINGS_IFACE and member == "ConnectionRemoved":
+            self.publish(NMEvent(kind=CONNECTION_REMOVED, path=body[0]))
+
+    async def _learn_device(self, path: str):
+        try:
+            self._device_names[path] = await self._nm.get_property(
+                path, NM_DEVICE_IFACE, "Interface"
+            )
+        except NMDBusError:
+            pass
+
+    async def _start_nmcli(self):
+        self._process = await asyncio.create_subprocess_exec(
+            "nmcli",
+            "monitor",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader_task = asyncio.create_task(self._read_nmcli())
+
+    async def _read_nmcli(self):
+        last_states = {}
+        while True:
+            line = await self._process.stdout.readline()
+            if not line:
+                self.logger.warning("nmcli monitor exited")
+                return
+
+            event = parse_nmcli_monitor_line(line.decode(errors="replace").strip())
+            if event is None:
+                continue
+            if event.kind == DEVICE_STATE:
+                event.old_state = last_states.get(event.interface)
+                last_states[event.interface] = event.new_state
+            self.publish(event)
+
+
+def parse_nmcli_monitor_line(line: str) -> Optional[NMEvent]:
+    """Convert one line of `nmcli monitor` output into an event"""
+    profile = NMCLI_PROFILE_LINE.match(line)
+    if profile:
+        kind = CONNECTION_ADDED if profile.group(2) == "created" else CONNECTION_REMOVED
+        return NMEvent(kind=kind, connection_id=profile.group(1))
+
+    match = NMCLI_DEVICE_LINE.match(line)
+    if match and match.group(2) in NMCLI_DEVICE_STATES:
+        return NMEvent(
+            kind=DEVICE_STATE,
+            interface=match.group(1),
+            new_state=NMCLI_DEVICE_STATES[match.group(2)],
+        )
+
+    if line.startswith("Networkmanager is now in the"):
+        connected = "'connected" in line
+        return NMEvent(kind=NM_STATE, new_state=70 if connected else 20)
+
+    return None
@@ -0,0 +1,161 @@
+"""
+nmcli Terse Output Parsing
+
+Helpers for running nmcli in terse mode (-t) and parsing its output.
+Terse values escape ':' as '\\:' and '\\' as '\\\\', so SSIDs and profile
+names containing colons must be split on unescaped separators only.
+"""
+
+import asyncio
+import re
+from typing import Dict, List, Optional, Tuple
+
+# One query that answers get_connection_status(): device state, profile,
+# IPv4 addresses and the in-use access point (from NM's cached scan list)
+DEVICE_STATUS_FIELDS = (
+    "GENERAL.DEVICE,GENERAL.TYPE,GENERAL.STATE,GENERAL.CONNECTION,"
+    "IP4.ADDRESS,AP.IN-USE,AP.SSID"
+)
+
+INDEXED_KEY = re.compile(r"^([A-Z0-9-]+)\[(\d+)\]\.(.+)$|^([A-Z0-9-]+)\[(\d+)\]$")
+
+
+def split_terse(line: str, maxsplit: int = -1) -> List[str]:
+    """Split a terse nmcli line on unescaped colons and unescape the fields
+
+    Args:
+        line: One line of `nmcli -t` output
+        maxsplit: Maximum number of splits (-1 for no limit)
+
+    Returns:
+        List of unescaped field values
+    """
+    fields = []
+    current = []
+    escaped = False
+    for char in line:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ":" and (maxsplit < 0 or len(fields) < maxsplit):
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if escaped:
+        current.append("\\")
+    fields.append("".join(current))
+    return fields
+
+
+def parse_state(value: str) -> Tuple[Optional[int], str]:
+    """Parse a state like "100 (connected)" into (100, "connected")"""
+    match = re.match(r"^(\d+)\s*\((.*)\)$", value.strip())
+    if match:
+        return int(match.group(1)), match.group(2)
+    return None, value.strip()
+
+
+def parse_device_show(output: str) -> List[Dict]:
+    """Parse terse multiline `nmcli device show` output
+
+    Returns:
+        One dict per device with keys device, type, state, state_text,
+        connection, ip4_addresses and access_points (list of dicts)
+    """
+    devices: List[Dict] = []
+    current: Optional[Dict] = None
+
+    for line in output.splitlines():
+        if not line:
+            continue
+        parts = split_terse(line, maxsplit=1)
+        if len(parts) != 2:
+            continue
+        key, value = parts
+
+        if key == "GENERAL.DEVICE":
+            current = {
+                "device": value,
+                "type": None,
+                "state": None,
+                "state_text": "",
+                "connection": None,
+                "ip4_addresses": [],
+                "access_points": {},
+            }
+            devices.append(current)
+            continue
+        if current is None:
+            continue
+
+        if key == "GENERAL.TYPE":
+            current["type"] = value
+        elif key == "GENERAL.STATE":
+            current["state"], current["state_text"] = parse_state(value)
+        elif key == "GENERAL.CONNECTION":
+            current["connection"] = value or None
+        elif key.startswith("IP4.ADDRESS"):
+            if value:
+                current["ip4_addresses"].append(value.split("/")[0])
+        elif key.startswith("AP["):
+            match = INDEXED_KEY.match(key)
+            if match and match.group(1):
+                ap = current["access_points"].setdefault(int(match.group(2)), {})
+                ap[match.group(3)] = value
+
+    for device in devices:
+        device["access_points"] = [
+            device["access_points"][index] for index in sorted(device["access_points"])
+        ]
+    return devices
+
+
+def active_wifi_from_devices(devices: List[Dict]) -> Optional[Dict]:
+    """Pick the activated WiFi device from parsed device records
+
+    Returns:
+        Dict with interface, connection_id, ssid and ip_address, or None
+    """
+    for device in devices:
+        if device["type"] != "wifi" or device["state"] != 100:
+            continue
+
+        ssid = None
+        for ap in device["access_points"]:
+            if ap.get("IN-USE") == "*":
+                ssid = ap.get("SSID") or None
+                break
+
+        return {
+            "interface": device["device"],
+            "connection_id": device["connection"],
+            "ssid": ssid,
+            "ip_address": device["ip4_addresses"][0] if device["ip4_addresses"] else None,
+        }
+    return None
+
+
+async def run_nmcli(*args: str, input_data: Optional[bytes] = None) -> Tuple[int, str, str]:
+    """Run nmcli and return (returncode, stdout, stderr)"""
+    process = await asyncio.create_subprocess_exec(
+        "nmcli",
+        *args,
+        stdin=asyncio.subprocess.PIPE if input_data is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(input=input_data)
+    return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
+async def query_active_wifi() -> Optional[Dict]:
+    """Describe the activated WiFi connection with a single nmcli call"""
+    returncode, stdout, stderr = await run_nmcli(
+        "-t", "-f", DEVICE_STATUS_FIELDS, "device", "show"
+    )
+    if returncode != 0:
+        raise RuntimeError(stderr.strip() or f"nmcli exited with {returncode}")
+    return active_wifi_from_devices(parse_device_show(stdout))
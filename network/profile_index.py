@@ -0,0 +1,149 @@
+"""
+Saved Profile Index
+
+Maps SSIDs to the NetworkManager WiFi profiles that already exist for them,
+so known networks can be reconnected with a direct profile activation
+instead of a scan plus new-profile creation. Connection history (last
+success, last connect duration) is kept per profile UUID in the state
+store so it survives restarts.
+
+The index is rebuilt lazily: NetworkManager profile added/removed events
+only mark it stale, and the next lookup reloads it.
+"""
+
+import hashlib
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .state_store import StateStore
+
+# State document holding per-profile connection history
+PROFILES_STATE = "saved-profiles"
+
+# SavedProfile fields persisted per UUID
+HISTORY_FIELDS = ("last_success", "last_duration", "successes", "failures", "secret_hash")
+
+
+@dataclass
+class SavedProfile:
+    """A saved WiFi profile and its connection history"""
+
+    ssid: str
+    uuid: str
+    connection_id: str
+    timestamp: int = 0  # NetworkManager's last activation time (epoch seconds)
+    last_success: Optional[float] = None
+    last_duration: Optional[float] = None
+    successes: int = 0
+    failures: int = 0
+    secret_hash: Optional[str] = None
+
+
+def _secret_hash(uuid: str, password: str) -> str:
+    return hashlib.sha256(f"{uuid}:{password}".encode()).hexdigest()
+
+
+class ProfileIndex:
+    """SSID-keyed index of saved WiFi profiles"""
+
+    def __init__(self, store: StateStore):
+        self._store = store
+        self._profiles: Dict[str, SavedProfile] = {}
+        self._history: Dict[str, dict] = store.load(PROFILES_STATE, {}) or {}
+        self.stale = True
+        self.loaded_at: Optional[float] = None  # time.monotonic() of last reload
+        self.generation = 0
+
+    def invalidate(self):
+        """Mark the index for reloading on next use"""
+        self.stale = True
+
+    def replace(self, profiles: Iterable[dict]):
+        """Rebuild the index from the profiles NetworkManager has saved
+
+        Args:
+            profiles: Dicts with ssid, uuid, connection_id and timestamp.
+                When several profiles share an SSID, the most recently
+                activated one wins.
+        """
+        indexed: Dict[str, SavedProfile] = {}
+        known = set()
+        for item in profiles:
+            ssid = item.get("ssid")
+            if not ssid or not item.get("uuid"):
+                continue
+            known.add(item["uuid"])
+            history = self._history.get(item["uuid"], {})
+            profile = SavedProfile(
+                ssid=ssid,
+                uuid=item["uuid"],
+                connection_id=item.get("connection_id") or ssid,
+                timestamp=int(item.get("timestamp") or 0),
+                **{key: history[key] for key in HISTORY_FIELDS if key in history},
+            )
+            current = indexed.get(ssid)
+            if current is None or profile.timestamp > current.timestamp:
+                indexed[ssid] = profile
+
+        self._profiles = indexed
+        self.stale = False
+        self.loaded_at = time.monotonic()
+        self.generation += 1
+
+        # Forget history of profiles that no longer exist
+        if set(self._history) - known:
+            self._history = {
+                uuid: history for uuid, history in self._history.items() if uuid in known
+            }
+            self._store.save(PROFILES_STATE, self._history)
+
+    def lookup(self, ssid: str) -> Optional[SavedProfile]:
+        """Return the saved profile for an SSID, or None"""
+        return self._profiles.get(ssid)
+
+    def secret_matches(self, profile: SavedProfile, password: str) -> bool:
+        """Whether password is the one last used successfully with profile"""
+        return profile.secret_hash is not None and profile.secret_hash == _secret_hash(
+            profile.uuid, password
+        )
+
+    def record_success(self, ssid: str, duration: float, password: str = ""):
+        """Record a successful connection through the SSID's profile"""
+        profile = self._profiles.get(ssid)
+        if profile is None:
+            return
+        profile.last_success = time.time()
+        profile.last_duration = round(duration, 3)
+        profile.successes += 1
+        if password:
+            profile.secret_hash = _secret_hash(profile.uuid, password)
+        self._save(profile)
+
+    def record_failure(self, ssid: str):
+        """Record a failed connection through the SSID's profile"""
+        profile = self._profiles.get(ssid)
+        if profile is None:
+            return
+        profile.failures += 1
+        self._save(profile)
+
+    def _save(self, profile: SavedProfile):
+        history = {key: getattr(profile, key) for key in HISTORY_FIELDS}
+        self._history[profile.uuid] = history
+        self._store.save(PROFILES_STATE, self._history)
+
+    def __contains__(self, ssid: str) -> bool:
+        return ssid in self._profiles
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def profiles(self) -> List[dict]:
+        """All indexed profiles for inspection (without secret hashes)"""
+        result = []
+        for profile in sorted(self._profiles.values(), key=lambda p: p.ssid):
+            entry = asdict(profile)
+            entry["has_secret"] = entry.pop("secret_hash") is not None
+            result.append(entry)
+        return result
@@ -0,0 +1,339 @@
+"""
+Internet Reachability Prober
+
+Answers "can this device actually reach the internet?" rather than "is
+there a route?". A check runs cheap probes concurrently (DNS resolution,
+TCP connect, an HTTP 204 check) and combines them into a verdict:
+
+    online    every probe kind has at least one success
+    limited   something answered, but not everything (DNS only, captive
+              portal rewriting the 204 check, ...)
+    offline   nothing answered
+
+Verdicts are cached for a TTL and concurrent callers share one in-flight
+check. With watch() running, rtnetlink link/address/route changes drop the
+cached verdict and trigger a re-probe.
+
+Targets default to public endpoints and can be replaced, e.g. with local
+stand-ins for tests, via the constructor or WIFI_REACHABILITY_TARGETS:
+
+    WIFI_REACHABILITY_TARGETS="dns:localhost,tcp:127.0.0.1:9000,http://127.0.0.1:9000/generate_204"
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from . import netlink
+
+logger = logging.getLogger(__name__)
+
+DNS = "dns"
+TCP = "tcp"
+HTTP = "http"
+
+ONLINE = "online"
+LIMITED = "limited"
+OFFLINE = "offline"
+
+DEFAULT_TTL = 30.0
+DEFAULT_PROBE_TIMEOUT = 3.0
+# Coalesce bursts of netlink events (link up, address, route) into one probe
+EVENT_SETTLE = 0.5
+
+
+@dataclass(frozen=True)
+class ProbeTarget:
+    """One endpoint to probe"""
+
+    kind: str  # DNS, TCP or HTTP
+    host: str
+    port: int = 0
+    path: str = "/"
+    expect_status: int = 204
+
+    @property
+    def name(self) -> str:
+        if self.kind == DNS:
+            return f"dns:{self.host}"
+        if self.kind == TCP:
+            return f"tcp:{self.host}:{self.port}"
+        return f"http://{self.host}:{self.port}{self.path}"
+
+
+DEFAULT_TARGETS = (
+    ProbeTarget(DNS, "connectivitycheck.gstatic.com"),
+    ProbeTarget(TCP, "1.1.1.1", 443),
+    ProbeTarget(HTTP, "connectivitycheck.gstatic.com", 80, "/generate_204"),
+)
+
+
+def parse_targets(spec: str) -> List[ProbeTarget]:
+    """Parse a comma-separated target list
+
+    Entries are "dns:HOST", "tcp:HOST:PORT" or "http://HOST[:PORT]/PATH"
+    (an optional "=STATUS" suffix on HTTP entries overrides 204).
+
+    Raises:
+        ValueError: on a malformed entry
+    """
+    targets = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        if entry.startswith("http://"):
+            url, _, status = entry.partition("=")
+            parts = urlsplit(url)
+            targets.append(
+                ProbeTarget(
+                    HTTP,
+                    parts.hostname or "",
+                    parts.port or 80,
+                    parts.path or "/",
+                    int(status) if status else 204,
+                )
+            )
+        elif entry.startswith("dns:"):
+            targets.append(ProbeTarget(DNS, entry[4:]))
+        elif entry.startswith("tcp:"):
+            host, _, port = entry[4:].rpartition(":")
+            targets.append(ProbeTarget(TCP, host, int(port)))
+        else:
+            raise ValueError(f"Unknown reachability target: {entry}")
+    return targets
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one target"""
+
+    target: str
+    kind: str
+    ok: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ReachabilityVerdict:
+    """Combined result of one reachability check"""
+
+    state: str
+    latency_ms: Optional[float]  # fastest successful probe
+    checked_at: float  # time.time()
+    duration_ms: float
+    results: List[ProbeResult] = field(default_factory=list)
+    monotonic: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def reachable(self) -> bool:
+        return self.state == ONLINE
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.monotonic
+
+    def as_dict(self) -> Dict:
+        result = asdict(self)
+        result.pop("monotonic")
+        result["reachable"] = self.reachable
+        result["age"] = round(self.age, 3)
+        return result
+
+
+async def _probe_dns(target: ProbeTarget):
+    loop = asyncio.get_running_loop()
+    await loop.getaddrinfo(target.host, None, type=socket.SOCK_STREAM)
+
+
+async def _probe_tcp(target: ProbeTarget):
+    _, writer = await asyncio.open_connection(target.host, target.port)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _probe_http(target: ProbeTarget):
+    reader, writer = await asyncio.open_connection(target.host, target.port)
+    try:
+        writer.write(
+            f"GET {target.path} HTTP/1.1\r\nHost: {target.host}\r\n"
+            f"User-Agent: distiller-reachability\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+    finally:
+        writer.close()
+    parts = status_line.decode(errors="replace").split()
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ConnectionError(f"bad HTTP response {status_line[:40]!r}")
+    if int(parts[1]) != target.expect_status:
+        # Typically a captive portal redirect
+        raise ConnectionError(f"HTTP {parts[1]}, expected {target.expect_status}")
+
+
+_PROBES = {DNS: _probe_dns, TCP: _probe_tcp, HTTP: _probe_http}
+
+
+async def probe(target: ProbeTarget, timeout: float = DEFAULT_PROBE_TIMEOUT) -> ProbeResult:
+    """Probe one target; never raises"""
+    start = time.monotonic()
+    try:
+        await asyncio.wait_for(_PROBES[target.kind](target), timeout)
+    except asyncio.TimeoutError:
+        return ProbeResult(target.name, target.kind, False, error=f"timeout after {timeout}s")
+    except (OSError, ConnectionError) as e:
+        return ProbeResult(target.name, target.kind, False, error=str(e) or type(e).__name__)
+    latency = round((time.monotonic() - start) * 1000, 1)
+    return ProbeResult(target.name, target.kind, True, latency)
+
+
+def combine(results: Sequence[ProbeResult], started: float) -> ReachabilityVerdict:
+    """Turn probe results into a verdict"""
+    kinds = {result.kind for result in results}
+    succeeded = {result.kind for result in results if result.ok}
+    if results and succeeded == kinds:
+        state = ONLINE
+    elif succeeded:
+        state = LIMITED
+    else:
+        state = OFFLINE
+    latencies = [result.latency_ms for result in results if result.ok]
+    return ReachabilityVerdict(
+        state=state,
+        latency_ms=min(latencies) if latencies else None,
+        checked_at=time.time(),
+        duration_ms=round((time.monotonic() - started) * 1000, 1),
+        results=list(results),
+    )
+
+
+class ReachabilityProber:
+    """Cached internet reachability verdicts"""
+
+    def __init__(
+        self,
+        targets: Optional[Sequence[ProbeTarget]] = None,
+        ttl: float = DEFAULT_TTL,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+    ):
+        """
+        Args:
+            targets: Endpoints to probe (default: WIFI_REACHABILITY_TARGETS
+                or DEFAULT_TARGETS)
+            ttl: Seconds a verdict is reused
+            probe_timeout: Per-probe timeout in seconds
+        """
+        if targets is None:
+            spec = os.getenv("WIFI_REACHABILITY_TARGETS")
+            targets = parse_targets(spec) if spec else DEFAULT_TARGETS
+        self.targets = tuple(targets)
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+        self.last_verdict: Optional[ReachabilityVerdict] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._generation = 0
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def invalidate(self):
+        """Forget the cached verdict and detach any in-flight check"""
+        self._generation += 1
+        self.last_verdict = None
+        self._inflight = None
+
+    async def check(self, max_age: Optional[float] = None) -> ReachabilityVerdict:
+        """Return a verdict no older than max_age (default: the TTL)
+
+        Concurrent callers share one in-flight check; max_age=0 forces a
+        new probe round.
+        """
+        ttl = self.ttl if max_age is None else max_age
+        verdict = self.last_verdict
+        if verdict is not None and verdict.age <= ttl:
+            return verdict
+
+        inflight = self._inflight
+        if inflight is None or ttl <= 0:
+            inflight = asyncio.ensure_future(self._run_probes())
+            self._inflight = inflight
+        generation = self._generation
+        try:
+            verdict = await asyncio.shield(inflight)
+        finally:
+            if self._inflight is inflight and inflight.done():
+                self._inflight = None
+
+        # A network change while probing makes the result stale
+        if generation == self._generation:
+            if self.last_verdict is None or self.last_verdict.state != verdict.state:
+                logger.info(
+                    f"Reachability: {verdict.state}"
+                    + (f" ({verdict.latency_ms:.0f} ms)" if verdict.latency_ms is not None else "")
+                )
+            self.last_verdict = verdict
+        return verdict
+
+    async def _run_probes(self) -> ReachabilityVerdict:
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(probe(target, self.probe_timeout) for target in self.targets)
+        )
+        verdict = combine(results, started)
+        logger.debug(
+            "Reachability probes: "
+            + ", ".join(
+                f"{r.target}={'ok' if r.ok else r.error}" for r in verdict.results
+            )
+        )
+        return verdict
+
+    # Event-driven refresh
+
+    def watch(self) -> bool:
+        """Re-probe on rtnetlink link/address/route changes in the background
+
+        Returns:
+            bool: False if rtnetlink is unavailable (verdicts then only
+            expire by TTL)
+        """
+        if self._watch_task is not None and not self._watch_task.done():
+            return True
+        try:
+            netlink.NetlinkSocket().close()
+        except netlink.NetlinkError as e:
+            logger.debug(f"Reachability watch unavailable: {e}")
+            return False
+        self._watch_task = asyncio.create_task(self._watch(netlink.events()))
+        return True
+
+    async def stop(self):
+        """Stop watching for network changes"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch(self, stream):
+        pending: Optional[asyncio.Task] = None
+        try:
+            async for event in stream:
+                self.invalidate()
+                if pending is not None:
+                    pending.cancel()
+                pending = asyncio.create_task(self._reprobe_after_settle(event))
+        except netlink.NetlinkError as e:
+            logger.warning(f"Reachability watch stopped, netlink unavailable: {e}")
+        finally:
+            if pending is not None:
+                pending.cancel()
+            await stream.aclose()
+
+    async def _reprobe_after_settle(self, event: netlink.NetlinkEvent):
+        await asyncio.sleep(EVENT_SETTLE)
+        logger.debug(f"Re-probing reachability after {event.kind} on {event.interface}")
+        await self.check(max_age=0)
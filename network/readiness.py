@@ -0,0 +1,128 @@
+"""
+Readiness Conditions and Phase Timing
+
+Helpers for waiting on a condition instead of sleeping for a fixed time.
+A condition is re-checked whenever NetworkManager reports a state change
+(or on a short poll when no event source is available), so a wait ends as
+soon as the state it waits for is reached and never later than its timeout.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from .nm_events import STATE_EVENT_KINDS, NMEventMonitor
+
+Check = Callable[[], Union[bool, Awaitable[bool]]]
+
+logger = logging.getLogger(__name__)
+
+
+async def _evaluate(check: Check) -> bool:
+    result = check()
+    if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+        result = await result
+    return bool(result)
+
+
+async def wait_until(
+    check: Check,
+    timeout: float,
+    events: Optional[NMEventMonitor] = None,
+    poll_interval: float = 0.5,
+    event_poll_interval: float = 5.0,
+) -> bool:
+    """Wait until check() is true
+
+    Args:
+        check: Sync or async callable returning truthy once ready
+        timeout: Maximum seconds to wait
+        events: Event monitor whose state changes trigger a re-check
+        poll_interval: Re-check interval without an event source
+        event_poll_interval: Re-check interval while events are flowing;
+            only a safety net for missed events, so kept long
+
+    Returns:
+        bool: True if the condition was met, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    use_events = events is not None and events.running
+    subscription = events.subscribe() if use_events else None
+    try:
+        while True:
+            # Subscribed before checking so a change in between is not lost
+            try:
+                if await _evaluate(check):
+                    return True
+            except Exception as e:
+                logger.debug(f"Readiness check failed, retrying: {e}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            if subscription is None or not events.running:
+                await asyncio.sleep(min(poll_interval, remaining))
+                continue
+
+            wait_end = time.monotonic() + min(event_poll_interval, remaining)
+            while True:
+                event = await subscription.get(max(wait_end - time.monotonic(), 0))
+                if event is None or event.kind in STATE_EVENT_KINDS:
+                    break
+    finally:
+        if subscription is not None:
+            subscription.close()
+
+
+class PhaseTimer:
+    """Records how long each named phase of an operation takes"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started_at = time.monotonic()
+        self.phases: List[Dict] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase
+
+        The block may set entry["ok"] (e.g. to a wait's result); it
+        defaults to True on normal exit and False if the block raised.
+        """
+        start = time.monotonic()
+        entry = {"phase": name, "ok": None}
+        try:
+            yield entry
+            if entry["ok"] is None:
+                entry["ok"] = True
+        except BaseException:
+            entry["ok"] = False
+            raise
+        finally:
+            entry["seconds"] = round(time.monotonic() - start, 3)
+            self.phases.append(entry)
+
+    def record(self, name: str, seconds: float, ok: bool = True):
+        """Add a phase that was timed elsewhere"""
+        self.phases.append({"phase": name, "ok": ok, "seconds": round(seconds, 3)})
+
+    @property
+    def total(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def summary(self) -> str:
+        parts = ", ".join(
+            f"{entry['phase']}={entry['seconds']:.2f}s{'' if entry['ok'] else '(!)'}"
+            for entry in self.phases
+        )
+        return f"{self.operation} {self.total:.2f}s: {parts}"
+
+    def as_dict(self) -> Dict:
+        return {
+            "operation": self.operation,
+            "total_seconds": round(self.total, 3),
+            "phases": list(self.phases),
+        }
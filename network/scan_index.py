@@ -0,0 +1,185 @@
+"""
+WiFi Scan Index
+
+In-memory index of the most recent WiFi scan, grouped by SSID. Each entry
+keeps the strongest BSSID's signal, band, channel and security plus every
+BSSID seen for that SSID. Readers get answers from memory; only the
+background scanner in WiFiManager refreshes it.
+
+Networks stay in the index for `retention` seconds after they were last
+seen, so scans that come back empty (e.g. while the radio is in AP mode)
+do not wipe out the snapshot taken before the hotspot came up.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+# NM80211ApFlags / NM80211ApSecurityFlags bits used to describe security
+AP_FLAGS_PRIVACY = 0x1
+AP_SEC_KEY_MGMT_PSK = 0x100
+AP_SEC_KEY_MGMT_802_1X = 0x200
+AP_SEC_KEY_MGMT_SAE = 0x400
+
+
+def frequency_to_channel(frequency: int) -> Optional[int]:
+    """Convert a centre frequency in MHz to a WiFi channel number"""
+    if frequency == 2484:
+        return 14
+    if 2412 <= frequency < 2484:
+        return (frequency - 2407) // 5
+    if 5150 <= frequency <= 5895:
+        return (frequency - 5000) // 5
+    if 5925 <= frequency <= 7125:
+        return (frequency - 5950) // 5
+    return None
+
+
+def frequency_to_band(frequency: int) -> Optional[str]:
+    """Return the band label for a frequency in MHz"""
+    if 2400 <= frequency < 2500:
+        return "2.4GHz"
+    if 5150 <= frequency <= 5895:
+        return "5GHz"
+    if 5925 <= frequency <= 7125:
+        return "6GHz"
+    return None
+
+
+def security_from_flags(flags: int, wpa_flags: int, rsn_flags: int) -> str:
+    """Describe AP security from NetworkManager flag words"""
+    if rsn_flags & AP_SEC_KEY_MGMT_SAE:
+        return "WPA3" if not rsn_flags & AP_SEC_KEY_MGMT_PSK else "WPA2/WPA3"
+    parts = []
+    if wpa_flags:
+        parts.append("WPA")
+    if rsn_flags:
+        parts.append("WPA2")
+    if (wpa_flags | rsn_flags) & AP_SEC_KEY_MGMT_802_1X:
+        parts.append("802.1X")
+    if not parts and flags & AP_FLAGS_PRIVACY:
+        parts.append("WEP")
+    return " ".join(parts)
+
+
+class ScanIndex:
+    """SSID-keyed view of the latest scan results"""
+
+    def __init__(self, retention: float = 300.0):
+        self.retention = retention
+        self._networks: Dict[str, dict] = {}
+        self._last_seen: Dict[str, float] = {}
+        self.hidden_seen_at: Optional[float] = None  # last hidden (SSID-less) BSSID
+        self.generation = 0
+        self.scanned_at: Optional[float] = None  # time.monotonic() of last update
+        self.scanned_at_wall: Optional[float] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the index was last refreshed, None if never"""
+        if self.scanned_at is None:
+            return None
+        return time.monotonic() - self.scanned_at
+
+    @property
+    def etag(self) -> str:
+        """Entity tag that changes only when the indexed content changes"""
+        return f'W/"scan-{self.generation}"'
+
+    def update(self, access_points: Iterable[dict]) -> bool:
+        """Merge a new scan into the index
+
+        Args:
+            access_points: Dicts with ssid, bssid, signal (0-100),
+                frequency (MHz), security and in_use
+
+        Returns:
+            bool: True if the indexed content changed
+        """
+        now = time.monotonic()
+        networks: Dict[str, dict] = {}
+        for ap in access_points:
+            ssid = ap.get("ssid")
+            if not ssid:
+                self.hidden_seen_at = now  # Hidden networks cannot be selected by name
+                continue
+
+            frequency = int(ap.get("frequency") or 0)
+            signal = int(ap.get("signal") or 0)
+            entry = networks.get(ssid)
+            if entry is None:
+                entry = networks[ssid] = {
+                    "ssid": ssid,
+                    "signal": -1,
+                    "bssids": [],
+                    "in_use": False,
+                }
+
+            if ap.get("bssid"):
+                entry["bssids"].append(ap["bssid"])
+            entry["in_use"] = entry["in_use"] or bool(ap.get("in_use"))
+
+            if signal > entry["signal"]:
+                entry.update(
+                    signal=signal,
+                    frequency=frequency,
+                    band=frequency_to_band(frequency),
+                    channel=frequency_to_channel(frequency),
+                    security=ap.get("security") or "",
+                )
+
+        for ssid, entry in networks.items():
+            entry["bssids"].sort()
+            self._last_seen[ssid] = now
+
+        # Keep recently seen networks that this scan missed
+        for ssid, entry in self._networks.items():
+            if ssid not in networks and now - self._last_seen.get(ssid, 0) < self.retention:
+                networks[ssid] = dict(entry, in_use=False)
+        for ssid in list(self._last_seen):
+            if ssid not in networks:
+                del self._last_seen[ssid]
+
+        self.scanned_at = now
+        self.scanned_at_wall = time.time()
+        if networks == self._networks:
+            return False
+
+        self._networks = networks
+        self.generation += 1
+        return True
+
+    @property
+    def has_hidden(self) -> bool:
+        """True if a hidden network was seen within the retention window"""
+        return (
+            self.hidden_seen_at is not None
+            and time.monotonic() - self.hidden_seen_at < self.retention
+        )
+
+    def last_seen_age(self, ssid: str) -> Optional[float]:
+        """Seconds since an SSID was last seen, None if not indexed"""
+        seen = self._last_seen.get(ssid)
+        return None if seen is None else time.monotonic() - seen
+
+    def get(self, ssid: str) -> Optional[dict]:
+        """Return the entry for an SSID, or None if it was not seen"""
+        entry = self._networks.get(ssid)
+        return dict(entry) if entry else None
+
+    def ssids(self) -> List[str]:
+        """All indexed SSIDs"""
+        return list(self._networks)
+
+    def __contains__(self, ssid: str) -> bool:
+        return ssid in self._networks
+
+    def __len__(self) -> int:
+        return len(self._networks)
+
+    def networks(self) -> List[dict]:
+        """All indexed networks, strongest first"""
+        return sorted(
+            (dict(entry) for entry in self._networks.values()),
+            key=lambda entry: entry["signal"],
+            reverse=True,
+        )
@@ -0,0 +1,85 @@
+"""
+Persistent State Store
+
+Keeps small JSON documents (hotspot profile fingerprint, network history)
+across service restarts. Writes are atomic so a power cut never leaves a
+half-written file behind.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# Tried in order; the first writable directory wins
+DEFAULT_STATE_DIRS = ["/var/lib/wifi-setup", "./.wifi-setup-state"]
+
+
+class StateStore:
+    """Named JSON documents in a state directory"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.directory = self._pick_directory(
+            directory or os.environ.get("WIFI_SETUP_STATE_DIR")
+        )
+
+    def _pick_directory(self, preferred: Optional[str]) -> Optional[Path]:
+        candidates = [preferred] if preferred else DEFAULT_STATE_DIRS
+        for candidate in candidates:
+            try:
+                path = Path(candidate)
+                path.mkdir(parents=True, exist_ok=True)
+                if os.access(path, os.W_OK):
+                    return path
+            except OSError:
+                continue
+
+        self.logger.warning("No writable state directory - state will not persist")
+        return None
+
+    def _path(self, name: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / f"{name}.json"
+
+    def load(self, name: str, default: Any = None) -> Any:
+        """Load a document, returning default if missing or unreadable"""
+        path = self._path(name)
+        if path is None or not path.exists():
+            return default
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable state file {path}: {e}")
+            return default
+
+    def save(self, name: str, data: Any) -> bool:
+        """Atomically write a document"""
+        path = self._path(name)
+        if path is None:
+            return False
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{name}.")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to write state file {path}: {e}")
+            return False
+
+    def delete(self, name: str):
+        """Remove a document if it exists"""
+        path = self._path(name)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning(f"Failed to remove state file {path}: {e}")
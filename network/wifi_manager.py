@@ -2,13 +2,88 @@
 WiFi Manager for Network Operations
 
 Handles WiFi network scanning, connection, and hotspot management
-using NetworkManager via nmcli commands.
+using NetworkManager. Talks to NetworkManager over a persistent D-Bus
+connection when available and falls back to nmcli commands otherwise.
 """
 
 import asyncio
+import difflib
+import functools
+import hashlib
+import json
 import logging
-from typing import Optional
-from dataclasses import dataclass
+import re
+import time
+import uuid as uuid_module
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+
+from .nm_dbus import (
+    DBUS_AVAILABLE,
+    NM_DEVICE_STATE_ACTIVATED,
+    NM_DEVICE_STATE_DEACTIVATING,
+    NM_DEVICE_STATE_DISCONNECTED,
+    NM_DEVICE_STATE_FAILED,
+    NM_DEVICE_STATE_REASON_NO_SECRETS,
+    NM_DEVICE_STATE_REASON_SSID_NOT_FOUND,
+    NM_DEVICE_STATE_REASON_SUPPLICANT_DISCONNECT,
+    NM_DEVICE_STATE_REASON_SUPPLICANT_TIMEOUT,
+    NMDBusClient,
+    NMDBusError,
+    decode_ssid,
+)
+from .nm_events import (
+    CONNECTION_ADDED,
+    CONNECTION_REMOVED,
+    DEVICE_STATE,
+    STATE_EVENT_KINDS,
+    NMEvent,
+    NMEventMonitor,
+)
+from . import linux_net
+from .connect_stages import ConnectHistory, ConnectStageTracker
+from .known_networks import KnownNetworkScorer, NetworkHistory, RankedNetwork
+from .link_quality import LinkQualitySampler
+from .nmcli import parse_device_show, query_active_wifi, run_nmcli, split_terse
+from .profile_index import ProfileIndex, SavedProfile
+from .reachability import ReachabilityProber
+from .readiness import PhaseTimer, wait_until
+from .scan_index import ScanIndex, security_from_flags
+from .state_store import StateStore
+
+HOTSPOT_ADDRESS = "192.168.4.1"
+HOTSPOT_PREFIX = 24
+
+# State document holding the hotspot profile fingerprint and UUID
+HOTSPOT_STATE = "hotspot-profile"
+
+# Upper bounds for the readiness waits in the connect path (seconds)
+HOTSPOT_RELEASE_TIMEOUT = 10.0
+DEVICE_IDLE_TIMEOUT = 10.0
+IP_CONFIG_TIMEOUT = 20.0
+
+# Reload interval for the saved profile index when no NM events are available
+PROFILE_INDEX_TTL = 60.0
+
+# After an unexpected disconnect, time NetworkManager gets to reconnect on
+# its own before the best known network is selected
+AUTO_SELECT_GRACE = 5.0
+
+
+def _device_left_ap(state: Optional[int]) -> bool:
+    """The radio has dropped the hotspot and is free for a new connection"""
+    return state is not None and state not in (
+        NM_DEVICE_STATE_ACTIVATED,
+        NM_DEVICE_STATE_DEACTIVATING,
+    )
+
+
+def _device_idle(state: Optional[int]) -> bool:
+    """No activation or deactivation is in progress on the device"""
+    return state is not None and (
+        state <= NM_DEVICE_STATE_DISCONNECTED
+        or state in (NM_DEVICE_STATE_ACTIVATED, NM_DEVICE_STATE_FAILED)
+    )
 
 
 @dataclass
@@ -32,78 +107,262 @@ class ConnectionStatus:
     ip_address: Optional[str] = None
 
 
+@dataclass
+class NetworkPrecheck:
+    """Outcome of checking an SSID against the scan index before connecting"""
+
+    ssid: str
+    proceed: bool
+    found: Optional[bool]  # None when the snapshot cannot tell
+    reason: str
+    snapshot_age: Optional[float] = None
+    elapsed_ms: float = 0.0
+    suggestions: List[str] = field(default_factory=list)
+
+
 class WiFiManagerError(Exception):
     """WiFi Manager specific exceptions"""
 
     pass
 
 
+def _invalidates_status(method):
+    """Mark an operation that changes connection state
+
+    The cached connection status is dropped before and after the call so
+    no caller sees a result from before the change.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        self.invalidate_status_cache()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self.invalidate_status_cache()
+
+    return wrapper
+
+
 class WiFiManager:
     """Professional WiFi management using NetworkManager"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        use_dbus: bool = True,
+        dbus_address: Optional[str] = None,
+        status_ttl: float = 2.0,
+        state_dir: Optional[str] = None,
+        scan_interval: float = 30.0,
+        scan_min_interval: float = 10.0,
+    ):
         self.logger = logging.getLogger(__name__)
+        self._state = StateStore(state_dir)
         self._hotspot_active = False
         self._hotspot_connection_name = "wifi-setup-hotspot"
+        self._hotspot_uuid: Optional[str] = None
         self.hotspot_ssid = None
         self.hotspot_password = None
 
-    async def get_connection_status(self) -> ConnectionStatus:
-        """Get current WiFi connection status"""
-        try:
-            cmd = [
-                "nmcli",
-                "-t",
-                "-f",
-                "TYPE,DEVICE,STATE,NAME",
-                "connection",
-                "show",
-                "--active",
-            ]
-
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
+        # Connection status cache shared by all callers
+        self.status_ttl = status_ttl
+        self._status_cache: Optional[ConnectionStatus] = None
+        self._status_cached_at = 0.0
+        self._status_inflight: Optional[asyncio.Future] = None
+        self._status_generation = 0
+        self._status_stats = {"hits": 0, "misses": 0, "shared": 0, "invalidations": 0}
+
+        # Background-refreshed scan results, grouped by SSID
+        self.scan_index = ScanIndex()
+        self.scan_interval = scan_interval
+        self.scan_min_interval = scan_min_interval
+        self._last_rescan = 0.0
+        self._scan_task: Optional[asyncio.Task] = None
+        self._scan_lock: Optional[asyncio.Lock] = None
+        self._connecting = False
+        self.last_precheck: Optional[NetworkPrecheck] = None
+        self.last_connect_timings: Optional[Dict] = None
+        self._connect_path: Optional[str] = None
+        # Per-attempt association/auth/DHCP/route timings, kept across restarts
+        self.connect_history = ConnectHistory(self._state)
+
+        # Decaying per-SSID history used to choose between saved networks
+        self.network_history = NetworkHistory(self._state)
+        self.network_scorer = KnownNetworkScorer(self.network_history)
+        self._auto_select_task: Optional[asyncio.Task] = None
+
+        # Saved WiFi profiles for direct reconnection to known networks
+        self.profiles = ProfileIndex(self._state)
+        self._profiles_lock: Optional[asyncio.Lock] = None
+
+        # Smoothed client link statistics (started by whoever needs them)
+        self.link_quality = LinkQualitySampler()
+
+        # Cached internet reachability verdicts (DNS/TCP/HTTP probes)
+        self.reachability = ReachabilityProber()
+
+        # Persistent NetworkManager D-Bus client (nmcli is used as fallback)
+        self._nm: Optional[NMDBusClient] = None
+        if use_dbus and DBUS_AVAILABLE:
+            self._nm = NMDBusClient(bus_address=dbus_address)
+        elif use_dbus:
+            self.logger.info("dbus-next not available - using nmcli backend")
+
+        # Shared stream of NetworkManager state changes
+        self.events = NMEventMonitor(self._nm)
+        self.events.add_listener(self._on_nm_event)
+
+    def _on_nm_event(self, event: NMEvent):
+        """Drop cached status, reachability and profiles when NetworkManager reports changes"""
+        if event.kind in STATE_EVENT_KINDS:
+            self.invalidate_status_cache()
+            self.reachability.invalidate()
+        elif event.kind in (CONNECTION_ADDED, CONNECTION_REMOVED):
+            self.profiles.invalidate()
+
+    async def _get_nm(self) -> Optional[NMDBusClient]:
+        """Return a connected D-Bus client, or None to use nmcli"""
+        if self._nm is None:
+            return None
+        if await self._nm.connect():
+            return self._nm
+        return None
 
-            stdout, stderr = await process.communicate()
+    @property
+    def backend(self) -> str:
+        """Name of the backend currently serving requests"""
+        return "dbus" if self._nm is not None and self._nm.connected else "nmcli"
 
-            self.logger.debug(f"nmcli active connections output: {stdout.decode()}")
+    async def get_event_monitor(self) -> Optional[NMEventMonitor]:
+        """Return the running event monitor, starting it on first use
 
-            if process.returncode != 0:
-                self.logger.debug(f"nmcli error: {stderr.decode()}")
-                return ConnectionStatus(connected=False)
+        Returns:
+            The monitor, or None if no event source is available (poll instead)
+        """
+        if await self.events.start():
+            return self.events
+        return None
+
+    async def close(self):
+        """Stop background work and release the D-Bus connection"""
+        await self.stop_background_scan()
+        await self.stop_auto_select()
+        await self.link_quality.stop()
+        await self.reachability.stop()
+        await self.events.stop()
+        if self._nm is not None:
+            await self._nm.close()
+
+    def invalidate_status_cache(self):
+        """Forget the cached status and detach any in-flight query"""
+        self._status_generation += 1
+        self._status_cache = None
+        self._status_inflight = None
+        self._status_stats["invalidations"] += 1
+
+    def status_cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters for the connection status cache"""
+        stats = dict(self._status_stats)
+        lookups = stats["hits"] + stats["misses"] + stats["shared"]
+        stats["hit_ratio"] = (
+            (stats["hits"] + stats["shared"]) / lookups if lookups else 0.0
+        )
+        stats["ttl"] = self.status_ttl
+        return stats
+
+    async def get_connection_status(
+        self, max_age: Optional[float] = None
+    ) -> ConnectionStatus:
+        """Get current WiFi connection status
+
+        Results are cached for status_ttl seconds and concurrent callers
+        share a single in-flight query.
 
-            # Parse active connections
-            for line in stdout.decode().strip().split("\n"):
-                if not line:
-                    continue
+        Args:
+            max_age: Override the cache TTL for this call (0 forces a query)
+        """
+        ttl = self.status_ttl if max_age is None else max_age
+        if (
+            self._status_cache is not None
+            and time.monotonic() - self._status_cached_at < ttl
+        ):
+            self._status_stats["hits"] += 1
+            return self._status_cache
+
+        inflight = self._status_inflight
+        if inflight is not None and ttl > 0:
+            self._status_stats["shared"] += 1
+            return await asyncio.shield(inflight)
+
+        self._status_stats["misses"] += 1
+        generation = self._status_generation
+        inflight = asyncio.ensure_future(self._query_connection_status())
+        self._status_inflight = inflight
+        try:
+            status = await asyncio.shield(inflight)
+        finally:
+            if self._status_inflight is inflight:
+                self._status_inflight = None
+
+        # Only cache if nothing changed state while the query ran
+        if generation == self._status_generation:
+            self._status_cache = status
+            self._status_cached_at = time.monotonic()
+        return status
+
+    def is_hotspot(self, status: ConnectionStatus) -> bool:
+        """Whether a connection status describes our own setup hotspot
+
+        The status SSID falls back to the connection name when the backend
+        does not report one for access-point mode.
+        """
+        return status.connected and status.ssid in (
+            self.hotspot_ssid,
+            self._hotspot_connection_name,
+        )
+
+    async def _query_connection_status(self) -> ConnectionStatus:
+        """Query NetworkManager for the current connection status"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                return await self._get_connection_status_dbus(nm)
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus status query failed, using nmcli: {e}")
+
+        return await self._get_connection_status_nmcli()
+
+    async def _get_connection_status_dbus(self, nm: NMDBusClient) -> ConnectionStatus:
+        """Get connection status from NetworkManager over D-Bus"""
+        active = await nm.get_active_wifi()
+        if not active:
+            return ConnectionStatus(connected=False)
 
-                parts = line.split(":")
-                self.logger.debug(f"Connection line parts: {parts}")
+        self.logger.debug(f"Found activated WiFi over D-Bus: {active}")
 
-                if len(parts) >= 4 and parts[0] == "802-11-wireless":
-                    device = parts[1]
-                    state = parts[2]
-                    connection = parts[3]
+        return ConnectionStatus(
+            connected=True,
+            ssid=active["ssid"] or active["connection_id"],
+            interface=active["interface"],
+            ip_address=active["ip_address"],
+        )
 
-                    if state == "activated":
-                        # Get the actual SSID from the device info
-                        actual_ssid = await self._get_device_ssid(device)
-                        # Get IP address
-                        ip_address = await self._get_device_ip(device)
+    async def _get_connection_status_nmcli(self) -> ConnectionStatus:
+        """Get connection status from a single terse nmcli device query"""
+        try:
+            active = await query_active_wifi()
 
-                        self.logger.debug(
-                            f"Found activated WiFi: device={device}, connection={connection}, actual_ssid={actual_ssid}, ip={ip_address}"
-                        )
+            if not active:
+                return ConnectionStatus(connected=False)
 
-                        return ConnectionStatus(
-                            connected=True,
-                            ssid=actual_ssid if actual_ssid else connection,
-                            interface=device,
-                            ip_address=ip_address,
-                        )
+            self.logger.debug(f"Found activated WiFi via nmcli: {active}")
 
-            return ConnectionStatus(connected=False)
+            return ConnectionStatus(
+                connected=True,
+                ssid=active["ssid"] or active["connection_id"],
+                interface=active["interface"],
+                ip_address=active["ip_address"],
+            )
 
         except Exception as e:
             self.logger.error(f"Status check error: {e}")
@@ -114,6 +373,29 @@ class WiFiManager:
     ) -> bool:
         """Connect to a WiFi network with optional password
 
+        See _connect_to_network for details. Background rescans are held
+        off while the attempt runs so they do not disturb association.
+        The duration of each phase is logged and kept in
+        last_connect_timings.
+        """
+        self._connecting = True
+        timer = PhaseTimer(f"connect to {ssid}")
+        try:
+            return await self._connect_to_network(ssid, password, max_retries, timer)
+        finally:
+            self._connecting = False
+            self.last_connect_timings = timer.as_dict()
+            self.logger.info(f"Connect timings - {timer.summary()}")
+
+    async def _connect_to_network(
+        self,
+        ssid: str,
+        password: str = "",
+        max_retries: int = 3,
+        timer: Optional[PhaseTimer] = None,
+    ) -> bool:
+        """Connect to a WiFi network with optional password
+
         For single-band devices, checks network availability before hotspot disruption,
         then performs connection with hotspot management and proper error handling.
 
@@ -121,11 +403,13 @@ class WiFiManager:
             ssid: Network SSID to connect to
             password: Network password (empty for open networks)
             max_retries: Maximum number of connection attempts (default: 3)
+            timer: Records the duration of each phase
 
         Returns:
             bool: True if connection successful, False otherwise
         """
         last_exception = None
+        timer = timer or PhaseTimer(f"connect to {ssid}")
 
         # If hotspot is active, first check if network exists before stopping hotspot
         if self._hotspot_active:
@@ -133,12 +417,14 @@ class WiFiManager:
                 f"Checking network availability for {ssid} before stopping hotspot"
             )
 
-            # Quick check if network exists without disrupting hotspot
-            # if not await self._network_exists(ssid):
-            #     raise WiFiManagerError(f"Network '{ssid}' not found. Please check the network name and ensure it's available.")
-            #
-            # self.logger.info(f"Network {ssid} found, proceeding with connection attempt")
-            return await self._connect_with_hotspot_management(ssid, password)
+            # Quick check against the scan snapshot without disrupting hotspot
+            with timer.phase("precheck") as phase:
+                precheck = await self.precheck_network(ssid)
+                phase["ok"] = precheck.proceed
+            if not precheck.proceed:
+                raise WiFiManagerError(precheck.reason)
+
+            return await self._connect_with_hotspot_management(ssid, password, timer)
         else:
             # No hotspot active, use normal retry logic
             for attempt in range(1, max_retries + 1):
@@ -146,7 +432,7 @@ class WiFiManager:
                     self.logger.info(
                         f"Attempting to connect to network: {ssid} (attempt {attempt}/{max_retries})"
                     )
-                    success = await self._perform_network_connection(ssid, password)
+                    success = await self._attempt_connection(ssid, password, timer, attempt)
 
                     if success:
                         self.logger.info(
@@ -164,11 +450,13 @@ class WiFiManager:
                         f"Connection attempt {attempt} failed with error: {e}"
                     )
 
-                # Add delay between retries (except for the last attempt)
+                # Between retries wait for the device to settle (except after the last attempt)
                 if attempt < max_retries:
-                    retry_delay = 2 + attempt  # Progressive delay: 3s, 4s, 5s
-                    self.logger.info(f"Waiting {retry_delay} seconds before retry...")
-                    await asyncio.sleep(retry_delay)
+                    settle_timeout = 2 + attempt  # Upper bound: 3s, 4s, 5s
+                    with timer.phase(f"settle #{attempt}") as phase:
+                        phase["ok"] = await self._wait_for_device_state(
+                            _device_idle, settle_timeout, "device to settle"
+                        )
 
             # All attempts exhausted
             error_msg = f"Failed to connect to {ssid} after {max_retries} attempts"
@@ -178,12 +466,72 @@ class WiFiManager:
             self.logger.error(error_msg)
             raise WiFiManagerError(error_msg)
 
+    async def _attempt_connection(
+        self, ssid: str, password: str, timer: PhaseTimer, attempt: int = 1
+    ) -> bool:
+        """One connection attempt, timed as activation plus IP configuration
+
+        The NM device states and kernel address/route events seen meanwhile
+        split the attempt into stages (see connect_stages), which are
+        logged and added to connect_history.
+        """
+        start = time.monotonic()
+        self._connect_path = None
+        tracker = ConnectStageTracker(ssid, attempt, await self.get_event_monitor())
+        await tracker.start()
+        success = False
+        try:
+            try:
+                with timer.phase(f"activate #{attempt}") as phase:
+                    try:
+                        success = await self._perform_network_connection(ssid, password)
+                    finally:
+                        phase["path"] = self._connect_path
+                    phase["ok"] = success
+            except WiFiManagerError:
+                self._record_connect_failure(ssid)
+                raise
+            if not success:
+                self._record_connect_failure(ssid)
+                return False
+
+            with timer.phase("ip_config") as phase:
+                phase["ok"] = await self._wait_for_ip_address(IP_CONFIG_TIMEOUT)
+        finally:
+            await self._finish_stage_tracking(tracker, success)
+
+        if self._connect_path == "new-profile":
+            self.profiles.invalidate()  # pick up the profile just created
+        await self._ensure_profiles()
+        self.profiles.record_success(ssid, time.monotonic() - start, password)
+        return True
+
+    async def _finish_stage_tracking(self, tracker: ConnectStageTracker, success: bool):
+        record = await tracker.finish(success, self._connect_path)
+        self.connect_history.add(record)
+        milestones = record.milestones
+        self.network_history.record_attempt(
+            record.ssid, success, milestones.get("address", milestones.get("activated"))
+        )
+        stages = ", ".join(
+            f"{stage}={seconds:.2f}s" for stage, seconds in record.stages.items() if seconds is not None
+        )
+        self.logger.info(
+            f"Connect stages for {record.ssid} #{record.attempt} "
+            f"({'ok' if success else 'failed'}): {stages or 'not observed'}"
+        )
+
+    def _record_connect_failure(self, ssid: str):
+        if self._connect_path == "saved-profile":
+            self.profiles.record_failure(ssid)
+
     async def _connect_with_hotspot_management(
-        self, ssid: str, password: str = ""
+        self, ssid: str, password: str = "", timer: Optional[PhaseTimer] = None
     ) -> bool:
         """Perform network connection with hotspot stop-connect-handle sequence for single-band devices"""
         hotspot_ssid = None
         hotspot_password = None
+        timer = timer or PhaseTimer(f"connect to {ssid}")
 
         try:
             # Store hotspot configuration before stopping
@@ -191,10 +539,14 @@ class WiFiManager:
             hotspot_password = self.hotspot_password
 
             self.logger.info("Stopping hotspot for network connection")
-            await self.stop_hotspot()
-            await asyncio.sleep(3)
+            with timer.phase("stop_hotspot"):
+                await self.stop_hotspot()
+            with timer.phase("radio_released") as phase:
+                phase["ok"] = await self._wait_for_device_state(
+                    _device_left_ap, HOTSPOT_RELEASE_TIMEOUT, "hotspot to go down"
+                )
 
-            success = await self._perform_network_connection(ssid, password)
+            success = await self._attempt_connection(ssid, password, timer)
 
             if success:
                 self.logger.info(f"Connected to {ssid}")
@@ -202,9 +554,7 @@ class WiFiManager:
             else:
                 self.logger.warning(f"Connection to {ssid} failed, restoring hotspot")
                 if hotspot_ssid and hotspot_password:
-                    await asyncio.sleep(1)
-                    await self.start_hotspot(hotspot_ssid, hotspot_password)
-                    self.logger.info("Hotspot restored")
+                    await self._restore_hotspot(hotspot_ssid, hotspot_password, timer)
                 return False
 
         except WiFiManagerError as e:
@@ -214,8 +564,7 @@ class WiFiManager:
             # Restore hotspot
             if hotspot_ssid and hotspot_password:
                 try:
-                    await self.start_hotspot(hotspot_ssid, hotspot_password)
-                    self.logger.info("Hotspot restored")
+                    await self._restore_hotspot(hotspot_ssid, hotspot_password, timer)
                 except Exception as restore_error:
                     self.logger.error(f"Failed to restore hotspot: {restore_error}")
 
@@ -228,8 +577,7 @@ class WiFiManager:
 
             if hotspot_ssid and hotspot_password:
                 try:
-                    await self.start_hotspot(hotspot_ssid, hotspot_password)
-                    self.logger.info("Hotspot restored")
+                    await self._restore_hotspot(hotspot_ssid, hotspot_password, timer)
                 except Exception as restore_error:
                     self.logger.error(f"Failed to restore hotspot: {restore_error}")
 
@@ -237,8 +585,163 @@ class WiFiManager:
                 f"Network connection with hotspot management failed: {e}"
             )
 
+    async def _restore_hotspot(self, ssid: str, password: str, timer: PhaseTimer):
+        """Bring the hotspot back once the failed attempt has wound down"""
+        with timer.phase("device_idle") as phase:
+            phase["ok"] = await self._wait_for_device_state(
+                _device_idle, DEVICE_IDLE_TIMEOUT, "device to become idle"
+            )
+        with timer.phase("restore_hotspot"):
+            await self.start_hotspot(ssid, password)
+        self.logger.info("Hotspot restored")
+
+    async def _wifi_device_state(self) -> Optional[int]:
+        """Current NetworkManager state of the WiFi device"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                device = await nm.get_wifi_device()
+                return device.get("State")
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus device state failed, using nmcli: {e}")
+
+        returncode, stdout, _ = await run_nmcli(
+            "-t", "-f", "GENERAL.DEVICE,GENERAL.TYPE,GENERAL.STATE", "device", "show"
+        )
+        if returncode != 0:
+            return None
+        for device in parse_device_show(stdout):
+            if device["type"] == "wifi":
+                return device["state"]
+        return None
+
+    async def _wait_for_device_state(
+        self, accept: Callable[[Optional[int]], bool], timeout: float, what: str
+    ) -> bool:
+        """Wait until the WiFi device state satisfies accept, re-checking on NM events"""
+
+        async def check():
+            return accept(await self._wifi_device_state())
+
+        events = await self.get_event_monitor()
+        if await wait_until(check, timeout, events):
+            return True
+        self.logger.warning(f"Timed out after {timeout:.0f}s waiting for {what}")
+        return False
+
+    async def _wait_for_ip_address(self, timeout: float) -> bool:
+        """Wait until the active WiFi connection has an IPv4 address"""
+
+        async def check():
+            status = await self._query_connection_status()
+            return status.connected and bool(status.ip_address)
+
+        events = await self.get_event_monitor()
+        if await wait_until(check, timeout, events):
+            return True
+        self.logger.warning(f"No IPv4 address after {timeout:.0f}s")
+        return False
+
+    async def get_settled_status(self, timeout: float) -> ConnectionStatus:
+        """Connection status once no activation is in progress
+
+        At boot NetworkManager may still be autoconnecting; waiting for the
+        device to go idle tells "not connected yet" from "not connecting".
+        """
+        await self._wait_for_device_state(_device_idle, timeout, "WiFi device to settle")
+        return await self.get_connection_status(max_age=0)
+
+    @_invalidates_status
     async def _perform_network_connection(self, ssid: str, password: str = "") -> bool:
-        """Perform the actual network connection operation using --ask for reliable authentication"""
+        """Perform the actual network connection operation
+
+        Known networks are reconnected by activating their saved profile;
+        a new profile (with a scan) is created only when none matches.
+        """
+        profile = await self._saved_profile_for(ssid, password)
+        if profile is not None:
+            self._connect_path = "saved-profile"
+            activated = await self._activate_saved_profile(profile, password)
+            if activated is not None:
+                return activated
+            # Profile disappeared since the index was loaded
+            self.profiles.invalidate()
+
+        self._connect_path = "new-profile"
+        nm = await self._get_nm()
+        if nm:
+            try:
+                return await self._perform_network_connection_dbus(nm, ssid, password)
+            except NMDBusError as e:
+                self.logger.warning(f"D-Bus connect failed, retrying with nmcli: {e}")
+
+        return await self._perform_network_connection_nmcli(ssid, password)
+
+    async def _perform_network_connection_dbus(
+        self, nm: NMDBusClient, ssid: str, password: str = ""
+    ) -> bool:
+        """Create and activate a WiFi profile with a single D-Bus call"""
+        device = await nm.get_wifi_device()
+        device_path = device["Path"]
+
+        access_points = await nm.get_access_points(device_path)
+        matching = [ap for ap in access_points if ap["SsidText"] == ssid]
+        if not matching:
+            raise WiFiManagerError(
+                f"Network '{ssid}' not found. Please check the network name and ensure it's available."
+            )
+        best_ap = max(matching, key=lambda ap: ap.get("Strength", 0))
+
+        settings = {
+            "connection": {"id": ssid, "type": "802-11-wireless"},
+            "802-11-wireless": {"ssid": ssid.encode(), "mode": "infrastructure"},
+        }
+        if password:
+            settings["802-11-wireless-security"] = {
+                "key-mgmt": "wpa-psk",
+                "psk": password,
+            }
+
+        connection_path, active_path = await nm.add_and_activate(
+            settings, device_path, best_ap["Path"]
+        )
+        activated, reason = await nm.wait_for_activation(active_path, device_path)
+        if activated:
+            return True
+
+        # Do not leave a broken profile behind
+        try:
+            await nm.delete_connection(connection_path)
+        except NMDBusError:
+            pass
+
+        raise self._activation_error(ssid, password, reason)
+
+    @staticmethod
+    def _activation_error(ssid: str, password: str, reason: int) -> WiFiManagerError:
+        """Map a device state reason from a failed activation to a user-facing error"""
+        if reason == NM_DEVICE_STATE_REASON_SSID_NOT_FOUND:
+            return WiFiManagerError(
+                f"Network '{ssid}' not found. Please check the network name and ensure it's available."
+            )
+        if reason == NM_DEVICE_STATE_REASON_NO_SECRETS and not password:
+            return WiFiManagerError(
+                f"Network '{ssid}' requires a password. Please provide the password."
+            )
+        if reason in (
+            NM_DEVICE_STATE_REASON_NO_SECRETS,
+            NM_DEVICE_STATE_REASON_SUPPLICANT_DISCONNECT,
+            NM_DEVICE_STATE_REASON_SUPPLICANT_TIMEOUT,
+        ):
+            return WiFiManagerError(
+                f"Authentication failed for '{ssid}'. Please check the password."
+            )
+        return WiFiManagerError(f"Connection failed (device state reason {reason})")
+
+    async def _perform_network_connection_nmcli(
+        self, ssid: str, password: str = ""
+    ) -> bool:
+        """Perform the connection with nmcli using --ask for reliable authentication"""
         try:
             if password:
                 cmd = ["nmcli", "--ask", "dev", "wifi", "connect", ssid]
@@ -262,35 +765,194 @@ class WiFiManager:
             if process.returncode == 0:
                 return True
 
-            error_msg = stderr.decode().strip()
-
-            if "No network with SSID" in error_msg:
-                raise WiFiManagerError(
-                    f"Network '{ssid}' not found. Please check the network name and ensure it's available."
-                )
-            elif "Secrets were required" in error_msg and not password:
-                raise WiFiManagerError(
-                    f"Network '{ssid}' requires a password. Please provide the password."
-                )
-            elif password and (
-                "password" in error_msg.lower()
-                or "authentication" in error_msg.lower()
-                or "psk" in error_msg.lower()
-                or "key-mgmt" in error_msg.lower()
-            ):
-                raise WiFiManagerError(
-                    f"Authentication failed for '{ssid}'. Please check the password."
-                )
-            else:
-                raise WiFiManagerError(f"Connection failed: {error_msg}")
+            raise self._nmcli_connect_error(ssid, password, stderr.decode().strip())
 
         except Exception as e:
             if isinstance(e, WiFiManagerError):
                 raise
             raise WiFiManagerError(f"Network connection failed: {str(e)}")
 
+    @staticmethod
+    def _nmcli_connect_error(ssid: str, password: str, error_msg: str) -> WiFiManagerError:
+        """Map nmcli connect/up error output to a user-facing error"""
+        if "No network with SSID" in error_msg:
+            return WiFiManagerError(
+                f"Network '{ssid}' not found. Please check the network name and ensure it's available."
+            )
+        elif "Secrets were required" in error_msg and not password:
+            return WiFiManagerError(
+                f"Network '{ssid}' requires a password. Please provide the password."
+            )
+        elif password and (
+            "password" in error_msg.lower()
+            or "authentication" in error_msg.lower()
+            or "psk" in error_msg.lower()
+            or "key-mgmt" in error_msg.lower()
+        ):
+            return WiFiManagerError(
+                f"Authentication failed for '{ssid}'. Please check the password."
+            )
+        else:
+            return WiFiManagerError(f"Connection failed: {error_msg}")
+
+    async def _saved_profile_for(self, ssid: str, password: str) -> Optional[SavedProfile]:
+        """Return the saved profile to activate for ssid, or None to create one
+
+        A profile with a password is only reused when the given password
+        is empty or the one last used successfully with it.
+        """
+        await self._ensure_profiles()
+        profile = self.profiles.lookup(ssid)
+        if profile is None:
+            return None
+        if password and not self.profiles.secret_matches(profile, password):
+            self.logger.info(
+                f"Saved profile for {ssid} has a different password - creating a new profile"
+            )
+            return None
+        self.logger.info(f"Reconnecting to {ssid} with saved profile {profile.uuid}")
+        return profile
+
+    async def _activate_saved_profile(
+        self, profile: SavedProfile, password: str = ""
+    ) -> Optional[bool]:
+        """Activate a saved profile directly
+
+        Returns:
+            True once activated, or None if the profile no longer exists
+
+        Raises:
+            WiFiManagerError: if activation failed
+        """
+        nm = await self._get_nm()
+        if nm:
+            try:
+                try:
+                    connection_path = await nm.get_connection_by_uuid(profile.uuid)
+                except NMDBusError:
+                    return None
+                device = await nm.get_wifi_device()
+                active_path = await nm.activate_connection(connection_path, device["Path"])
+                activated, reason = await nm.wait_for_activation(active_path, device["Path"])
+                if activated:
+                    return True
+                raise self._activation_error(profile.ssid, password, reason)
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus profile activation failed, using nmcli: {e}")
+
+        returncode, _, stderr = await run_nmcli("connection", "up", profile.uuid)
+        if returncode == 0:
+            return True
+        if "unknown connection" in stderr.lower():
+            return None
+        raise self._nmcli_connect_error(profile.ssid, password, stderr.strip())
+
+    async def _ensure_profiles(self):
+        """Reload the saved profile index if it may be out of date
+
+        Profile added/removed events mark the index stale; without an
+        event source it is also reloaded once it is PROFILE_INDEX_TTL old.
+        """
+        if self._profiles_lock is None:
+            self._profiles_lock = asyncio.Lock()
+
+        have_events = await self.get_event_monitor() is not None
+        async with self._profiles_lock:
+            index = self.profiles
+            if not index.stale and (
+                have_events or time.monotonic() - index.loaded_at < PROFILE_INDEX_TTL
+            ):
+                return
+            try:
+                index.replace(await self._read_saved_profiles())
+                self.logger.debug(f"Saved profile index loaded: {len(index)} profiles")
+            except Exception as e:
+                self.logger.warning(f"Could not load saved profiles: {e}")
+
+    async def _read_saved_profiles(self) -> List[dict]:
+        """List saved WiFi client profiles (the hotspot profile is excluded)"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                profiles = []
+                for _, settings in await nm.list_connections():
+                    connection = settings.get("connection", {})
+                    wireless = settings.get("802-11-wireless", {})
+                    if connection.get("type") != "802-11-wireless":
+                        continue
+                    if wireless.get("mode") == "ap":
+                        continue
+                    profiles.append(
+                        {
+                            "ssid": decode_ssid(wireless.get("ssid")),
+                            "uuid": connection.get("uuid"),
+                            "connection_id": connection.get("id"),
+                            "timestamp": connection.get("timestamp", 0),
+                        }
+                    )
+                return profiles
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus profile listing failed, using nmcli: {e}")
+
+        returncode, stdout, stderr = await run_nmcli(
+            "-t", "-f", "NAME,UUID,TYPE,TIMESTAMP", "connection", "show"
+        )
+        if returncode != 0:
+            raise WiFiManagerError(f"Listing connections failed: {stderr.strip()}")
+
+        candidates = []
+        for line in stdout.splitlines():
+            fields = split_terse(line)
+            if len(fields) >= 4 and fields[2] == "802-11-wireless":
+                candidates.append(fields)
+
+        async def describe(fields):
+            name, uuid, _, timestamp = fields[:4]
+            returncode, stdout, _ = await run_nmcli(
+                "-t", "-f", "802-11-wireless.ssid,802-11-wireless.mode",
+                "connection", "show", uuid,
+            )
+            if returncode != 0:
+                return None
+            values = dict(
+                split_terse(line, maxsplit=1) for line in stdout.splitlines() if ":" in line
+            )
+            if values.get("802-11-wireless.mode") == "ap":
+                return None
+            return {
+                "ssid": values.get("802-11-wireless.ssid"),
+                "uuid": uuid,
+                "connection_id": name,
+                "timestamp": int(timestamp) if timestamp.isdigit() else 0,
+            }
+
+        described = await asyncio.gather(*(describe(fields) for fields in candidates))
+        return [profile for profile in described if profile]
+
+    async def get_saved_profiles(self) -> List[dict]:
+        """Saved WiFi profiles with their connection history"""
+        await self._ensure_profiles()
+        return self.profiles.profiles()
+
+    @_invalidates_status
     async def forget_network(self, ssid: str) -> bool:
         """Forget a saved WiFi network"""
+        self.profiles.invalidate()
+        self.network_history.forget(ssid)
+        nm = await self._get_nm()
+        if nm:
+            try:
+                paths = await nm.find_connections(ssid)
+                for path in paths:
+                    await nm.delete_connection(path)
+                if paths:
+                    self.logger.info(f"Successfully forgot network: {ssid}")
+                    return True
+                self.logger.warning(f"Failed to forget network {ssid} (may not exist)")
+                return False
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus forget failed, using nmcli: {e}")
+
         try:
             cmd = ["nmcli", "connection", "delete", ssid]
 
@@ -311,8 +973,14 @@ class WiFiManager:
             self.logger.error(f"Forget network error: {e}")
             return False
 
+    @_invalidates_status
     async def start_hotspot(self, ssid: str, password: str) -> bool:
-        """Start WiFi hotspot"""
+        """Start WiFi hotspot
+
+        The hotspot profile is provisioned once and kept across runs; a
+        fingerprint of its settings decides whether it must be rebuilt.
+        Starting the hotspot is then a single activation.
+        """
         try:
             if self._hotspot_active:
                 await self.stop_hotspot()
@@ -321,126 +989,202 @@ class WiFiManager:
             self.hotspot_ssid = ssid
             self.hotspot_password = password
 
-            self.logger.info(f"Starting hotspot: {ssid}")
+            # The radio cannot scan once it is an access point, so capture
+            # what is visible now for the connect precheck
+            await self._snapshot_scan()
 
-            # Create hotspot connection
-            cmd = [
-                "nmcli",
-                "connection",
-                "add",
-                "type",
-                "wifi",
-                "ifname",
-                "*",
-                "con-name",
-                self._hotspot_connection_name,
-                "autoconnect",
-                "no",
-                "ssid",
-                ssid,
-            ]
-
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            self.logger.info(f"Starting hotspot: {ssid}")
+            start_time = time.monotonic()
+
+            provisioned = await self._ensure_hotspot_profile(ssid, password)
+            try:
+                await self._activate_hotspot_profile()
+            except WiFiManagerError as e:
+                if provisioned:
+                    raise
+                # Profile was edited or removed behind our back - rebuild once
+                self.logger.warning(f"Saved hotspot profile failed ({e}), re-provisioning")
+                await self._ensure_hotspot_profile(ssid, password, force=True)
+                await self._activate_hotspot_profile()
+
+            self._hotspot_active = True
+            self.logger.info(
+                f"Hotspot '{ssid}' started successfully in {time.monotonic() - start_time:.2f}s"
             )
+            return True
 
-            await process.communicate()
-
-            if process.returncode != 0:
-                raise WiFiManagerError("Failed to create hotspot connection")
+        except Exception as e:
+            self.logger.error(f"Hotspot start error: {e}")
+            await self._cleanup_hotspot_connection()
+            raise WiFiManagerError(f"Failed to start hotspot: {e}")
 
-            # Configure hotspot settings
-            cmds = [
-                [
-                    "nmcli",
-                    "connection",
-                    "modify",
-                    self._hotspot_connection_name,
-                    "802-11-wireless.mode",
-                    "ap",
-                ],
-                [
-                    "nmcli",
-                    "connection",
-                    "modify",
-                    self._hotspot_connection_name,
-                    "802-11-wireless-security.key-mgmt",
-                    "wpa-psk",
-                ],
-                [
-                    "nmcli",
-                    "connection",
-                    "modify",
-                    self._hotspot_connection_name,
-                    "802-11-wireless-security.psk",
-                    password,
-                ],
-                [
-                    "nmcli",
-                    "connection",
-                    "modify",
-                    self._hotspot_connection_name,
-                    "ipv4.method",
-                    "shared",
+    def _hotspot_settings(self, ssid: str, password: str) -> dict:
+        """Full hotspot profile settings"""
+        return {
+            "connection": {
+                "id": self._hotspot_connection_name,
+                "type": "802-11-wireless",
+                "autoconnect": False,
+            },
+            "802-11-wireless": {"ssid": ssid.encode(), "mode": "ap"},
+            "802-11-wireless-security": {"key-mgmt": "wpa-psk", "psk": password},
+            "ipv4": {
+                "method": "shared",
+                "address-data": [
+                    {"address": HOTSPOT_ADDRESS, "prefix": HOTSPOT_PREFIX}
                 ],
-                [
-                    "nmcli",
-                    "connection",
-                    "modify",
-                    self._hotspot_connection_name,
-                    "ipv4.addresses",
-                    "192.168.4.1/24",
-                ],
-            ]
-
-            for cmd in cmds:
-                process = await asyncio.create_subprocess_exec(
-                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-                )
-                await process.communicate()
+            },
+        }
+
+    def _hotspot_fingerprint(self, ssid: str, password: str) -> str:
+        """Stable hash of the hotspot settings"""
+        payload = json.dumps(
+            self._hotspot_settings(ssid, password),
+            sort_keys=True,
+            default=lambda value: value.hex(),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _ensure_hotspot_profile(
+        self, ssid: str, password: str, force: bool = False
+    ) -> bool:
+        """Make sure the saved hotspot profile matches the requested settings
 
-                if process.returncode != 0:
-                    await self._cleanup_hotspot_connection()
-                    raise WiFiManagerError(
-                        f"Failed to configure hotspot: {' '.join(cmd)}"
-                    )
+        Returns:
+            bool: True if the profile had to be (re)created
+        """
+        fingerprint = self._hotspot_fingerprint(ssid, password)
+        saved = self._state.load(HOTSPOT_STATE, {})
+        if not force and saved.get("fingerprint") == fingerprint and saved.get("uuid"):
+            self._hotspot_uuid = saved["uuid"]
+            return False
 
-            # Activate hotspot
-            cmd = ["nmcli", "connection", "up", self._hotspot_connection_name]
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        self.logger.info("Provisioning hotspot profile")
+        await self._cleanup_hotspot_connection()
+
+        nm = await self._get_nm()
+        uuid = None
+        if nm:
+            try:
+                uuid = await self._provision_hotspot_dbus(nm, ssid, password)
+            except NMDBusError as e:
+                self.logger.warning(f"D-Bus hotspot provisioning failed, using nmcli: {e}")
+        if uuid is None:
+            uuid = await self._provision_hotspot_nmcli(ssid, password)
+
+        self._hotspot_uuid = uuid
+        self._state.save(HOTSPOT_STATE, {"fingerprint": fingerprint, "uuid": uuid})
+        return True
+
+    async def _provision_hotspot_dbus(
+        self, nm: NMDBusClient, ssid: str, password: str
+    ) -> str:
+        """Create the hotspot profile with one AddConnection call"""
+        settings = self._hotspot_settings(ssid, password)
+        settings["connection"]["uuid"] = str(uuid_module.uuid4())
+        await nm.add_connection(settings)
+        return settings["connection"]["uuid"]
+
+    async def _provision_hotspot_nmcli(self, ssid: str, password: str) -> str:
+        """Create the hotspot profile with all properties in one nmcli add"""
+        cmd = [
+            "nmcli",
+            "connection",
+            "add",
+            "type",
+            "wifi",
+            "ifname",
+            "*",
+            "con-name",
+            self._hotspot_connection_name,
+            "autoconnect",
+            "no",
+            "ssid",
+            ssid,
+            "802-11-wireless.mode",
+            "ap",
+            "802-11-wireless-security.key-mgmt",
+            "wpa-psk",
+            "802-11-wireless-security.psk",
+            password,
+            "ipv4.method",
+            "shared",
+            "ipv4.addresses",
+            f"{HOTSPOT_ADDRESS}/{HOTSPOT_PREFIX}",
+        ]
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            raise WiFiManagerError(
+                f"Failed to create hotspot connection: {stderr.decode().strip()}"
             )
 
-            await process.communicate()
-
-            if process.returncode == 0:
-                self._hotspot_active = True
-                self.logger.info(f"Hotspot '{ssid}' started successfully")
-                return True
-            else:
-                await self._cleanup_hotspot_connection()
-                raise WiFiManagerError("Failed to activate hotspot")
-
-        except Exception as e:
-            self.logger.error(f"Hotspot start error: {e}")
-            await self._cleanup_hotspot_connection()
-            raise WiFiManagerError(f"Failed to start hotspot: {e}")
+        # "Connection 'name' (uuid) successfully added."
+        match = re.search(r"\(([0-9a-fA-F-]{36})\)", stdout.decode())
+        return match.group(1) if match else self._hotspot_connection_name
+
+    async def _activate_hotspot_profile(self):
+        """Bring up the saved hotspot profile"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                connection_path = await nm.get_connection_by_uuid(self._hotspot_uuid)
+                device = await nm.get_wifi_device()
+                active_path = await nm.activate_connection(
+                    connection_path, device["Path"]
+                )
+                activated, reason = await nm.wait_for_activation(
+                    active_path, device["Path"]
+                )
+                if not activated:
+                    raise WiFiManagerError(f"Failed to activate hotspot (reason {reason})")
+                return
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus hotspot activation failed, using nmcli: {e}")
+
+        cmd = ["nmcli", "connection", "up", self._hotspot_uuid]
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            raise WiFiManagerError(
+                f"Failed to activate hotspot: {stderr.decode().strip()}"
+            )
 
+    @_invalidates_status
     async def stop_hotspot(self) -> bool:
-        """Stop WiFi hotspot"""
+        """Stop WiFi hotspot (the profile is kept for the next start)"""
         try:
             if not self._hotspot_active:
                 return True
 
             self.logger.info("Stopping hotspot")
 
-            # Deactivate and remove hotspot connection
-            cmds = [
-                ["nmcli", "connection", "down", self._hotspot_connection_name],
-                ["nmcli", "connection", "delete", self._hotspot_connection_name],
-            ]
-
-            for cmd in cmds:
+            nm = await self._get_nm()
+            stopped = False
+            if nm:
+                try:
+                    device = await nm.get_wifi_device()
+                    active_path = device.get("ActiveConnection")
+                    if active_path and active_path != "/":
+                        await nm.deactivate_connection(active_path)
+                    stopped = True
+                except NMDBusError as e:
+                    self.logger.debug(f"D-Bus hotspot stop failed, using nmcli: {e}")
+
+            if not stopped:
+                cmd = [
+                    "nmcli",
+                    "connection",
+                    "down",
+                    self._hotspot_uuid or self._hotspot_connection_name,
+                ]
                 process = await asyncio.create_subprocess_exec(
                     *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
                 )
@@ -456,6 +1200,14 @@ class WiFiManager:
 
     async def _get_device_ip(self, device: str) -> Optional[str]:
         """Get IP address for a network device"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                wifi_device = await nm.get_wifi_device(device)
+                return await nm.get_device_ip(wifi_device["Path"])
+            except NMDBusError:
+                pass
+
         try:
             cmd = ["nmcli", "-t", "-f", "IP4.ADDRESS", "dev", "show", device]
 
@@ -468,7 +1220,7 @@ class WiFiManager:
             if process.returncode == 0:
                 for line in stdout.decode().strip().split("\n"):
                     if line.startswith("IP4.ADDRESS"):
-                        return line.split(":")[1].split("/")[0]
+                        return split_terse(line, maxsplit=1)[1].split("/")[0]
 
             return None
 
@@ -477,6 +1229,14 @@ class WiFiManager:
 
     async def _get_device_ssid(self, device: str) -> Optional[str]:
         """Get the SSID for a WiFi device by checking which network is in use"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                wifi_device = await nm.get_wifi_device(device)
+                return await nm.get_device_ssid(wifi_device["Path"])
+            except NMDBusError:
+                pass
+
         try:
             cmd = ["nmcli", "-t", "-f", "IN-USE,SSID", "dev", "wifi"]
 
@@ -490,7 +1250,7 @@ class WiFiManager:
                 for line in stdout.decode().strip().split("\n"):
                     if line.startswith("*:"):
                         # Extract SSID from the line (format is "*:SSID")
-                        ssid = line.split(":", 1)[1]
+                        ssid = split_terse(line, maxsplit=1)[1]
                         return ssid if ssid else None
 
             return None
@@ -499,7 +1259,19 @@ class WiFiManager:
             return None
 
     async def _cleanup_hotspot_connection(self):
-        """Clean up hotspot connection on error"""
+        """Delete the hotspot profile so the next start re-provisions it"""
+        self._state.delete(HOTSPOT_STATE)
+        self._hotspot_uuid = None
+
+        nm = await self._get_nm()
+        if nm:
+            try:
+                for path in await nm.find_connections(self._hotspot_connection_name):
+                    await nm.delete_connection(path)
+                return
+            except NMDBusError:
+                pass
+
         try:
             cmd = ["nmcli", "connection", "delete", self._hotspot_connection_name]
             process = await asyncio.create_subprocess_exec(
@@ -509,23 +1281,335 @@ class WiFiManager:
         except Exception:
             pass  # Ignore cleanup errors
 
-    async def _network_exists(self, ssid: str) -> bool:
-        """Check if a network with the given SSID exists"""
+    # Known network selection
+
+    async def rank_known_networks(self, rescan: bool = True) -> List[RankedNetwork]:
+        """Saved networks currently in range, best first
+
+        Args:
+            rescan: Refresh the scan index first (subject to the usual
+                rescan rate limit)
+        """
+        await self._ensure_profiles()
         try:
-            cmd = ["nmcli", "-t", "-f", "SSID", "dev", "wifi"]
+            await self.refresh_scan_index(rescan)
+        except Exception as e:
+            self.logger.warning(f"Scan refresh before ranking failed: {e}")
+
+        candidates = []
+        for ssid in self.scan_index.ssids():
+            profile = self.profiles.lookup(ssid)
+            if profile is None or ssid == self.hotspot_ssid:
+                continue
+            if profile.connection_id == self._hotspot_connection_name:
+                continue
+            candidates.append((ssid, self.scan_index.get(ssid)["signal"]))
+        return self.network_scorer.rank(candidates)
+
+    async def select_best_network(
+        self, ranked: Optional[List[RankedNetwork]] = None
+    ) -> Optional[str]:
+        """Connect to the best-ranked saved network in range
+
+        A working connection is only given up for a candidate that is
+        ahead by the policy's switch_margin; an unranked current network
+        (not saved, or not in the scan) is kept. Candidates are tried best
+        first until one connects.
 
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        Args:
+            ranked: A ranking the caller already has (default: rank again
+                after a rescan)
+
+        Returns:
+            The SSID connected to afterwards, or None
+        """
+        if self._hotspot_active or self._connecting:
+            return None  # the radio is busy with setup
+
+        if ranked is None:
+            ranked = await self.rank_known_networks()
+        status = await self.get_connection_status(max_age=0)
+        current = status.ssid if status.connected else None
+        if ranked:
+            self.logger.info(
+                "Known networks: "
+                + ", ".join(f"{network.ssid}={network.score:.0f}" for network in ranked)
             )
 
-            stdout, _ = await process.communicate()
+        if current is not None:
+            scores = {network.ssid: network.score for network in ranked}
+            if (
+                current not in scores
+                or ranked[0].ssid == current
+                or ranked[0].score - scores[current] < self.network_scorer.policy.switch_margin
+            ):
+                return current
+            self.logger.info(f"Switching from {current} to better known network {ranked[0].ssid}")
+
+        for network in ranked:
+            if network.ssid == current:
+                break  # everything better failed; stay
+            try:
+                if await self.connect_to_network(network.ssid, "", max_retries=1):
+                    await self.measure_network(network.ssid)
+                    return network.ssid
+            except WiFiManagerError as e:
+                self.logger.warning(f"Could not connect to known network {network.ssid}: {e}")
+
+        status = await self.get_connection_status(max_age=0)
+        return status.ssid if status.connected else None
+
+    async def measure_network(self, ssid: str):
+        """Record internet latency and link bitrate on the current network"""
+        verdict = await self.reachability.check(max_age=0)
+        try:
+            sample = self.link_quality.sample()
+        except Exception as e:
+            self.logger.debug(f"Link quality sample failed: {e}")
+            sample = None
+        self.network_history.record_metrics(
+            ssid,
+            latency_ms=verdict.latency_ms if verdict.reachable else None,
+            bitrate=sample["tx_bitrate"] if sample else None,
+        )
+
+    def start_auto_select(self):
+        """Select the best known network again after every unexpected disconnect
+
+        For a long-running owner between setups; do not run it next to
+        another selector reacting to the same disconnects.
+        """
+        if self._auto_select_task is None or self._auto_select_task.done():
+            self._auto_select_task = asyncio.create_task(self._auto_select_loop())
+
+    async def stop_auto_select(self):
+        """Stop reacting to disconnects"""
+        if self._auto_select_task is not None:
+            self._auto_select_task.cancel()
+            try:
+                await self._auto_select_task
+            except asyncio.CancelledError:
+                pass
+            self._auto_select_task = None
+
+    async def _auto_select_loop(self):
+        events = await self.get_event_monitor()
+        if events is None:
+            self.logger.warning("No NetworkManager events - known network auto-select disabled")
+            return
+        try:
+            wifi_interface = linux_net.find_wifi_interface()
+        except OSError:
+            wifi_interface = None
+
+        async with events.subscribe() as subscription:
+            # nmcli monitor cannot tell the state before its first event
+            last_state = await self._wifi_device_state()
+            async for event in subscription:
+                if event.kind != DEVICE_STATE or (
+                    wifi_interface and event.interface not in (None, wifi_interface)
+                ):
+                    continue
+                previous = event.old_state if event.old_state is not None else last_state
+                last_state = event.new_state
+                if (
+                    previous != NM_DEVICE_STATE_ACTIVATED
+                    or event.new_state not in (NM_DEVICE_STATE_DISCONNECTED, NM_DEVICE_STATE_FAILED)
+                    or self._connecting
+                    or self._hotspot_active
+                ):
+                    continue
+                self.logger.info("WiFi disconnected - selecting the best known network")
 
-            if process.returncode == 0:
-                available_networks = stdout.decode().strip().split("\n")
-                return ssid in available_networks
+                async def connected():
+                    return (await self.get_connection_status()).connected
 
-            return False
+                try:
+                    # NetworkManager may reconnect by itself; the selection
+                    # then only switches if something is clearly better
+                    await wait_until(connected, AUTO_SELECT_GRACE, events)
+                    await self.select_best_network()
+                except Exception as e:
+                    self.logger.warning(f"Known network auto-select failed: {e}")
+                # Disconnects caused by the selection itself are not news
+                subscription.drain()
+
+    def start_background_scan(self):
+        """Start refreshing the scan index every scan_interval seconds"""
+        if self._scan_task is None or self._scan_task.done():
+            self._scan_task = asyncio.create_task(self._background_scan_loop())
+
+    async def stop_background_scan(self):
+        """Stop the background scanner"""
+        if self._scan_task is not None:
+            self._scan_task.cancel()
+            try:
+                await self._scan_task
+            except asyncio.CancelledError:
+                pass
+            self._scan_task = None
+
+    async def _background_scan_loop(self):
+        while True:
+            try:
+                await self.refresh_scan_index()
+            except Exception as e:
+                self.logger.warning(f"Background scan failed: {e}")
+            await asyncio.sleep(self.scan_interval)
+
+    async def refresh_scan_index(self, rescan: bool = True) -> bool:
+        """Refresh the scan index from NetworkManager
+
+        A radio rescan is requested at most once every scan_min_interval
+        seconds and never while a connection attempt is running; otherwise
+        NetworkManager's cached scan list is read.
+
+        Returns:
+            bool: True if the indexed networks changed
+        """
+        if self._scan_lock is None:
+            self._scan_lock = asyncio.Lock()
+
+        async with self._scan_lock:
+            now = time.monotonic()
+            rescan = (
+                rescan
+                and not self._connecting
+                and now - self._last_rescan >= self.scan_min_interval
+            )
+            if rescan:
+                self._last_rescan = now
+
+            access_points = await self._read_access_points(rescan)
+            changed = self.scan_index.update(access_points)
+            if changed:
+                self.logger.debug(
+                    f"Scan index updated: {len(self.scan_index)} networks (rescan={rescan})"
+                )
+            return changed
+
+    async def _read_access_points(self, rescan: bool) -> List[dict]:
+        """Read the access point list, optionally after a fresh scan"""
+        nm = await self._get_nm()
+        if nm:
+            try:
+                device = await nm.get_wifi_device()
+                if rescan:
+                    try:
+                        await nm.request_scan(device["Path"])
+                    except NMDBusError as e:
+                        # e.g. scanning refused while in AP mode
+                        self.logger.debug(f"Rescan refused, using cached list: {e}")
+                return [
+                    {
+                        "ssid": ap["SsidText"],
+                        "bssid": ap.get("HwAddress"),
+                        "signal": ap.get("Strength", 0),
+                        "frequency": ap.get("Frequency", 0),
+                        "security": security_from_flags(
+                            ap.get("Flags", 0), ap.get("WpaFlags", 0), ap.get("RsnFlags", 0)
+                        ),
+                        "in_use": ap["Path"] == device.get("ActiveAccessPoint"),
+                    }
+                    for ap in await nm.get_access_points(device["Path"])
+                ]
+            except NMDBusError as e:
+                self.logger.debug(f"D-Bus scan read failed, using nmcli: {e}")
+
+        returncode, stdout, stderr = await run_nmcli(
+            "-t",
+            "-f",
+            "IN-USE,BSSID,SSID,FREQ,SIGNAL,SECURITY",
+            "dev",
+            "wifi",
+            "list",
+            "--rescan",
+            "yes" if rescan else "no",
+        )
+        if returncode != 0:
+            raise WiFiManagerError(f"WiFi scan failed: {stderr.strip()}")
+
+        access_points = []
+        for line in stdout.splitlines():
+            fields = split_terse(line)
+            if len(fields) < 6:
+                continue
+            in_use, bssid, ssid, freq, signal, security = fields[:6]
+            access_points.append(
+                {
+                    "ssid": ssid,
+                    "bssid": bssid,
+                    "signal": int(signal) if signal.isdigit() else 0,
+                    "frequency": int(freq.split()[0]) if freq.split() else 0,
+                    "security": "" if security in ("", "--") else security,
+                    "in_use": in_use == "*",
+                }
+            )
+        return access_points
 
+    async def precheck_network(self, ssid: str) -> "NetworkPrecheck":
+        """Decide from the scan index whether a connection attempt is worthwhile
+
+        Answers from memory without a radio rescan, so it is safe to call
+        while the hotspot is up. Only an SSID missing from a fresh snapshot
+        with no hidden networks around is rejected; anything uncertain
+        proceeds to a real attempt.
+        """
+        start = time.perf_counter()
+        index = self.scan_index
+        if index.age is None:
+            try:
+                await self.refresh_scan_index(rescan=False)
+            except Exception as e:
+                self.logger.warning(f"Could not read scan results for precheck: {e}")
+
+        age = index.age
+        suggestions: List[str] = []
+        if ssid in index:
+            proceed, found = True, True
+            reason = f"Network '{ssid}' seen {index.last_seen_age(ssid):.0f}s ago"
+        elif age is None or not len(index) or age > index.retention:
+            proceed, found = True, None
+            reason = "No recent scan snapshot - trying anyway"
+        elif index.has_hidden:
+            proceed, found = True, None
+            reason = f"Network '{ssid}' not in scan, but may be a hidden network"
+        else:
+            proceed, found = False, False
+            suggestions = self._similar_ssids(ssid)
+            reason = (
+                f"Network '{ssid}' not found. "
+                "Please check the network name and ensure it's available."
+            )
+            if suggestions:
+                reason += f" Did you mean '{suggestions[0]}'?"
+
+        precheck = NetworkPrecheck(
+            ssid=ssid,
+            proceed=proceed,
+            found=found,
+            reason=reason,
+            snapshot_age=round(age, 1) if age is not None else None,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+            suggestions=suggestions,
+        )
+        self.last_precheck = precheck
+        self.logger.info(
+            f"Precheck for {ssid}: {'proceed' if proceed else 'reject'} "
+            f"in {precheck.elapsed_ms:.2f} ms - {reason}"
+        )
+        return precheck
+
+    def _similar_ssids(self, ssid: str) -> List[str]:
+        """Indexed SSIDs that look like a typo of ssid"""
+        ssids = self.scan_index.ssids()
+        exact_case = [name for name in ssids if name.lower() == ssid.lower()]
+        return exact_case or difflib.get_close_matches(ssid, ssids, n=3, cutoff=0.6)
+
+    async def _snapshot_scan(self, timeout: float = 5.0):
+        """Read the scan list into the index before the radio leaves station mode"""
+        try:
+            await asyncio.wait_for(self.refresh_scan_index(rescan=False), timeout)
+            self.logger.info(f"Scan snapshot before hotspot: {len(self.scan_index)} networks")
         except Exception as e:
-            self.logger.error(f"Error checking network existence: {e}")
-            return False
+            self.logger.warning(f"Scan snapshot before hotspot failed: {e}")
@@ -6,16 +6,26 @@ Provides REST API endpoints and web interface for WiFi configuration.
 
 import asyncio
 import logging
-from typing import Dict
+from dataclasses import asdict
+from typing import Dict, Optional
 from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 import time
 
+from .interface_table import InterfaceTable
+from .netlink import NetlinkError
+from .nm_events import STATE_EVENT_KINDS
 from .wifi_manager import WiFiManager, WiFiManagerError
 
+# Upper bound for long-polling /api/status?wait=N
+MAX_STATUS_WAIT = 30.0
+# Without an event source a long-poll is held this long instead, so clients
+# that re-poll at once do not spin
+STATUS_POLL_FALLBACK = 2.0
+
 
 class ConnectRequest(BaseModel):
     """WiFi connection request model"""
@@ -71,7 +81,14 @@ class WiFiServer:
 
         # API Routes
         app.get("/api/status")(self.get_status)
+        app.get("/api/networks")(self.get_networks)
+        app.get("/api/profiles")(self.get_profiles)
+        app.get("/api/link-quality")(self.get_link_quality)
+        app.get("/api/reachability")(self.get_reachability)
+        app.get("/api/connect-attempts")(self.get_connect_attempts)
+        app.get("/api/known-networks")(self.get_known_networks)
         app.get("/health")(self.health_check)
+        app.get("/api/diagnostics")(self.get_diagnostics)
         app.post("/api/connect")(self.connect_network)
         app.post("/api/forget")(self.forget_network)
         app.post("/api/hotspot/start")(self.start_hotspot)
@@ -84,9 +101,24 @@ class WiFiServer:
 
         return app
 
-    async def get_status(self) -> Dict:
-        """GET /api/status - Get connection status"""
+    async def get_status(self, wait: float = 0) -> Dict:
+        """GET /api/status - Get connection status
+
+        With ?wait=N the response is held until NetworkManager reports a
+        state change or N seconds pass, so clients can long-poll (without
+        an event source it is held for at most STATUS_POLL_FALLBACK).
+        """
         try:
+            if wait > 0:
+                events = await self.wifi_manager.get_event_monitor()
+                if events:
+                    await events.wait_for(
+                        lambda event: event.kind in STATE_EVENT_KINDS,
+                        timeout=min(wait, MAX_STATUS_WAIT),
+                    )
+                else:
+                    await asyncio.sleep(min(wait, STATUS_POLL_FALLBACK))
+
             status = await self.wifi_manager.get_connection_status()
 
             # Check if connection is in progress
@@ -115,6 +147,7 @@ class WiFiServer:
                 "connection_in_progress": connection_in_progress,
                 "mdns_hostname": mdns_hostname,
                 "hostname": self.mdns_hostname,  # Raw hostname without .local
+                "signal_percent": self.wifi_manager.link_quality.signal_percent(),
                 "timestamp": int(time.time()) if "time" in locals() else None,
             }
 
@@ -137,13 +170,112 @@ class WiFiServer:
                 "timestamp": None,
             }
 
+    async def get_networks(self, request: Request) -> Response:
+        """GET /api/networks - Networks from the background scan index
+
+        Always answered from memory; supports ETag / If-None-Match so
+        unchanged results cost a 304 with no body.
+        """
+        index = self.wifi_manager.scan_index
+        if index.age is None:
+            # First request before any scan: make sure the scanner is running
+            self.wifi_manager.start_background_scan()
+
+        etag = index.etag
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        client_tags = [tag.strip() for tag in if_none_match.split(",")]
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers=headers)
+
+        return JSONResponse(
+            {
+                "networks": index.networks(),
+                "generation": index.generation,
+                "scanned_at": index.scanned_at_wall,
+            },
+            headers=headers,
+        )
+
+    async def get_profiles(self) -> Dict:
+        """GET /api/profiles - Saved WiFi profiles used for direct reconnection"""
+        try:
+            profiles = await self.wifi_manager.get_saved_profiles()
+        except Exception as e:
+            self.logger.error(f"Saved profile listing failed: {e}")
+            raise HTTPException(status_code=500, detail="Failed to list saved profiles")
+        return {"profiles": profiles, "generation": self.wifi_manager.profiles.generation}
+
+    async def get_link_quality(self, window: float = 60, history: float = 0) -> Dict:
+        """GET /api/link-quality - Cached, smoothed WiFi link statistics
+
+        ?window=N sets the min/max/mean window in seconds; ?history=N adds
+        the samples of the last N seconds.
+        """
+        sampler = self.wifi_manager.link_quality
+        result = sampler.summary(window)
+        if history > 0:
+            result["history"] = sampler.history(history)
+        return result
+
+    async def get_reachability(self, refresh: bool = False) -> Dict:
+        """GET /api/reachability - Cached internet reachability verdict
+
+        ?refresh=true probes again instead of reusing a verdict within its TTL.
+        """
+        verdict = await self.wifi_manager.reachability.check(max_age=0 if refresh else None)
+        return verdict.as_dict()
+
+    async def get_connect_attempts(self, ssid: Optional[str] = None, limit: int = 10) -> Dict:
+        """GET /api/connect-attempts - Per-stage timings of recent connection attempts
+
+        ?ssid= limits the attempts and the per-stage median/max to one
+        network; ?limit=N sets how many attempts are returned.
+        """
+        history = self.wifi_manager.connect_history
+        return {
+            "attempts": history.recent(limit, ssid),
+            "stage_summary": history.stage_summary(ssid),
+        }
+
+    async def get_known_networks(self) -> Dict:
+        """GET /api/known-networks - Saved networks in range, ranked for auto-selection
+
+        Each entry carries its score, the points per factor (signal, success
+        rate, time to IP, latency, throughput) and its decayed history.
+        """
+        manager = self.wifi_manager
+        try:
+            ranked = await manager.rank_known_networks(rescan=False)
+        except WiFiManagerError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        return {
+            "networks": [
+                dict(network.as_dict(), history=manager.network_history.stats(network.ssid))
+                for network in ranked
+            ],
+            "switch_margin": manager.network_scorer.policy.switch_margin,
+        }
+
     async def connect_network(
         self, request: ConnectRequest, background_tasks: BackgroundTasks
     ) -> Dict:
-        """POST /api/connect - Immediately responds and triggers connection in the background."""
-        try:
-            self.logger.info(f"Connection request for SSID: {request.ssid}")
+        """POST /api/connect - Immediately responds and triggers connection in the background.
+
+        The SSID is first checked against the scan snapshot; a network that
+        is clearly not visible is rejected with 404 before the hotspot is
+        touched.
+        """
+        self.logger.info(f"Connection request for SSID: {request.ssid}")
+        precheck = await self.wifi_manager.precheck_network(request.ssid)
+        if not precheck.proceed:
+            raise HTTPException(
+                status_code=404,
+                detail={"message": precheck.reason, "precheck": asdict(precheck)},
+            )
 
+        try:
             # This is the key change: schedule the connection to run in the background
             # after this function returns a response.
             background_tasks.add_task(
@@ -162,6 +294,7 @@ class WiFiServer:
                 "success": True,
                 "message": "Connection process initiated. Redirecting to check status...",
                 "redirect_to_status": True,
+                "precheck": asdict(precheck),
             }
 
         except Exception as e:
@@ -171,12 +304,12 @@ class WiFiServer:
             )
 
     async def _perform_connection_with_delay(self, ssid: str, password: str):
-        """Perform connection with hotspot management in background."""
-        try:
-            # A short delay can sometimes help ensure the HTTP response is sent before
-            # the network interface is disrupted.
-            await asyncio.sleep(2)
+        """Perform connection with hotspot management in background.
 
+        Background tasks only run after the response has been sent, so the
+        connection starts straight away without a fixed delay.
+        """
+        try:
             self.logger.info(f"Background task: Starting actual connection to {ssid}")
 
             # This now runs independently of the user's browser session
@@ -246,6 +379,42 @@ class WiFiServer:
             "timestamp": int(time.time())
         }
 
+    @staticmethod
+    def _interface_records():
+        table = InterfaceTable()
+        try:
+            table.refresh()
+        except NetlinkError:
+            return None
+        return [record.as_dict() for record in table]
+
+    async def get_diagnostics(self) -> Dict:
+        """GET /api/diagnostics - Backend, cache and connection internals
+
+        Covers the event source, cache counters, connect timings and stages,
+        the last precheck, link quality, reachability and interfaces.
+        """
+        return {
+            "backend": self.wifi_manager.backend,
+            "event_source": self.wifi_manager.events.source,
+            "status_cache": self.wifi_manager.status_cache_stats(),
+            "last_connect_timings": self.wifi_manager.last_connect_timings,
+            "last_precheck": (
+                asdict(self.wifi_manager.last_precheck)
+                if self.wifi_manager.last_precheck
+                else None
+            ),
+            "link_quality": self.wifi_manager.link_quality.summary(),
+            "connect_stage_summary": self.wifi_manager.connect_history.stage_summary(),
+            "interfaces": self._interface_records(),
+            "reachability": (
+                self.wifi_manager.reachability.last_verdict.as_dict()
+                if self.wifi_manager.reachability.last_verdict
+                else None
+            ),
+            "timestamp": int(time.time()),
+        }
+
     async def get_index(self, request: Request) -> HTMLResponse:
         """GET / - Main web interface"""
         return self.templates.TemplateResponse("index.html", {"request": request})
@@ -21,7 +21,11 @@ from pathlib import Path
 from typing import Optional
 
 from wifi_info_display import create_wifi_info_image
-from network.network_utils import NetworkUtils
+from network import netlink
+from network.async_network_utils import AsyncNetworkUtils
+from network.nm_dbus import DBUS_AVAILABLE, NMDBusClient
+from network.nm_events import STATE_EVENT_KINDS, NMEventMonitor
+from network.reachability import ReachabilityProber
 
 class PinggyTunnelManager:
     """Manages SSH tunnels through Pinggy with automatic refresh"""
@@ -46,8 +50,14 @@ class PinggyTunnelManager:
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
         
-        # Network utilities
-        self.network_utils = NetworkUtils()
+        # Network utilities (non-blocking, safe to await in the main loop)
+        self.network_utils = AsyncNetworkUtils()
+
+        # NetworkManager state changes, used to wake up network waits
+        self.nm_events = NMEventMonitor(NMDBusClient() if DBUS_AVAILABLE else None)
+
+        # Whether the tunnel endpoint side of the internet is reachable at all
+        self.reachability = ReachabilityProber()
     
     def setup_logging(self):
         """Configure logging"""
@@ -59,18 +69,31 @@ class PinggyTunnelManager:
             ]
         )
     
-    def check_network_connectivity(self) -> bool:
-        """Check if network is connected"""
+    async def check_network_connectivity(self, max_age: Optional[float] = None) -> bool:
+        """Check if the network is connected and the internet reachable
+
+        Args:
+            max_age: Oldest reachability verdict to reuse (default: its TTL)
+        """
         try:
-            wifi_name = self.network_utils.get_wifi_name()
-            ip_address = self.network_utils.get_wifi_ip_address()
+            snapshot = await self.network_utils.snapshot(timeout=10)
             
-            if wifi_name and ip_address and ip_address != "No IP":
-                self.logger.info(f"Network connected: {wifi_name} ({ip_address})")
-                return True
-            else:
+            if not snapshot.has_ip:
                 self.logger.warning("No network connectivity detected")
                 return False
+
+            verdict = await self.reachability.check(max_age)
+            if verdict.reachable:
+                self.logger.info(
+                    f"Network connected: {snapshot.ssid} ({snapshot.ip_address}), "
+                    f"internet reachable in {verdict.latency_ms:.0f} ms"
+                )
+                return True
+            self.logger.warning(
+                f"Network connected: {snapshot.ssid} ({snapshot.ip_address}), "
+                f"but internet reachability is {verdict.state}"
+            )
+            return False
         except Exception as e:
             self.logger.error(f"Error checking network: {e}")
             return False
@@ -212,29 +235,69 @@ class PinggyTunnelManager:
             return
         
         try:
-            # Create WiFi info image with tunnel URL
-            create_wifi_info_image(
+            # Create WiFi info image with tunnel URL; rendering and the
+            # e-ink refresh block, so they run off the event loop
+            snapshot = await self.network_utils.snapshot(timeout=10)
+            await asyncio.to_thread(
+                create_wifi_info_image,
                 filename="wifi_info_tunnel.png",
                 auto_display=True,
-                tunnel_url=url
+                tunnel_url=url,
+                snapshot=snapshot,
             )
             self.logger.info("Display updated with tunnel QR code")
         except Exception as e:
             self.logger.error(f"Failed to update display: {e}")
     
     async def wait_for_network(self):
-        """Wait for network connectivity before starting tunnel"""
+        """Wait for network connectivity before starting tunnel
+
+        Re-checks when the kernel reports a link coming up, an address being
+        added or a default route appearing. Falls back to NetworkManager
+        events (or a 5 second poll) if netlink is unavailable.
+        """
         self.logger.info("Waiting for network connectivity...")
-        
+
         while self.running:
-            if self.check_network_connectivity():
-                self.logger.info("Network is ready")
-                return True
-            
-            await asyncio.sleep(5)  # Check every 5 seconds
-        
+            try:
+                # Timeout is only a safety net for missed events
+                if await netlink.wait_for_event(
+                    timeout=60, ready=lambda: self.check_network_connectivity(max_age=0)
+                ):
+                    self.logger.info("Network is ready")
+                    return True
+            except netlink.NetlinkError as e:
+                self.logger.debug(f"Netlink unavailable, using NetworkManager events: {e}")
+                return await self._wait_for_network_nm()
+
         return False
-    
+
+    async def _wait_for_network_nm(self):
+        """wait_for_network() driven by NetworkManager state changes"""
+        have_events = await self.nm_events.start()
+
+        while self.running:
+            # Subscribe before checking so a change in between is not lost
+            subscription = self.nm_events.subscribe() if have_events else None
+            try:
+                if await self.check_network_connectivity(max_age=0):
+                    self.logger.info("Network is ready")
+                    return True
+
+                if subscription is not None and self.nm_events.running:
+                    # Timeout is only a safety net for missed events
+                    while True:
+                        event = await subscription.get(timeout=60)
+                        if event is None or event.kind in STATE_EVENT_KINDS:
+                            break
+                else:
+                    await asyncio.sleep(5)  # Check every 5 seconds
+            finally:
+                if subscription is not None:
+                    subscription.close()
+
+        return False
+
     async def run_forever(self):
         """Main loop - maintain tunnel with periodic refresh"""
         self.running = True
@@ -244,6 +307,11 @@ class PinggyTunnelManager:
             self.logger.error("Service stopped before network was ready")
             return
         
+        # Keep the cached verdict and the interface table current across
+        # network changes
+        self.reachability.watch()
+        await self.network_utils.watch()
+
         # Give WiFi setup service time to complete its display
         self.logger.info("Waiting 10 seconds for WiFi setup to complete...")
         await asyncio.sleep(10)
@@ -251,7 +319,7 @@ class PinggyTunnelManager:
         while self.running:
             try:
                 # Check network connectivity
-                if not self.check_network_connectivity():
+                if not await self.check_network_connectivity():
                     self.logger.warning("Lost network connectivity, waiting...")
                     await self.wait_for_network()
                     continue
@@ -277,6 +345,9 @@ class PinggyTunnelManager:
         
         # Cleanup
         self.stop_tunnel()
+        await self.reachability.stop()
+        await self.network_utils.stop()
+        await self.nm_events.stop()
         self.logger.info("Tunnel service stopped")
     
     def shutdown(self):
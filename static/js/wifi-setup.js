@@ -5,6 +5,7 @@ class WiFiSetup {
     this.ssidInput = document.getElementById("ssid-input");
     this.passwordInput = document.getElementById("password-input");
     this.connectBtn = document.getElementById("connect-btn");
+    this.networkList = document.getElementById("network-list");
     // this.completeBtn = document.getElementById('complete-btn'); // Commented out
     this.alertContainer = document.getElementById("alert-container");
 
@@ -21,6 +22,29 @@ class WiFiSetup {
 
     // Show initial disconnected state
     this.updateStatusDisplay({ connected: false });
+
+    // Suggest nearby networks from the device's scan index
+    this.loadNetworks();
+  }
+
+  async loadNetworks() {
+    try {
+      const response = await fetch("/api/networks");
+      if (!response.ok) {
+        return;
+      }
+      const data = await response.json();
+
+      this.networkList.innerHTML = "";
+      for (const network of data.networks) {
+        const option = document.createElement("option");
+        option.value = network.ssid;
+        option.label = `${network.signal}% ${network.band || ""} ${network.security || "Open"}`;
+        this.networkList.appendChild(option);
+      }
+    } catch (error) {
+      console.error("Network list failed:", error);
+    }
   }
 
   // Keep this method but don't use it automatically
@@ -86,7 +110,9 @@ class WiFiSetup {
       });
 
       if (!connectResponse.ok) {
-        throw new Error("Failed to initiate connection");
+        // A rejected precheck explains why (e.g. the network is not visible)
+        const error = await connectResponse.json().catch(() => ({}));
+        throw new Error(error.detail?.message || "Failed to initiate connection");
       }
 
       // Show connection progress
@@ -52,7 +52,11 @@ logger = logging.getLogger(__name__)
 
 
 def create_wifi_info_image(
-    filename="wifi_info.png", auto_display=False, tunnel_url=None
+    filename="wifi_info.png",
+    auto_display=False,
+    tunnel_url=None,
+    snapshot=None,
+    signal_percent=None,
 ):
     """
     Create an image with WiFi information for e-ink display
@@ -61,6 +65,10 @@ def create_wifi_info_image(
         filename: Output filename
         auto_display: If True, automatically display on e-ink after creating
         tunnel_url: Optional tunnel URL to display with QR code
+        snapshot: NetworkSnapshot to render (captured here if not given,
+            e.g. asyncio callers pass one from AsyncNetworkUtils)
+        signal_percent: Smoothed signal (0-100) for the signal bars, e.g.
+            from LinkQualitySampler; parsed from the snapshot if not given
 
     Returns:
         Filename of created image
@@ -68,16 +76,15 @@ def create_wifi_info_image(
     width = 128
     height = 250
 
-    # Get network information
-    logger.info("Gathering network information...")
-    network_utils = NetworkUtils()
-
-    # Collect all network data
-    wifi_name = network_utils.get_wifi_name()
-    ip_address = network_utils.get_wifi_ip_address()
-    mac_address = network_utils.get_wifi_mac_address()
-    signal_strength = network_utils.get_wifi_signal_strength()
-    network_details = network_utils.get_network_details()
+    # Collect all network data in one pass
+    if snapshot is None:
+        logger.info("Gathering network information...")
+        snapshot = NetworkUtils().snapshot()
+    wifi_name = snapshot.ssid
+    ip_address = snapshot.ip_address
+    mac_address = snapshot.mac_address
+    signal_strength = snapshot.signal_strength
+    network_details = snapshot.details()
 
     logger.info(f"WiFi: {wifi_name}, IP: {ip_address}")
 
@@ -275,15 +282,15 @@ def create_wifi_info_image(
         signal_x = 5
         signal_y = y_pos + 15
 
-        # Extract percentage from signal strength if available
-        signal_percent = 0
-        if signal_strength and "%" in signal_strength:
-            try:
-                signal_percent = int(signal_strength.split("%")[0])
-            except:
-                signal_percent = 50  # Default
-        else:
-            signal_percent = 50  # Default if no percentage
+        # Prefer the smoothed value; else extract the percentage from the text
+        if signal_percent is None:
+            if signal_strength and "%" in signal_strength:
+                try:
+                    signal_percent = int(signal_strength.split("%")[0])
+                except:
+                    signal_percent = 50  # Default
+            else:
+                signal_percent = 50  # Default if no percentage
 
         # Draw 5 signal bars (smaller)
         for i in range(5):
@@ -15,8 +15,14 @@ import socket
 import sys
 import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import uvicorn
+from button_input import KEY_ENTER, ButtonMonitor, InputDeviceIndex
+from network import netlink
+from network.async_network_utils import AsyncNetworkUtils
+from network.nm_events import STATE_EVENT_KINDS
+from network.readiness import PhaseTimer, wait_until
 from network.wifi_manager import WiFiManager, WiFiManagerError
 from network.wifi_server import WiFiServer
 from mdns_service import MDNSService
@@ -24,7 +30,6 @@ from mdns_service import MDNSService
 # Import evdev for button checking
 try:
     import evdev
-    from evdev import InputDevice, ecodes
 
     EVDEV_AVAILABLE = True
 except ImportError:
@@ -46,6 +51,12 @@ except ImportError as e:
     EINK_AVAILABLE = False
 
 
+# Supervisor mode: longest wait for a reconnect NetworkManager has in
+# progress, and the pause before retrying a setup mode that failed
+SUPERVISOR_RECONNECT_TIMEOUT = 20.0
+SUPERVISOR_RETRY_DELAY = 5.0
+
+
 class WiFiSetupService:
     """Main WiFi setup service orchestrator"""
 
@@ -58,6 +69,8 @@ class WiFiSetupService:
         enable_eink: bool = True,
         mdns_hostname: str = "",  # Will auto-detect if None
         mdns_port: int = 8000,
+        long_press: float = 5.0,
+        supervise: bool = False,
     ):
         self.hotspot_ssid = hotspot_ssid
         self.hotspot_password = hotspot_password
@@ -66,12 +79,24 @@ class WiFiSetupService:
         self.enable_eink = enable_eink and EINK_AVAILABLE
         self.mdns_port = mdns_port
         self.device_path = None
+        self.button: Optional[ButtonMonitor] = None
+        self.input_devices = InputDeviceIndex()
         self.check_duration = 2.0  # seconds to check for button hold
-
-        self.wifi_manager = WiFiManager()
+        self.startup_timings: Optional[Dict] = None
+        # Seconds ENTER must be held at runtime to re-enter setup (0: off)
+        self.long_press = long_press
+        self.last_setup_entry: Optional[Dict] = None
+        # Stay resident and move between connected and setup modes
+        self.supervise = supervise
+
+        self.wifi_manager = WiFiManager(
+            use_dbus=os.getenv("WIFI_NM_BACKEND", "dbus") != "nmcli",
+            status_ttl=float(os.getenv("WIFI_STATUS_CACHE_TTL", "2.0")),
+        )
         # WiFiServer will be created after hostname is determined
         self.server = None
         self.mdns_service = None
+        self.mdns_task = None
         self.running = False
 
         # Setup logging first
@@ -149,77 +174,49 @@ class WiFiSetupService:
         self.running = False
 
     def find_device(self) -> bool:
-        """Find the input device by name"""
-        if not EVDEV_AVAILABLE:
-            return False
-
-        try:
-            devices = [InputDevice(path) for path in evdev.list_devices()]
-            for device in devices:
-                self.logger.debug(
-                    f"Checking device: {device.path}, Name: {device.name}"
-                )
-                if device.name == self.device_name:
-                    self.device_path = device.path
-                    self.logger.info(
-                        f"Found device '{self.device_name}' at path: {device.path}"
-                    )
-                    return True
+        """Find the input device by name
 
+        Resolved from sysfs without opening any device node; the result
+        is cached and re-validated against the device's sysfs identity.
+        """
+        path = self.input_devices.resolve(self.device_name)
+        if path is None:
             self.logger.warning(
                 f"Could not find input device with name: '{self.device_name}'"
             )
             return False
-        except Exception as e:
-            self.logger.error(f"Error finding device: {e}")
-            return False
+        self.device_path = path
+        self.logger.info(f"Found device '{self.device_name}' at path: {path}")
+        return True
 
     def is_enter_button_held(self) -> bool:
         """Check if ENTER button is currently being held"""
-        if not self.device_path or not EVDEV_AVAILABLE:
-            return False
-
-        try:
-            device = InputDevice(self.device_path)
-
-            # Get the current state of all keys
-            active_keys = device.active_keys()
-
-            # Check if ENTER key is in the active keys
-            is_held = ecodes.KEY_ENTER in active_keys
-
-            device.close()
-            return is_held
+        return self.button is not None and self.button.held
 
-        except Exception as e:
-            self.logger.error(f"Error checking button state: {e}")
+    async def start_button_monitor(self) -> bool:
+        """Open the input device once and follow its ENTER key events"""
+        if self.button is not None and self.button.running:
+            return True
+        if not self.device_path:
             return False
+        self.button = ButtonMonitor(self.device_path, KEY_ENTER)
+        return await self.button.start()
 
-    def check_button_during_startup(self) -> bool:
-        """Check if button is held during the startup check period"""
-        if not self.check_button:
+    async def check_button_during_startup(self) -> bool:
+        """Check if button is held for check_duration seconds at startup
+
+        Decided from key events: at once if the button is not down, on
+        release, or the moment the hold reaches check_duration.
+        """
+        if not self.check_button or not await self.start_button_monitor():
             return False
 
         self.logger.info(
             f"Checking for ENTER button hold for {self.check_duration} seconds..."
         )
-
-        start_time = time.time()
-        samples_held = 0
-        total_samples = 0
-
-        while time.time() - start_time < self.check_duration:
-            if self.is_enter_button_held():
-                samples_held += 1
-            total_samples += 1
-            time.sleep(0.1)  # Check every 100ms
-
-        # Consider button held if it was held for at least 80% of the time
-        hold_ratio = samples_held / total_samples if total_samples > 0 else 0
-        is_consistently_held = hold_ratio >= 0.8
-
+        is_consistently_held = await self.button.wait_for_hold(self.check_duration)
         self.logger.info(
-            f"Button hold ratio: {hold_ratio:.2f} ({samples_held}/{total_samples} samples)"
+            f"Button hold: {self.button.hold_duration() or self.button.last_hold or 0:.2f}s"
         )
 
         if is_consistently_held:
@@ -231,7 +228,7 @@ class WiFiSetupService:
             self.logger.info("ENTER button not consistently held - normal startup")
             return False
 
-    def display_wifi_info(self):
+    async def display_wifi_info(self):
         """Display WiFi information on eink display"""
         if not self.enable_eink:
             self.logger.debug("E-ink display disabled - skipping WiFi info display")
@@ -240,8 +237,19 @@ class WiFiSetupService:
         try:
             self.logger.info("Displaying WiFi information on eink display...")
 
-            # Create and automatically display WiFi info image on eink
-            create_wifi_info_image(filename="wifi_info.png", auto_display=True)
+            # Gather network info without blocking the loop, then render and
+            # refresh the e-ink panel in a worker thread
+            snapshot = await AsyncNetworkUtils().snapshot(timeout=10)
+            link_quality = self.wifi_manager.link_quality
+            if not link_quality.running:
+                link_quality.sample()
+            await asyncio.to_thread(
+                create_wifi_info_image,
+                filename="wifi_info.png",
+                auto_display=True,
+                snapshot=snapshot,
+                signal_percent=link_quality.signal_percent(),
+            )
 
             self.logger.info("WiFi information displayed successfully on eink")
 
@@ -295,6 +303,8 @@ class WiFiSetupService:
 
     async def start_mdns_service(self):
         """Start mDNS service for post-connection access"""
+        if self.mdns_task is not None and not self.mdns_task.done():
+            return self.mdns_task  # still up from an earlier setup
         try:
             self.logger.info(
                 f"Starting mDNS service: {self.mdns_hostname}.local:{self.mdns_port}"
@@ -308,6 +318,7 @@ class WiFiSetupService:
 
             # Start the mDNS web server
             mdns_server_task = await self.mdns_service.start_web_server()
+            self.mdns_task = mdns_server_task
 
             self.logger.info(
                 f"mDNS service active: http://{self.mdns_hostname}.local:{self.mdns_port}"
@@ -329,88 +340,157 @@ class WiFiSetupService:
             return None
 
     async def wait_for_network(self, max_wait=30):
-        """Wait for network connectivity before proceeding"""
+        """Wait for network connectivity before proceeding
+
+        Connectivity means a default route (what `ip route get` needs). The
+        wait ends on the rtnetlink link/address/route event that provides
+        it, or at once if it already exists; it polls `ip route get` once a
+        second only when netlink is unavailable. Once there is a route, one
+        reachability probe round records whether the internet is reachable.
+        """
         self.logger.info("Waiting for network connectivity...")
+        started = time.monotonic()
 
-        import subprocess
-
-        for attempt in range(max_wait):
-            try:
-                # Check if we have any network connectivity
-                result = subprocess.run(
-                    ["ip", "route", "get", "8.8.8.8"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    self.logger.info(
-                        f"Network connectivity detected after {attempt + 1} seconds"
-                    )
-                    # Give WiFi a bit more time to fully establish
-                    await asyncio.sleep(3)
-                    return True
-            except (
-                subprocess.TimeoutExpired,
-                subprocess.CalledProcessError,
-                FileNotFoundError,
-            ):
-                pass
+        try:
+            connected = await netlink.wait_for_event(
+                timeout=max_wait, ready=netlink.has_default_route
+            )
+        except netlink.NetlinkError as e:
+            self.logger.debug(f"Netlink unavailable, polling for a route: {e}")
+            connected = await wait_until(self._has_route, max_wait, poll_interval=1.0)
 
-            await asyncio.sleep(1)
+        if connected:
+            self.logger.info(
+                f"Network connectivity detected after {time.monotonic() - started:.1f} seconds"
+            )
+            # A route is not internet access; record what is reachable for the
+            # status pages, but don't hold up startup on it (local-only
+            # networks are fine for setup)
+            verdict = await self.wifi_manager.reachability.check(max_age=0)
+            if not verdict.reachable:
+                self.logger.warning(f"Route is up but internet reachability is {verdict.state}")
+            return True
 
         self.logger.warning(
             f"No network connectivity after {max_wait} seconds, proceeding anyway"
         )
         return False
 
+    @staticmethod
+    async def _has_route() -> bool:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ip", "route", "get", "8.8.8.8",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            return False
+        try:
+            return await asyncio.wait_for(process.wait(), 5) == 0
+        except asyncio.TimeoutError:
+            process.kill()
+            return False
+
     async def run_startup_check(self):
-        """Run startup check for button hold and display WiFi info if not in setup mode"""
+        """Run startup check for button hold and display WiFi info if not in setup mode
+
+        Button sampling (after input device discovery), the network wait and
+        the NetworkManager status run concurrently. The decision is made as
+        soon as it is known: a held button or a hotspot connection means
+        setup straight away, cancelling whatever is still running; otherwise
+        it follows the WiFi status once NetworkManager has finished any
+        activation in progress. Each stage's duration ends up in
+        startup_timings.
+        """
         self.logger.info("=== WiFi Setup Startup Check ===")
+        timer = PhaseTimer("startup check")
+        button = asyncio.create_task(self._startup_stage(timer, "button", self._startup_button_held()))
+        network = asyncio.create_task(
+            self._startup_stage(timer, "network_wait", self.wait_for_network(max_wait=20))
+        )
+        status = asyncio.create_task(
+            self._startup_stage(timer, "nm_status", self.wifi_manager.get_settled_status(20))
+        )
+        try:
+            return await self._startup_decision(timer, button, network, status)
+        finally:
+            for task in (button, network, status):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(button, network, status, return_exceptions=True)
+            self.startup_timings = timer.as_dict()
+            self.logger.info(f"Startup timings - {timer.summary()}")
 
-        # Wait a moment for system to stabilize
-        self.logger.info("Waiting for system to stabilize...")
-        await asyncio.sleep(1)
-
-        # Wait for network connectivity (but don't fail if it doesn't come)
-        await self.wait_for_network(max_wait=20)
-
-        # Find the input device if button checking is enabled
-        if self.check_button:
-            if not self.find_device():
-                self.logger.error("Could not find input device - skipping button check")
-                self.check_button = False
+    @staticmethod
+    async def _startup_stage(timer: PhaseTimer, name: str, stage):
+        with timer.phase(name):
+            return await stage
 
-        # Check if button is held during startup
-        if self.check_button and self.check_button_during_startup():
-            # Button was held - start WiFi setup
-            self.logger.info("Button held - starting WiFi setup mode")
-            return True
+    async def _startup_button_held(self) -> bool:
+        """Discover the input device, then sample the button"""
+        if not self.check_button:
+            return False
+        if not self.find_device():
+            self.logger.error("Could not find input device - skipping button check")
+            self.check_button = False
+            return False
+        return await self.check_button_during_startup()
+
+    async def _startup_decision(self, timer: PhaseTimer, button, network, status) -> bool:
+        """Combine the startup stages into "setup needed?" as early as possible"""
+        pending = {button, status}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if button in done and button.exception() is not None:
+                self.logger.error(f"Button check failed: {button.exception()}")
+            elif button in done and button.result():
+                # Button was held - no need to wait for the network
+                self.logger.info("Button held - starting WiFi setup mode")
+                return True
+            if status in done and status.exception() is None:
+                current = status.result()
+                if current.connected and (
+                    self._is_setup_network(current.ssid) or self.wifi_manager.is_hotspot(current)
+                ):
+                    self.logger.info(
+                        f"Connected to setup/hotspot network ({current.ssid}) - starting WiFi setup mode"
+                    )
+                    return True
 
         # Check if there's any WiFi connection (auto-setup mode)
         try:
             self.logger.info("Checking current WiFi connection status...")
-            status = await self.wifi_manager.get_connection_status()
-
-            if not status.connected:
+            current = status.result()
+
+            if not current.connected:
+                # Try the saved networks in range before asking for setup
+                with timer.phase("select_network") as phase:
+                    ssid = await self.wifi_manager.select_best_network()
+                    phase["ok"] = ssid is not None
+                if ssid:
+                    self.logger.info(f"Connected to known network {ssid} - displaying WiFi info")
+                    await asyncio.wait({network})
+                    with timer.phase("display"):
+                        await self.display_wifi_info()
+                    return False
                 self.logger.info(
                     "No WiFi connection detected - automatically starting WiFi setup mode"
                 )
                 return True
-            elif status.ssid and not status.ssid.startswith("SetupWiFi"):
-                # Connected to a real WiFi network
-                self.logger.info(f"Already connected to WiFi network: {status.ssid}")
-                self.logger.info(
-                    "No WiFi setup trigger detected - displaying WiFi info"
-                )
-                self.display_wifi_info()
-                return False
-            else:
-                # Connected to our own setup hotspot or similar - start setup
-                self.logger.info(
-                    f"Connected to setup/hotspot network ({status.ssid}) - starting WiFi setup mode"
-                )
-                return True
+
+            # Connected to a real WiFi network; move to a clearly better
+            # known one if there is one in range
+            self.logger.info(f"Already connected to WiFi network: {current.ssid}")
+            with timer.phase("select_network"):
+                await self.wifi_manager.select_best_network()
+            self.logger.info(
+                "No WiFi setup trigger detected - displaying WiFi info"
+            )
+            await asyncio.wait({network})
+            with timer.phase("display"):
+                await self.display_wifi_info()
+            return False
 
         except Exception as e:
             self.logger.error(f"Error checking WiFi status: {e}")
@@ -420,6 +500,11 @@ class WiFiSetupService:
             )
             return True
 
+    @staticmethod
+    def _is_setup_network(ssid: Optional[str]) -> bool:
+        # Our own setup hotspot or similar
+        return not ssid or ssid.startswith("SetupWiFi")
+
     async def start_hotspot(self) -> bool:
         """Start the WiFi hotspot"""
         try:
@@ -430,6 +515,8 @@ class WiFiSetupService:
 
             if success:
                 self.logger.info("Hotspot started")
+                # Keep the network list for the setup page fresh
+                self.wifi_manager.start_background_scan()
                 # Display setup instructions on e-ink
                 self.display_setup_instructions()
                 return True
@@ -463,68 +550,80 @@ class WiFiSetupService:
             self.logger.error(f"Failed to start web server: {e}")
             raise
 
+    async def wait_for_web_server(self, server_task, timeout: float = 10.0) -> bool:
+        """Wait until uvicorn reports its socket is listening"""
+        start = time.monotonic()
+        started = await wait_until(
+            lambda: self.server.started or server_task.done(),
+            timeout,
+            poll_interval=0.05,
+        )
+        if started and self.server.started:
+            self.logger.info(
+                f"Web server listening after {time.monotonic() - start:.2f}s"
+            )
+            return True
+        self.logger.warning("Web server did not report startup")
+        return False
+
     async def monitor_connection(self) -> bool:
-        """Monitor for successful WiFi connection"""
+        """Monitor for successful WiFi connection
+
+        Re-checks the connection status whenever NetworkManager reports a
+        state change. Falls back to periodic polling only when no event
+        source is available.
+        """
         self.logger.info("Monitoring for WiFi connection")
 
         connection_timeout = 300  # 5 minutes
-        check_interval = 5  # seconds
+        check_interval = 5  # seconds, polling fallback only
         start_time = time.time()
 
-        while self.running and (time.time() - start_time) < connection_timeout:
-            try:
-                status = await self.wifi_manager.get_connection_status()
-
-                # Add debug logging to understand connection status
-                self.logger.debug(
-                    f"Connection status: connected={status.connected}, ssid={status.ssid}, hotspot_ssid={self.hotspot_ssid}"
-                )
-
-                if status.connected and status.ssid != self.hotspot_ssid:
-                    self.logger.info(f"Connected to: {status.ssid}")
+        events = await self.wifi_manager.get_event_monitor()
+        subscription = events.subscribe() if events else None
+        if subscription is None:
+            self.logger.info("No NetworkManager event source - polling every 5 seconds")
 
-                    # Display success screen
-                    connection_info = {
-                        "ssid": status.ssid,
-                        "ip_address": getattr(status, "ip_address", "Unknown"),
-                    }
-                    self.display_success_screen(connection_info)
-
-                    # Stop the hotspot
-                    if self.wifi_manager._hotspot_active:
-                        await self.wifi_manager.stop_hotspot()
-
-                    # =======================================================
-                    # !! THIS IS THE FIX !!
-                    # Uncomment the following lines to start the mDNS service
-                    # =======================================================
-                    mdns_server_task = await self.start_mdns_service()
-
-                    if mdns_server_task:
-                        # Keep the mDNS service running in the background
-                        pass
-                    # =======================================================
-
-                    # Keep server running for 2 minutes to allow status page to reconnect via WiFi
-                    self.logger.info(
-                        "WiFi connection successful - keeping server running for 2 minutes to allow status page reconnection"
-                    )
-                    await asyncio.sleep(120)
-                    self.logger.info("2-minute grace period completed")
+        try:
+            while self.running and (time.time() - start_time) < connection_timeout:
+                try:
+                    status = await self.wifi_manager.get_connection_status()
 
-                    return True
-                elif status.connected:
+                    # Add debug logging to understand connection status
                     self.logger.debug(
-                        f"Connected but to hotspot ({status.ssid}), continuing to monitor"
+                        f"Connection status: connected={status.connected}, ssid={status.ssid}, hotspot_ssid={self.hotspot_ssid}"
                     )
-                else:
-                    self.logger.debug("Not connected, continuing to monitor")
-
-                await asyncio.sleep(check_interval)
 
-            except Exception as e:
-                self.logger.error(f"Connection monitoring error: {e}")
-                await asyncio.sleep(check_interval)
+                    if (
+                        status.connected
+                        and status.ssid != self.hotspot_ssid
+                        and not self.wifi_manager.is_hotspot(status)
+                    ):
+                        self.logger.info(
+                            f"Connected to: {status.ssid} ({time.time() - start_time:.1f}s after monitoring started)"
+                        )
+                        await self._handle_connection_success(status)
+                        return True
+                    elif status.connected:
+                        self.logger.debug(
+                            f"Connected but to hotspot ({status.ssid}), continuing to monitor"
+                        )
+                    else:
+                        self.logger.debug("Not connected, continuing to monitor")
+
+                    remaining = connection_timeout - (time.time() - start_time)
+                    if subscription is not None and events.running:
+                        # Sleep until NetworkManager reports something changed
+                        await self._wait_for_state_change(subscription, remaining)
+                    else:
+                        await asyncio.sleep(min(check_interval, max(remaining, 0)))
+
+                except Exception as e:
+                    self.logger.error(f"Connection monitoring error: {e}")
+                    await asyncio.sleep(check_interval)
+        finally:
+            if subscription is not None:
+                subscription.close()
 
         if not self.running:
             self.logger.info("Monitoring stopped by user")
@@ -533,6 +632,52 @@ class WiFiSetupService:
 
         return False
 
+    async def _wait_for_state_change(self, subscription, timeout: float):
+        """Block until a device or connection state change arrives"""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            event = await subscription.get(remaining)
+            if event is None or event.kind in STATE_EVENT_KINDS:
+                return
+
+    async def _handle_connection_success(self, status):
+        """Show success, tear down the hotspot and start post-setup services"""
+        # Display success screen
+        connection_info = {
+            "ssid": status.ssid,
+            "ip_address": getattr(status, "ip_address", "Unknown"),
+        }
+        self.display_success_screen(connection_info)
+
+        # Stop the hotspot
+        if self.wifi_manager._hotspot_active:
+            await self.wifi_manager.stop_hotspot()
+
+        # Sample the new link for the status pages during the grace period
+        self.wifi_manager.link_quality.start()
+        self.wifi_manager.reachability.watch()
+
+        # =======================================================
+        # !! THIS IS THE FIX !!
+        # Uncomment the following lines to start the mDNS service
+        # =======================================================
+        mdns_server_task = await self.start_mdns_service()
+
+        if mdns_server_task:
+            # Keep the mDNS service running in the background
+            pass
+        # =======================================================
+
+        # Keep server running for 2 minutes to allow status page to reconnect via WiFi
+        self.logger.info(
+            "WiFi connection successful - keeping server running for 2 minutes to allow status page reconnection"
+        )
+        await asyncio.sleep(120)
+        self.logger.info("2-minute grace period completed")
+
     async def cleanup(self):
         """Clean up resources and stop services"""
         self.logger.info("Cleaning up services")
@@ -553,6 +698,13 @@ class WiFiSetupService:
             self.logger.info("Stopping hotspot...")
             await self.wifi_manager.stop_hotspot()
 
+            if self.button is not None:
+                await self.button.stop()
+            await self.input_devices.stop()
+            await self.wifi_manager.stop_auto_select()
+
+            await self.wifi_manager.close()
+
             self.logger.info("Cleanup completed")
 
         except Exception as e:
@@ -579,29 +731,87 @@ class WiFiSetupService:
         print("=" * 60 + "\n")
 
     async def run(self, check_startup: bool = True):
-        """Main service execution"""
+        """Main service execution
+
+        With a long press configured and the button available, the service
+        stays up after showing WiFi info or completing setup, and holding
+        ENTER for long_press seconds re-enters setup mode in place. In
+        supervisor mode it also watches the connection and returns to setup
+        mode when it is lost, and only exits when stopped.
+        """
         self.running = True
 
         try:
             # Run startup check if requested
-            if check_startup:
-                should_setup = await self.run_startup_check()
-                if not should_setup:
+            should_setup = await self.run_startup_check() if check_startup else True
+            trigger, requested_at = "startup", None
+            while True:
+                if should_setup:
+                    if not await self.run_setup_mode(trigger, requested_at):
+                        if not self.supervise:
+                            return False
+                        # Try again, unless a connection came up meanwhile
+                        await asyncio.sleep(SUPERVISOR_RETRY_DELAY)
+                if not self.running:
+                    return True
+                if self.supervise:
+                    trigger, requested_at = await self.supervise_connection()
+                    should_setup = trigger is not None
+                    continue
+                if not await self.long_press_available():
                     # No setup needed, just displayed WiFi info
                     return True
+                # Meanwhile follow disconnects by selecting the best known
+                # network (supervisor mode handles losses itself instead)
+                self.wifi_manager.start_auto_select()
+                try:
+                    should_setup = await self.wait_for_long_press()
+                finally:
+                    await self.wifi_manager.stop_auto_select()
+                trigger, requested_at = "long-press", None
 
-            # Start hotspot
-            if not await self.start_hotspot():
-                return False
+        except Exception as e:
+            self.logger.error(f"Service error: {e}")
+            return False
+        finally:
+            await self.cleanup()
 
-            # Start web server
-            server_task = await self.start_web_server()
+    async def run_setup_mode(
+        self, trigger: str = "startup", requested_at: Optional[float] = None
+    ) -> bool:
+        """Bring up the hotspot and web server and wait for a connection
+
+        Args:
+            trigger: What started setup mode (startup, long-press or
+                connection-lost); kept with the time to hotspot in
+                last_setup_entry
+            requested_at: time.monotonic() when setup became necessary
+                (default: now)
+
+        Returns:
+            bool: True once connected to a network
+        """
+        requested = time.monotonic() if requested_at is None else requested_at
+
+        # Start hotspot
+        if not await self.start_hotspot():
+            return False
+        time_to_hotspot = time.monotonic() - requested
+        self.last_setup_entry = {
+            "trigger": trigger,
+            "time_to_hotspot": round(time_to_hotspot, 3),
+        }
+        self.logger.info(f"Setup mode ({trigger}): hotspot up after {time_to_hotspot:.2f}s")
 
-            # Print connection info
-            self.print_connection_info()
+        # Start web server
+        server_task = await self.start_web_server()
 
-            # Wait a moment for server to start
-            await asyncio.sleep(2)
+        # Print connection info
+        self.print_connection_info()
+
+        try:
+            # Wait until the server socket is listening
+            await self.wait_for_web_server(server_task)
 
             # Monitor for connections with graceful handling
             try:
@@ -614,11 +824,12 @@ class WiFiSetupService:
 
                 # Cancel pending tasks
                 for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+                    if task is not server_task:
+                        task.cancel()
+                        try:
+                            await task
+                        except asyncio.CancelledError:
+                            pass
 
                 # Check if we got a successful connection
                 if connection_task in done:
@@ -632,12 +843,150 @@ class WiFiSetupService:
                 self.logger.info("Service interrupted by user")
 
             return False
+        finally:
+            await self.stop_web_server(server_task)
 
+    async def stop_web_server(self, server_task):
+        """Stop the setup web server so the next setup mode can start it again"""
+        if self.server is not None:
+            self.server.should_exit = True
+        try:
+            await asyncio.wait_for(server_task, 5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            server_task.cancel()
         except Exception as e:
-            self.logger.error(f"Service error: {e}")
-            return False
+            self.logger.debug(f"Web server exited with: {e}")
+        self.server = None
+
+    async def supervise_connection(self) -> Tuple[Optional[str], Optional[float]]:
+        """Stay in connected mode until setup mode is needed
+
+        Runs the long-press listener and the connection watch side by side.
+
+        Returns:
+            (trigger, requested_at): "long-press" or "connection-lost" and
+            the time.monotonic() it happened, or (None, None) when the
+            service is stopping
+        """
+        watches = {"connection-lost": asyncio.create_task(self.wait_for_connection_loss())}
+        if await self.long_press_available():
+            watches["long-press"] = asyncio.create_task(self.wait_for_long_press())
+        try:
+            done, _ = await asyncio.wait(watches.values(), return_when=asyncio.FIRST_COMPLETED)
+            for trigger, task in watches.items():
+                if task in done and task.result():
+                    return trigger, time.monotonic() if trigger == "long-press" else task.result()
+            return None, None
         finally:
-            await self.cleanup()
+            for task in watches.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*watches.values(), return_exceptions=True)
+
+    async def wait_for_connection_loss(self) -> Optional[float]:
+        """Watch the WiFi connection until it is lost for good
+
+        Re-checks on every NetworkManager state change (or every 5 seconds
+        without an event source). A lost connection is given to
+        NetworkManager to finish any reconnect in progress and then to the
+        saved networks in range; only if neither brings it back is setup
+        needed.
+
+        Returns:
+            time.monotonic() when the loss was noticed, or None when the
+            service is stopping
+        """
+        manager = self.wifi_manager
+        events = await manager.get_event_monitor()
+        subscription = events.subscribe() if events else None
+        try:
+            while self.running:
+                try:
+                    status = await manager.get_connection_status()
+                    if not status.connected or manager.is_hotspot(status):
+                        lost_at = time.monotonic()
+                        if not await self._recover_connection():
+                            return lost_at
+                        continue
+                    if subscription is not None and events.running:
+                        await self._wait_for_state_change(subscription, 5)
+                    else:
+                        await asyncio.sleep(5)
+                except Exception as e:
+                    self.logger.error(f"Connection watch error: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            if subscription is not None:
+                subscription.close()
+        return None
+
+    async def _recover_connection(self) -> bool:
+        """Try to get a lost connection back without setup mode"""
+        manager = self.wifi_manager
+        self.logger.info("WiFi connection lost")
+        # NetworkManager may be reconnecting by itself
+        status = await manager.get_settled_status(SUPERVISOR_RECONNECT_TIMEOUT)
+        if status.connected and not manager.is_hotspot(status):
+            self.logger.info(f"Reconnected to {status.ssid}")
+            return True
+        try:
+            # From NetworkManager's own latest scan; no rescan delay when
+            # nothing saved is in range
+            ranked = await manager.rank_known_networks(rescan=False)
+            if ranked:
+                ssid = await manager.select_best_network(ranked)
+                if ssid:
+                    self.logger.info(f"Reconnected to known network {ssid}")
+                    await self.display_wifi_info()
+                    return True
+        except Exception as e:
+            self.logger.warning(f"Known network reconnect failed: {e}")
+        self.logger.info("No known network to fall back to - entering WiFi setup mode")
+        return False
+
+    async def long_press_available(self) -> bool:
+        """Whether a long press can bring back setup mode"""
+        if self.long_press <= 0 or not self.check_button:
+            return False
+        if not self.device_path and not self.find_device():
+            return False
+        # Notice the button being unplugged and plugged back in
+        await self.input_devices.watch()
+        return await self.start_button_monitor()
+
+    async def wait_for_long_press(self) -> bool:
+        """Wait until ENTER is held for long_press seconds
+
+        An unplugged input device is picked up again when it returns.
+
+        Returns:
+            bool: True on a long press, False if the service is stopping
+        """
+        self.logger.info(f"Hold ENTER for {self.long_press:g} seconds to re-enter WiFi setup")
+        # A press still held from before (e.g. the one that started setup)
+        # has to be released first
+        while self.running and self.button.running and not await self.button.wait_for_release(1.0):
+            pass
+        while self.running:
+            button = self.button
+            if not button.running:
+                # Unplugged: wait for the device to come back
+                path = await self.input_devices.wait_for(self.device_name, timeout=1.0)
+                if path is not None:
+                    self.device_path = path
+                    if not await self.start_button_monitor():
+                        await asyncio.sleep(1.0)
+                continue
+            # Wake up every second to notice a shutdown request
+            if not await button.wait_for_press(1.0):
+                continue
+            if await button.wait_for_hold(self.long_press):
+                self.logger.info(
+                    f"ENTER held for {self.long_press:g} seconds - re-entering WiFi setup mode"
+                )
+                return True
+            self.logger.debug(f"Short press ({button.last_hold}s) ignored")
+        return False
 
 
 def main():
@@ -688,6 +1037,23 @@ def main():
         default=8000,
         help="Port for mDNS web service (default: 8000)",
     )
+    parser.add_argument(
+        "--long-press",
+        type=float,
+        default=float(os.getenv("WIFI_SETUP_LONG_PRESS", "5")),
+        help="Seconds to hold ENTER while running to re-enter setup mode; "
+        "0 exits after startup instead (default: 5). "
+        "Can also be set via WIFI_SETUP_LONG_PRESS",
+    )
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        default=os.getenv("WIFI_SETUP_SUPERVISE", "false").lower()
+        in ("true", "1", "yes"),
+        help="Stay resident: watch the connection and re-enter setup mode "
+        "when it is lost, without restarting. "
+        "Can also be set via WIFI_SETUP_SUPERVISE=true",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -715,6 +1081,8 @@ def main():
         enable_eink=not args.no_eink,
         mdns_hostname=args.mdns_hostname,
         mdns_port=args.mdns_port,
+        long_press=args.long_press,
+        supervise=args.supervise,
     )
 
     try: